@@ -1,15 +1,39 @@
 """Huckleberry Baby Sleep Tracker integration for Home Assistant."""
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
-from datetime import timedelta
-from typing import TypedDict, NotRequired
+import os
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, TypedDict, TypeVar, NotRequired, cast
+
+import requests
+from google.api_core import exceptions as google_exceptions
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HassJob,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 import voluptuous as vol
 from homeassistant.helpers import config_validation as cv
 
@@ -21,12 +45,59 @@ from huckleberry_api import (
     GrowthData,
     DiaperDocumentData,
 )
-from .const import DOMAIN
+from .const import (
+    CONF_COALESCE_WINDOW_MS,
+    DATA_FLOW_SESSIONS,
+    DEFAULT_COALESCE_WINDOW_MS,
+    DOMAIN,
+)
+from .bulk_export import FORMAT_CSV, FORMAT_PARQUET, async_export_history
+from .executor import LANE_BACKGROUND, LANE_INTERACTIVE, HuckleberryExecutor
+from .export import HistoryUnavailable
+from .history_store import REMOVED_RETENTION, HistoryStore
+from .importer import async_import_history, import_checkpoint_store, read_entries
+from .models import ChildState, parse_child_state, update_child_state
+from .schemas import DIAPER_FIELDS, GROWTH_FIELDS, PEE_FIELDS, POO_FIELDS
+
+if TYPE_CHECKING:
+    from .calendar import HuckleberryCalendar
+    from .statistics import HuckleberryStatistics
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 PLATFORMS: list[Platform] = [Platform.SWITCH, Platform.SENSOR, Platform.CALENDAR]
 
+# Firestore stream -> (HuckleberryAPI setup method, ChildRealtimeData key)
+LISTENER_STREAMS: dict[str, tuple[str, str]] = {
+    "sleep": ("setup_realtime_listener", "sleep_status"),
+    "feed": ("setup_feed_listener", "feed_status"),
+    "health": ("setup_health_listener", "growth_data"),
+    "diaper": ("setup_diaper_listener", "diaper_data"),
+}
+MAX_CONCURRENT_LISTENER_SETUPS = 4
+
+# Listener watchdog
+WATCHDOG_INTERVAL = timedelta(minutes=1)
+STREAM_STALE_AFTER = timedelta(hours=1)
+STREAM_RETRY_BASE = timedelta(minutes=1)
+STREAM_RETRY_MAX = timedelta(minutes=30)
+
+# Session refresh, ahead of the library's own refresh 5 minutes before expiry
+# which runs inside whatever call notices it, unlocked
+SESSION_REFRESH_MARGIN = timedelta(minutes=10)
+SESSION_REFRESH_MIN_DELAY = timedelta(seconds=30)
+SESSION_REFRESH_FALLBACK = timedelta(minutes=30)
+
+# Tokens persisted so restarts can skip password authentication
+SESSION_STORE_VERSION = 1
+SESSION_FIELDS = ("id_token", "refresh_token", "user_uid", "token_expires_at")
+
+# Last-known realtime state, restored before the first refresh
+REALTIME_CACHE_VERSION = 1
+REALTIME_CACHE_SAVE_DELAY = 30
+
 
 # Type definitions for integration data structures
 class HuckleberryEntryData(TypedDict):
@@ -34,6 +105,67 @@ class HuckleberryEntryData(TypedDict):
     api: HuckleberryAPI
     coordinator: "HuckleberryDataUpdateCoordinator"
     children: list[ChildData]
+    calendars: NotRequired[dict[str, "HuckleberryCalendar"]]
+    statistics: NotRequired["HuckleberryStatistics"]
+
+
+# Fields of each realtime document that entities actually read. A value of None
+# keeps the whole subtree. Snapshots are compared on this projection only, so
+# changes to anything else (prefs.timestamp, unrelated prefs keys, ...) are
+# dropped before they reach the event loop.
+REALTIME_FIELDS: dict[str, dict[str, Any] | None] = {
+    "sleep_status": {
+        "timer": {
+            "active": None,
+            "paused": None,
+            "timerStartTime": None,
+            "timerEndTime": None,
+            "timestamp": None,
+        },
+        "prefs": {"lastSleep": {"start": None, "duration": None}},
+        # Legacy computed structure
+        "last_updated": None,
+        "sleep_start": None,
+        "sleep_duration": None,
+    },
+    "feed_status": {
+        "timer": {
+            "active": None,
+            "paused": None,
+            "activeSide": None,
+            "lastSide": None,
+            "feedStartTime": None,
+            "leftDuration": None,
+            "rightDuration": None,
+            "timestamp": None,
+        },
+        "prefs": {
+            "lastNursing": {
+                "start": None,
+                "duration": None,
+                "leftDuration": None,
+                "rightDuration": None,
+                "timestamp": None,
+            },
+            "lastSide": {"lastSide": None},
+        },
+    },
+    "growth_data": None,
+    "diaper_data": {
+        "prefs": {"lastDiaper": {"start": None, "mode": None, "offset": None}},
+    },
+}
+
+
+def project_realtime_document(fields: dict[str, Any] | None, data: Any) -> Any:
+    """Return the part of a realtime document selected by a REALTIME_FIELDS spec."""
+    if fields is None or not isinstance(data, dict):
+        return data
+    return {
+        key: project_realtime_document(sub_fields, data[key])
+        for key, sub_fields in fields.items()
+        if key in data
+    }
 
 
 class ChildRealtimeData(TypedDict):
@@ -45,6 +177,122 @@ class ChildRealtimeData(TypedDict):
     diaper_data: NotRequired[DiaperDocumentData]
 
 
+@dataclass(slots=True)
+class ListenerStreamHealth:
+    """Liveness of a single child/stream Firestore listener."""
+
+    last_event: float | None = None
+    last_subscribed: float | None = None
+    resubscribes: int = 0
+    failures: int = 0
+    next_attempt: float = 0
+    resubscribing: bool = False
+
+
+def is_auth_error(err: Exception) -> bool:
+    """Return True if an API error means the session is no longer valid."""
+    if isinstance(err, requests.exceptions.HTTPError):
+        return err.response is not None and err.response.status_code in (400, 401, 403)
+    return isinstance(err, (google_exceptions.Unauthenticated, google_exceptions.PermissionDenied))
+
+
+def _isoformat(timestamp: float | None) -> str | None:
+    """Return a UTC ISO timestamp for diagnostics."""
+    return dt_util.utc_from_timestamp(timestamp).isoformat() if timestamp else None
+
+
+def _extract_growth_data(child_uid: str, data: dict[str, Any]) -> GrowthData:
+    """Extract growth data from prefs.lastGrowthEntry of a health document."""
+    prefs = data.get("prefs", {})
+    last_growth = prefs.get("lastGrowthEntry", {})
+
+    _LOGGER.debug("Health data received for %s: has_prefs=%s, has_lastGrowthEntry=%s",
+                  child_uid, bool(prefs), bool(last_growth))
+
+    if not last_growth:
+        # Set empty growth data if none exists
+        _LOGGER.debug("No growth data found in health document")
+        return {
+            "weight_units": "kg",
+            "height_units": "cm",
+            "head_units": "hcm",
+        }
+
+    growth_data: GrowthData = {
+        "weight": last_growth.get("weight"),
+        "height": last_growth.get("height"),
+        "head": last_growth.get("head"),
+        "weight_units": last_growth.get("weightUnits", "kg"),
+        "height_units": last_growth.get("heightUnits", "cm"),
+        "head_units": last_growth.get("headUnits", "hcm"),
+        "timestamp": last_growth.get("start"),
+    }
+    _LOGGER.debug("Updated growth data: weight=%s, height=%s, head=%s, timestamp=%s",
+                  growth_data.get("weight"), growth_data.get("height"),
+                  growth_data.get("head"), growth_data.get("timestamp"))
+    return growth_data
+
+
+def _freeze_child_data(data: dict[str, Any]) -> ChildRealtimeData:
+    """Return a read-only child snapshot.
+
+    Documents are handed over by the Firestore threads and are never mutated
+    afterwards, so only the child level needs to be protected.
+    """
+    return cast(ChildRealtimeData, MappingProxyType(data))
+
+
+def _realtime_cache_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store holding the last-known realtime state of an entry."""
+    return Store(hass, REALTIME_CACHE_VERSION, f"{DOMAIN}.{entry.entry_id}.realtime")
+
+
+def _session_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store holding the auth tokens of an entry."""
+    return Store(hass, SESSION_STORE_VERSION, f"{DOMAIN}.{entry.entry_id}.session")
+
+
+def _history_db_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Return the path of the history database of an entry."""
+    return hass.config.path(f"{DOMAIN}.{entry.entry_id}.db")
+
+
+def _remove_history_db(path: str) -> None:
+    """Delete a history database and its journal."""
+    for file in (path, f"{path}-journal"):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(file)
+
+
+def _session_data(api: HuckleberryAPI) -> dict[str, Any]:
+    """Return the tokens of an authenticated API client."""
+    return {field: getattr(api, field) for field in SESSION_FIELDS}
+
+
+def _restore_session(api: HuckleberryAPI, session: Mapping[str, Any]) -> None:
+    """Copy tokens from a previous session into an API client."""
+    for field in SESSION_FIELDS:
+        setattr(api, field, session.get(field))
+
+
+def _resume_session(api: HuckleberryAPI) -> None:
+    """Make a restored session usable, signing in with the password only if needed."""
+    expires_at = api.token_expires_at
+    if (
+        api.id_token
+        and isinstance(expires_at, (int, float))
+        and expires_at - time.time() > SESSION_REFRESH_MARGIN.total_seconds()
+    ):
+        return
+    if api.refresh_token:
+        try:
+            api.refresh_auth_token()
+            return
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.info("Stored Huckleberry session expired, signing in again: %s", err)
+    api.authenticate()
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Huckleberry from a config entry."""
     hass.data.setdefault(DOMAIN, {})
@@ -54,30 +302,77 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         password=entry.data["password"],
         timezone=str(hass.config.time_zone),
     )
+    session_store = _session_store(hass, entry)
+
+    # Blocking API calls of this entry run in their own thread pools
+    executor = HuckleberryExecutor(hass, DOMAIN)
 
-    # Authenticate
+    # Reuse the session of a config flow that just signed in, or the stored tokens
+    flow_session = hass.data.get(DATA_FLOW_SESSIONS, {}).pop(entry.unique_id, None)
+    children: list[ChildData] | None = None
     try:
-        await hass.async_add_executor_job(api.authenticate)
+        if flow_session:
+            _restore_session(api, _session_data(flow_session["api"]))
+            children = flow_session["children"]
+        elif stored := await session_store.async_load():
+            _restore_session(api, stored)
+            await executor.async_run(LANE_INTERACTIVE, _resume_session, api)
+        else:
+            await executor.async_run(LANE_INTERACTIVE, api.authenticate)
     except Exception as err:
         _LOGGER.error("Failed to authenticate with Huckleberry: %s", err)
+        await executor.async_shutdown()
         return False
+    await session_store.async_save(_session_data(api))
 
     # Get children
     try:
-        children = await hass.async_add_executor_job(api.get_children)
+        if children is None:
+            children = await executor.async_run(LANE_INTERACTIVE, api.get_children)
         if not children:
             _LOGGER.error("No children found in Huckleberry account")
+            await executor.async_shutdown()
             return False
     except Exception as err:
         _LOGGER.error("Failed to get children from Huckleberry: %s", err)
+        await executor.async_shutdown()
+        return False
+
+    # Synced history is read from disk, the cloud only fills what is missing
+    history = HistoryStore(executor, _history_db_path(hass, entry))
+    try:
+        await history.async_open()
+    except Exception as err:
+        _LOGGER.error("Failed to open the Huckleberry history database: %s", err)
+        await executor.async_shutdown()
         return False
 
     # Create coordinator for data updates
-    coordinator = HuckleberryDataUpdateCoordinator(hass, api, children)
+    coordinator = HuckleberryDataUpdateCoordinator(
+        hass,
+        api,
+        children,
+        coalesce_window_ms=entry.options.get(CONF_COALESCE_WINDOW_MS, DEFAULT_COALESCE_WINDOW_MS),
+        cache_store=_realtime_cache_store(hass, entry),
+        executor=executor,
+        session_store=session_store,
+        history=history,
+    )
+    # Render last-known state until the listeners deliver their first snapshots
+    await coordinator.async_load_cache()
     await coordinator.async_config_entry_first_refresh()
 
     # Set up real-time listeners for instant updates
     await coordinator.async_setup_listeners()
+    coordinator.async_schedule_session_refresh()
+
+    async def _async_stop_coordinator(_event: Event) -> None:
+        """Stop listeners and join the entry's worker threads when Home Assistant stops."""
+        await coordinator.async_shutdown()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_coordinator)
+    )
 
     entry_data: HuckleberryEntryData = {
         "api": api,
@@ -88,6 +383,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    # Long-term statistics need the recorder, which is only imported when it is loaded
+    if "recorder" in hass.config.components:
+        from .statistics import HuckleberryStatistics  # pylint: disable=import-outside-toplevel
+
+        statistics = HuckleberryStatistics(
+            hass, entry, coordinator, children, entry_data.get("calendars", {})
+        )
+        entry_data["statistics"] = statistics
+        entry.async_on_unload(statistics.async_start())
+
     # Helper to get child_uid from service call (device target or explicit child_uid)
     def _get_child_uid_from_call(call: ServiceCall) -> str | None:
         """Extract child_uid from service call, either from device target or data field."""
@@ -116,7 +423,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             return
         _LOGGER.info("Calling %s for child %s", method_name, target_child)
         method = getattr(api, method_name)
-        await hass.async_add_executor_job(method, target_child)
+        await coordinator.async_api_call(method, target_child)
         _LOGGER.info("Completed %s for child %s", method_name, target_child)
 
     async def handle_start_sleep(call):
@@ -143,7 +450,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             return
         side = call.data.get("side", "left")
         _LOGGER.info("Starting feeding for child %s on %s side", child_uid, side)
-        await hass.async_add_executor_job(api.start_feeding, child_uid, side)
+        await coordinator.async_api_call(api.start_feeding, child_uid, side)
 
     async def handle_pause_feeding(call):
         await _call_api("pause_feeding", call)
@@ -156,7 +463,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             return
         side = call.data.get("side")  # Optional side parameter
         _LOGGER.info("Resuming feeding for child %s on %s", child_uid, side if side else "current side")
-        await hass.async_add_executor_job(api.resume_feeding, child_uid, side)
+        await coordinator.async_api_call(api.resume_feeding, child_uid, side)
 
     async def handle_switch_feeding_side(call):
         await _call_api("switch_feeding_side", call)
@@ -178,7 +485,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         diaper_rash = call.data.get("diaper_rash", False)
         notes = call.data.get("notes")
         _LOGGER.info("Logging pee diaper for child %s (amount=%s)", child_uid, pee_amount)
-        await hass.async_add_executor_job(
+        await coordinator.async_api_call(
             api.log_diaper, child_uid, "pee", pee_amount, None, None, None, diaper_rash, notes
         )
 
@@ -195,7 +502,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         notes = call.data.get("notes")
         _LOGGER.info("Logging poo diaper for child %s (amount=%s, color=%s, consistency=%s)",
                      child_uid, poo_amount, color, consistency)
-        await hass.async_add_executor_job(
+        await coordinator.async_api_call(
             api.log_diaper, child_uid, "poo", None, poo_amount, color, consistency, diaper_rash, notes
         )
 
@@ -212,7 +519,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         diaper_rash = call.data.get("diaper_rash", False)
         notes = call.data.get("notes")
         _LOGGER.info("Logging both (pee+poo) diaper for child %s", child_uid)
-        await hass.async_add_executor_job(
+        await coordinator.async_api_call(
             api.log_diaper, child_uid, "both", pee_amount, poo_amount, color, consistency, diaper_rash, notes
         )
 
@@ -225,7 +532,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         diaper_rash = call.data.get("diaper_rash", False)
         notes = call.data.get("notes")
         _LOGGER.info("Logging dry diaper check for child %s", child_uid)
-        await hass.async_add_executor_job(
+        await coordinator.async_api_call(
             api.log_diaper, child_uid, "dry", None, None, None, None, diaper_rash, notes
         )
 
@@ -241,13 +548,87 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         units = call.data.get("units", "metric")
         _LOGGER.info("Logging growth for child %s (weight=%s, height=%s, head=%s, units=%s)",
                      child_uid, weight, height, head, units)
-        await hass.async_add_executor_job(
+        await coordinator.async_api_call(
             api.log_growth, child_uid, weight, height, head, units
         )
         # Refresh coordinator to update growth sensor
-        coordinator: HuckleberryDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
         await coordinator.async_request_refresh()
 
+    async def handle_get_calendar_changes(call: ServiceCall) -> ServiceResponse:
+        child_uid = _get_child_uid_from_call(call)
+        if not child_uid:
+            _LOGGER.error("No child_uid could be determined from service call")
+            return {}
+        since = call.data.get("since")
+        since_ts = dt_util.as_utc(since).timestamp() if since else 0
+        events, removed, until = await coordinator.history.async_changes_since(child_uid, since_ts)
+        return {
+            "events": [
+                {
+                    "uid": event.uid,
+                    "start": event.start.isoformat(),
+                    "end": event.end.isoformat(),
+                    "summary": event.summary,
+                    "description": event.description,
+                }
+                for event in events
+            ],
+            "removed": removed,
+            # Pass as since of the next call
+            "until": dt_util.utc_from_timestamp(until).isoformat(),
+            # Removals older than the retention are forgotten, refetch the calendar instead
+            "resync": bool(since) and since_ts < until - REMOVED_RETENTION,
+        }
+
+    async def handle_export_history(call: ServiceCall) -> ServiceResponse:
+        child_uid = _get_child_uid_from_call(call)
+        child = next((child for child in children if child["uid"] == child_uid), None)
+        if child is None:
+            _LOGGER.error("Unknown child %s", child_uid)
+            return {}
+        if start := call.data.get("start"):
+            start = dt_util.as_utc(start)
+        elif birthday := dt_util.parse_date(child.get("birthday") or ""):
+            start = dt_util.as_utc(dt_util.start_of_local_day(birthday))
+        else:
+            _LOGGER.error("No start given and child %s has no birthday", child_uid)
+            return {}
+        end = dt_util.as_utc(call.data["end"]) if "end" in call.data else dt_util.utcnow()
+        calendar = hass.data[DOMAIN][entry.entry_id]["calendars"][child_uid]
+        _LOGGER.info("Exporting history of child %s from %s to %s", child_uid, start, end)
+        try:
+            result = await async_export_history(coordinator, calendar, start, end, call.data["format"])
+        except HistoryUnavailable as err:
+            _LOGGER.error("Not exporting history of child %s: %s", child_uid, err)
+            return {}
+        _LOGGER.info("Exported %d entries to %s", result["rows"], result["path"])
+        return result
+
+    async def handle_import_history(call: ServiceCall) -> ServiceResponse:
+        child_uid = _get_child_uid_from_call(call)
+        if not child_uid:
+            _LOGGER.error("No child_uid could be determined from service call")
+            return {}
+        if "file" in call.data:
+            path = hass.config.path(call.data["file"])
+            if not hass.config.is_allowed_path(path):
+                _LOGGER.error("Importing from %s is not allowed, add it to allowlist_external_dirs", path)
+                return {}
+            try:
+                raw_entries = await coordinator.executor.async_run(LANE_BACKGROUND, read_entries, path)
+            except (OSError, ValueError) as err:
+                _LOGGER.error("Could not read %s: %s", path, err)
+                return {}
+        else:
+            raw_entries = call.data["entries"]
+        try:
+            result = await async_import_history(hass, entry, coordinator, child_uid, raw_entries)
+        except vol.Invalid as err:
+            _LOGGER.error("Not importing history for child %s: %s", child_uid, err)
+            return {}
+        _LOGGER.info("Imported %d of %d entries for child %s", result["imported"], result["total"], child_uid)
+        return result
+
     service_schema = vol.Schema({
         vol.Required("device_id"): cv.string,
         vol.Optional("child_uid"): cv.string,
@@ -273,46 +654,59 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     diaper_pee_schema = vol.Schema({
         vol.Required("device_id"): cv.string,
         vol.Optional("child_uid"): cv.string,
-        vol.Optional("pee_amount"): vol.In(["little", "medium", "big"]),
-        vol.Optional("diaper_rash"): cv.boolean,
-        vol.Optional("notes"): cv.string,
+        **PEE_FIELDS,
+        **DIAPER_FIELDS,
     })
 
     diaper_poo_schema = vol.Schema({
         vol.Required("device_id"): cv.string,
         vol.Optional("child_uid"): cv.string,
-        vol.Optional("poo_amount"): vol.In(["little", "medium", "big"]),
-        vol.Optional("color"): vol.In(["yellow", "brown", "black", "green", "red", "gray"]),
-        vol.Optional("consistency"): vol.In(["solid", "loose", "runny", "mucousy", "hard", "pebbles", "diarrhea"]),
-        vol.Optional("diaper_rash"): cv.boolean,
-        vol.Optional("notes"): cv.string,
+        **POO_FIELDS,
+        **DIAPER_FIELDS,
     })
 
     diaper_both_schema = vol.Schema({
         vol.Required("device_id"): cv.string,
         vol.Optional("child_uid"): cv.string,
-        vol.Optional("pee_amount"): vol.In(["little", "medium", "big"]),
-        vol.Optional("poo_amount"): vol.In(["little", "medium", "big"]),
-        vol.Optional("color"): vol.In(["yellow", "brown", "black", "green", "red", "gray"]),
-        vol.Optional("consistency"): vol.In(["solid", "loose", "runny", "mucousy", "hard", "pebbles", "diarrhea"]),
-        vol.Optional("diaper_rash"): cv.boolean,
-        vol.Optional("notes"): cv.string,
+        **PEE_FIELDS,
+        **POO_FIELDS,
+        **DIAPER_FIELDS,
     })
 
     diaper_dry_schema = vol.Schema({
         vol.Required("device_id"): cv.string,
         vol.Optional("child_uid"): cv.string,
-        vol.Optional("diaper_rash"): cv.boolean,
-        vol.Optional("notes"): cv.string,
+        **DIAPER_FIELDS,
     })
 
+    calendar_changes_schema = vol.Schema({
+        vol.Required("device_id"): cv.string,
+        vol.Optional("child_uid"): cv.string,
+        vol.Optional("since"): cv.datetime,
+    })
+
+    export_history_schema = vol.Schema({
+        vol.Required("device_id"): cv.string,
+        vol.Optional("child_uid"): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("format", default=FORMAT_PARQUET): vol.In([FORMAT_PARQUET, FORMAT_CSV]),
+    })
+
+    import_history_schema = vol.All(
+        vol.Schema({
+            vol.Required("device_id"): cv.string,
+            vol.Optional("child_uid"): cv.string,
+            vol.Exclusive("file", "source"): cv.string,
+            vol.Exclusive("entries", "source"): vol.All(cv.ensure_list, [dict]),
+        }),
+        cv.has_at_least_one_key("file", "entries"),
+    )
+
     growth_schema = vol.Schema({
         vol.Required("device_id"): cv.string,
         vol.Optional("child_uid"): cv.string,
-        vol.Optional("weight"): vol.Coerce(float),
-        vol.Optional("height"): vol.Coerce(float),
-        vol.Optional("head"): vol.Coerce(float),
-        vol.Optional("units"): vol.In(["metric", "imperial"]),
+        **GROWTH_FIELDS,
     })
 
     hass.services.async_register(DOMAIN, "start_sleep", handle_start_sleep, schema=service_schema)
@@ -335,9 +729,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.services.async_register(DOMAIN, "log_growth", handle_log_growth, schema=growth_schema)
 
+    hass.services.async_register(
+        DOMAIN,
+        "get_calendar_changes",
+        handle_get_calendar_changes,
+        schema=calendar_changes_schema,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "export_history",
+        handle_export_history,
+        schema=export_history_schema,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "import_history",
+        handle_import_history,
+        schema=import_history_schema,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached realtime state, tokens, history and import progress when the entry is deleted."""
+    await _realtime_cache_store(hass, entry).async_remove()
+    await _session_store(hass, entry).async_remove()
+    await import_checkpoint_store(hass, entry).async_remove()
+    await hass.async_add_executor_job(_remove_history_db, _history_db_path(hass, entry))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     # Stop real-time listeners before unloading
@@ -352,161 +781,508 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
-class HuckleberryDataUpdateCoordinator(DataUpdateCoordinator[dict[str, ChildRealtimeData]]):
-    """Class to manage fetching Huckleberry data."""
+class HuckleberryDataUpdateCoordinator(DataUpdateCoordinator[Mapping[str, ChildRealtimeData]]):
+    """Class to manage fetching Huckleberry data.
+
+    coordinator.data is a read-only view of per-child snapshots. Each child
+    snapshot is itself read-only and is replaced as a whole when one of its
+    documents changes, so a published snapshot is never modified afterwards.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         api: HuckleberryAPI,
         children: list[ChildData],
+        coalesce_window_ms: int = DEFAULT_COALESCE_WINDOW_MS,
+        cache_store: Store | None = None,
+        executor: HuckleberryExecutor | None = None,
+        session_store: Store | None = None,
+        history: HistoryStore | None = None,
     ) -> None:
         """Initialize."""
         self.api = api
+        self._session_store = session_store
+        self.executor = executor or HuckleberryExecutor(hass, DOMAIN)
+        self.history = history
+        self._cache_store = cache_store
         self.children = children
+        self._children_by_uid: dict[str, ChildData] = {child["uid"]: child for child in children}
+        # Only replaced on the event loop, one child snapshot at a time
         self._realtime_data: dict[str, ChildRealtimeData] = {}
+        # Parsed models of the published snapshots, read by the entities
+        self.child_states: dict[str, ChildState] = {}
+        # Listeners interested in a single (child_uid, ChildRealtimeData key) topic
+        self._topic_listeners: dict[tuple[str, str], list[CALLBACK_TYPE]] = {}
+        self.last_changed_topics: set[tuple[str, str]] = set()
+        # Last published projection and suppressed snapshot count per (child_uid, key).
+        # Each stream is only touched from its own Firestore listener thread.
+        self._fingerprints: dict[tuple[str, str], Any] = {}
+        self._suppressed: dict[tuple[str, str], int] = {}
+        # Snapshots waiting to be published on the event loop, filled by Firestore threads
+        self.coalesce_window_ms = coalesce_window_ms
+        self._inbound: list[tuple[tuple[str, str], Any]] = []
+        self._inbound_lock = threading.Lock()
+        self._drain_scheduled = False
+        self._unsub_drain: CALLBACK_TYPE | None = None
+        self.listener_setup_seconds: float | None = None
+        self.failed_listeners: list[str] = []
+        self._streams: dict[tuple[str, str], ListenerStreamHealth] = {}
+        self._unsub_watchdog: CALLBACK_TYPE | None = None
+        self._unsub_session_refresh: CALLBACK_TYPE | None = None
+        self._session_refresh_task: asyncio.Task[None] | None = None
+        # Held by worker threads while the token is refreshed, the Firestore
+        # client created or listeners registered, which the library does
+        # without locking
+        self._session_lock = threading.Lock()
+        self._stopped = False
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=60),  # Fallback polling, listeners are primary
+            # No polling: listeners push data and the session is refreshed on token expiry
+            update_interval=None,
         )
 
-    async def async_setup_listeners(self) -> None:
-        """Set up real-time listeners for instant updates."""
-        _LOGGER.info("Setting up real-time Firestore listeners")
+    @callback
+    def async_add_topic_listener(
+        self, update_callback: CALLBACK_TYPE, child_uid: str, keys: Iterable[str]
+    ) -> CALLBACK_TYPE:
+        """Listen for realtime updates of specific keys of a single child.
+
+        Topic listeners are only called by async_set_updated_topics. Full
+        refreshes still go through the regular coordinator listeners.
+        """
+        topics = [(child_uid, key) for key in keys]
+        for topic in topics:
+            self._topic_listeners.setdefault(topic, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove topic listener."""
+            for topic in topics:
+                listeners = self._topic_listeners.get(topic)
+                if listeners and update_callback in listeners:
+                    listeners.remove(update_callback)
+                    if not listeners:
+                        del self._topic_listeners[topic]
+
+        return remove_listener
+
+    @callback
+    def async_set_updated_topics(self, updates: dict[tuple[str, str], Any]) -> None:
+        """Store realtime documents and notify only the entities that use them.
+
+        Each entity is called once, even if several of its keys changed.
+        """
+        changes_by_child: dict[str, dict[str, Any]] = {}
+        for (child_uid, key), value in updates.items():
+            changes_by_child.setdefault(child_uid, {})[key] = value
+
+        # Copy-on-write: only the changed child snapshots are rebuilt and re-parsed
+        for child_uid, changes in changes_by_child.items():
+            previous = self._realtime_data.get(child_uid) or {"child": self._children_by_uid[child_uid]}
+            self._realtime_data[child_uid] = _freeze_child_data({**previous, **changes})
+            if (state := self.child_states.get(child_uid)) is None:
+                self.child_states[child_uid] = parse_child_state(self._realtime_data[child_uid])
+            else:
+                self.child_states[child_uid] = update_child_state(state, changes)
+
+        self.data = MappingProxyType(self._realtime_data)
+        self.last_update_success = True
+        self.last_changed_topics = set(updates)
+        if self._cache_store:
+            self._cache_store.async_delay_save(self._cache_data_to_save, REALTIME_CACHE_SAVE_DELAY)
+
+        update_callbacks: dict[CALLBACK_TYPE, None] = {}
+        for topic in updates:
+            update_callbacks.update(dict.fromkeys(self._topic_listeners.get(topic, ())))
+        for update_callback in update_callbacks:
+            update_callback()
+
+    @callback
+    def async_set_updated_data(self, data: Mapping[str, ChildRealtimeData]) -> None:
+        """Publish a full snapshot, parsing every child again."""
+        self._parse_child_states(data)
+        super().async_set_updated_data(data)
+
+    def _parse_child_states(self, data: Mapping[str, ChildRealtimeData]) -> None:
+        """Parse the models of every child in a full snapshot."""
+        self.child_states = {
+            child_uid: parse_child_state(child_data) for child_uid, child_data in data.items()
+        }
+
+    @callback
+    def async_set_updated_topic(self, child_uid: str, key: str, value: Any) -> None:
+        """Store a single realtime document and notify the entities that use it."""
+        self.async_set_updated_topics({(child_uid, key): value})
+
+    async def async_load_cache(self) -> None:
+        """Restore the last-known realtime state saved by a previous run."""
+        if not self._cache_store or not (cached := await self._cache_store.async_load()):
+            return
 
-        for child in self.children:
-            child_uid = child["uid"]
-
-            # Set up sleep listener
-            def make_sleep_callback(uid):
-                def callback(data):
-                    """Handle real-time sleep updates."""
-                    if uid not in self._realtime_data:
-                        self._realtime_data[uid] = {"child": child}
-                    self._realtime_data[uid]["sleep_status"] = data
-                    # Trigger coordinator update
-                    self.hass.loop.call_soon_threadsafe(
-                        self.async_set_updated_data, dict(self._realtime_data)
-                    )
-                return callback
-
-            await self.hass.async_add_executor_job(
-                self.api.setup_realtime_listener, child_uid, make_sleep_callback(child_uid)
+        for child_uid, documents in cached.get("children", {}).items():
+            if child_uid not in self._children_by_uid:
+                continue
+            documents = {key: value for key, value in documents.items() if key in REALTIME_FIELDS}
+            self._realtime_data[child_uid] = _freeze_child_data(
+                {"child": self._children_by_uid[child_uid], **documents}
             )
+            # Live snapshots matching the cached state don't need to be published again
+            for key, value in documents.items():
+                self._fingerprints[(child_uid, key)] = value
+
+        _LOGGER.debug("Restored cached realtime state for %d children", len(self._realtime_data))
+
+    @callback
+    def _cache_data_to_save(self) -> dict[str, Any]:
+        """Return the compact realtime state to persist."""
+        return {
+            "children": {
+                child_uid: {
+                    key: project_realtime_document(fields, child_data[key])
+                    for key, fields in REALTIME_FIELDS.items()
+                    if key in child_data
+                }
+                for child_uid, child_data in self._realtime_data.items()
+            }
+        }
+
+    @property
+    def suppressed_updates(self) -> int:
+        """Return the number of realtime snapshots dropped as unchanged."""
+        return sum(self._suppressed.values())
+
+    @property
+    def suppressed_updates_by_stream(self) -> dict[str, int]:
+        """Return the suppressed snapshot count per child/stream."""
+        return {
+            f"{child_uid}/{key}": count
+            for (child_uid, key), count in self._suppressed.items()
+        }
+
+    def _schedule_topic_update(self, child_uid: str, key: str, value: Any) -> None:
+        """Hand a realtime document over from the Firestore thread to the event loop.
+
+        Snapshots whose used fields match the previously published snapshot
+        of the same stream are dropped here.
+        """
+        topic = (child_uid, key)
+        fingerprint = project_realtime_document(REALTIME_FIELDS[key], value)
+        if topic in self._fingerprints and self._fingerprints[topic] == fingerprint:
+            self._suppressed[topic] = self._suppressed.get(topic, 0) + 1
+            _LOGGER.debug("Ignoring unchanged %s snapshot for %s", key, child_uid)
+            return
+        self._fingerprints[topic] = fingerprint
+
+        with self._inbound_lock:
+            self._inbound.append((topic, value))
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        self.hass.loop.call_soon_threadsafe(self._async_schedule_drain)
+
+    @callback
+    def _async_schedule_drain(self) -> None:
+        """Drain the inbound queue now or after the coalescing window."""
+        if not self.coalesce_window_ms:
+            self._async_drain_inbound()
+            return
+        self._unsub_drain = async_call_later(
+            self.hass,
+            self.coalesce_window_ms / 1000,
+            HassJob(self._async_drain_inbound, "Huckleberry realtime drain", cancel_on_shutdown=True),
+        )
 
-            # Set up feed listener (for feeding tracking)
-            def make_feed_callback(uid):
-                def callback(data):
-                    """Handle real-time feed updates."""
-                    if uid not in self._realtime_data:
-                        self._realtime_data[uid] = {"child": child}
-                    self._realtime_data[uid]["feed_status"] = data
-                    # Trigger coordinator update
-                    self.hass.loop.call_soon_threadsafe(
-                        self.async_set_updated_data, dict(self._realtime_data)
-                    )
-                return callback
-
-            await self.hass.async_add_executor_job(
-                self.api.setup_feed_listener, child_uid, make_feed_callback(child_uid)
+    @callback
+    def _async_drain_inbound(self, _now: datetime | None = None) -> None:
+        """Publish every queued realtime document in a single batch."""
+        self._unsub_drain = None
+        with self._inbound_lock:
+            inbound = self._inbound
+            self._inbound = []
+            self._drain_scheduled = False
+
+        # Later snapshots of the same stream replace earlier ones
+        updates = dict(inbound)
+        _LOGGER.debug("Publishing %d realtime update(s) from %d snapshot(s)", len(updates), len(inbound))
+        self.async_set_updated_topics(updates)
+
+    async def async_api_call(
+        self, method: Callable[..., _T], *args: Any, lane: str = LANE_INTERACTIVE
+    ) -> _T:
+        """Run a blocking API call, refreshing the session right away on auth errors."""
+        try:
+            return await self.executor.async_run(lane, method, *args)
+        except Exception as err:
+            self.async_handle_api_error(err)
+            raise
+
+    @callback
+    def async_handle_api_error(self, err: Exception) -> None:
+        """Refresh the session immediately if an API error was caused by auth."""
+        if is_auth_error(err):
+            _LOGGER.warning("Huckleberry API rejected the session (%s), refreshing token", err)
+            self.async_refresh_session()
+
+    @callback
+    def async_schedule_session_refresh(self) -> None:
+        """Schedule the next token refresh shortly before the token expires."""
+        if self._unsub_session_refresh:
+            self._unsub_session_refresh()
+
+        expires_at = self.api.token_expires_at
+        if isinstance(expires_at, (int, float)):
+            delay = max(
+                expires_at - time.time() - SESSION_REFRESH_MARGIN.total_seconds(),
+                SESSION_REFRESH_MIN_DELAY.total_seconds(),
             )
+        else:
+            delay = SESSION_REFRESH_FALLBACK.total_seconds()
+
+        _LOGGER.debug("Next Huckleberry session refresh in %.0f s", delay)
+        self._unsub_session_refresh = async_call_later(
+            self.hass,
+            delay,
+            HassJob(self._async_scheduled_session_refresh, "Huckleberry session refresh", cancel_on_shutdown=True),
+        )
 
-            # Set up health listener (for growth tracking)
-            def make_health_callback(uid):
-                def callback(data):
-                    """Handle real-time health updates."""
-                    if uid not in self._realtime_data:
-                        self._realtime_data[uid] = {"child": child}
-
-                    # Extract growth data from prefs.lastGrowthEntry
-                    prefs = data.get("prefs", {})
-                    last_growth = prefs.get("lastGrowthEntry", {})
-
-                    _LOGGER.debug("Health data received for %s: has_prefs=%s, has_lastGrowthEntry=%s",
-                                  uid, bool(prefs), bool(last_growth))
-
-                    if last_growth:
-                        growth_data: GrowthData = {
-                            "weight": last_growth.get("weight"),
-                            "height": last_growth.get("height"),
-                            "head": last_growth.get("head"),
-                            "weight_units": last_growth.get("weightUnits", "kg"),
-                            "height_units": last_growth.get("heightUnits", "cm"),
-                            "head_units": last_growth.get("headUnits", "hcm"),
-                            "timestamp": last_growth.get("start"),
-                        }
-                        self._realtime_data[uid]["growth_data"] = growth_data
-                        _LOGGER.debug("Updated growth data: weight=%s, height=%s, head=%s, timestamp=%s",
-                                      growth_data.get("weight"), growth_data.get("height"),
-                                      growth_data.get("head"), growth_data.get("timestamp"))
-                    else:
-                        # Set empty growth data if none exists
-                        empty_growth: GrowthData = {
-                            "weight_units": "kg",
-                            "height_units": "cm",
-                            "head_units": "hcm",
-                        }
-                        self._realtime_data[uid]["growth_data"] = empty_growth
-                        _LOGGER.debug("No growth data found in health document")
-
-                    # Trigger coordinator update
-                    self.hass.loop.call_soon_threadsafe(
-                        self.async_set_updated_data, dict(self._realtime_data)
-                    )
-                return callback
-
-            await self.hass.async_add_executor_job(
-                self.api.setup_health_listener, child_uid, make_health_callback(child_uid)
-            )
+    @callback
+    def _async_scheduled_session_refresh(self, _now: datetime) -> None:
+        """Refresh the session when the scheduled time is reached."""
+        self._unsub_session_refresh = None
+        self.async_refresh_session()
 
-            # Set up diaper listener (for diaper tracking)
-            def make_diaper_callback(uid):
-                def callback(data):
-                    """Handle real-time diaper updates."""
-                    if uid not in self._realtime_data:
-                        self._realtime_data[uid] = {"child": child}
-                    self._realtime_data[uid]["diaper_data"] = data
-                    # Trigger coordinator update
-                    self.hass.loop.call_soon_threadsafe(
-                        self.async_set_updated_data, dict(self._realtime_data)
-                    )
-                return callback
-
-            await self.hass.async_add_executor_job(
-                self.api.setup_diaper_listener, child_uid, make_diaper_callback(child_uid)
+    @callback
+    def async_refresh_session(self) -> None:
+        """Refresh the session now, unless a refresh is already running."""
+        if self._session_refresh_task and not self._session_refresh_task.done():
+            return
+        self._session_refresh_task = self.hass.async_create_background_task(
+            self._async_refresh_session(), "Huckleberry session refresh"
+        )
+
+    async def _async_refresh_session(self) -> None:
+        """Refresh the auth token and schedule the next refresh."""
+        try:
+            await self.executor.async_run(LANE_INTERACTIVE, self._refresh_session)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error("Failed to refresh Huckleberry session: %s", err)
+        else:
+            if self._session_store:
+                await self._session_store.async_save(_session_data(self.api))
+        self.async_schedule_session_refresh()
+
+    def _refresh_session(self) -> None:
+        """Refresh the token, falling back to password authentication."""
+        with self._session_lock:
+            if self.api.refresh_token:
+                try:
+                    self.api.refresh_auth_token()
+                    return
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.warning("Token refresh failed, authenticating again: %s", err)
+            self.api.authenticate()
+
+    def firestore_client(self) -> Any:
+        """Return the Firestore client of the session, created by one thread at a time."""
+        with self._session_lock:
+            return self.api._get_firestore_client()  # pylint: disable=protected-access
+
+    def _make_listener_callback(self, stream: str, child_uid: str) -> Callable[[Any], None]:
+        """Return the Firestore callback for one child/stream."""
+        health = self._streams.setdefault((child_uid, stream), ListenerStreamHealth())
+
+        if stream == "health":
+            def health_callback(data):
+                """Handle real-time health updates."""
+                health.last_event = time.time()
+                self._schedule_topic_update(child_uid, "growth_data", _extract_growth_data(child_uid, data))
+            return health_callback
+
+        key = LISTENER_STREAMS[stream][1]
+
+        def document_callback(data):
+            """Handle real-time sleep, feed and diaper updates."""
+            health.last_event = time.time()
+            self._schedule_topic_update(child_uid, key, data)
+        return document_callback
+
+    def _subscribe_stream(self, stream: str, child_uid: str) -> None:
+        """Register a single Firestore listener.
+
+        A session refresh recreates every listener, so registering waits for it.
+        """
+        setup_method = getattr(self.api, LISTENER_STREAMS[stream][0])
+        with self._session_lock:
+            setup_method(child_uid, self._make_listener_callback(stream, child_uid))
+
+    def _resubscribe_stream(self, stream: str, child_uid: str) -> None:
+        """Tear down and recreate a single Firestore listener."""
+        with self._session_lock:
+            watch = self.api._listeners.get(f"{stream}_{child_uid}")  # pylint: disable=protected-access
+            if watch is not None:
+                try:
+                    watch.unsubscribe()
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.debug("Error stopping %s listener for child %s: %s", stream, child_uid, err)
+            setup_method = getattr(self.api, LISTENER_STREAMS[stream][0])
+            setup_method(child_uid, self._make_listener_callback(stream, child_uid))
+
+    def _stream_is_stalled(self, stream: str, child_uid: str, health: ListenerStreamHealth, now: float) -> bool:
+        """Return True if a listener is gone, inactive or silent for too long."""
+        watch = self.api._listeners.get(f"{stream}_{child_uid}")  # pylint: disable=protected-access
+        if watch is None or getattr(watch, "is_active", True) is False:
+            return True
+        last_seen = max(health.last_event or 0, health.last_subscribed or 0)
+        return now - last_seen > STREAM_STALE_AFTER.total_seconds()
+
+    async def _async_watchdog(self, _now: datetime | None = None) -> None:
+        """Resubscribe stalled listeners one stream at a time."""
+        now = time.time()
+        stalled = [
+            (stream, child_uid, health)
+            for (child_uid, stream), health in self._streams.items()
+            if not health.resubscribing
+            and now >= health.next_attempt
+            and self._stream_is_stalled(stream, child_uid, health, now)
+        ]
+        await asyncio.gather(*(
+            self._async_resubscribe_stream(stream, child_uid, health)
+            for stream, child_uid, health in stalled
+        ))
+
+    async def _async_resubscribe_stream(
+        self, stream: str, child_uid: str, health: ListenerStreamHealth
+    ) -> None:
+        """Resubscribe one stream, backing off exponentially with jitter on failure."""
+        name = f"{child_uid}/{stream}"
+        _LOGGER.info("Resubscribing stalled %s listener for child %s", stream, child_uid)
+        health.resubscribing = True
+        try:
+            await self.async_api_call(
+                self._resubscribe_stream, stream, child_uid, lane=LANE_BACKGROUND
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            health.failures += 1
+            delay = min(
+                STREAM_RETRY_BASE.total_seconds() * 2 ** (health.failures - 1),
+                STREAM_RETRY_MAX.total_seconds(),
+            )
+            health.next_attempt = time.time() + delay * random.uniform(0.5, 1.5)
+            _LOGGER.warning(
+                "Failed to resubscribe %s listener for child %s (attempt %d): %s",
+                stream, child_uid, health.failures, err,
             )
+            if name not in self.failed_listeners:
+                self.failed_listeners.append(name)
+        else:
+            health.failures = 0
+            health.next_attempt = 0
+            health.resubscribes += 1
+            health.last_subscribed = time.time()
+            if name in self.failed_listeners:
+                self.failed_listeners.remove(name)
+        finally:
+            health.resubscribing = False
+
+    @property
+    def stream_health(self) -> dict[str, dict[str, Any]]:
+        """Return per child/stream listener health for diagnostics."""
+        now = time.time()
+        result: dict[str, dict[str, Any]] = {}
+        for (child_uid, stream), health in self._streams.items():
+            result[f"{child_uid}/{stream}"] = {
+                "last_event": _isoformat(health.last_event),
+                "last_subscribed": _isoformat(health.last_subscribed),
+                "stalled": self._stream_is_stalled(stream, child_uid, health, now),
+                "resubscribes": health.resubscribes,
+                "failures": health.failures,
+                "next_attempt": _isoformat(health.next_attempt),
+            }
+        return result
 
-        _LOGGER.info("Real-time listeners active - updates will be instant!")
+    async def async_setup_listeners(self) -> None:
+        """Set up real-time listeners for instant updates.
 
-    async def _async_update_data(self) -> dict[str, ChildRealtimeData]:
-        """Update data via library (fallback when listeners aren't active)."""
-        # Ensure session is valid (refresh token if needed) to keep listeners alive
+        All child/stream listeners are registered concurrently, at most
+        MAX_CONCURRENT_LISTENER_SETUPS at a time. A stream that fails to
+        register is logged and skipped without affecting the others.
+        """
+        _LOGGER.info("Setting up real-time Firestore listeners")
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LISTENER_SETUPS)
+        self.failed_listeners = []
+
+        async def _async_setup_listener(stream: str, child_uid: str) -> None:
+            async with semaphore:
+                try:
+                    await self.async_api_call(self._subscribe_stream, stream, child_uid, lane=LANE_BACKGROUND)
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.error("Failed to set up %s listener for child %s: %s", stream, child_uid, err)
+                    self.failed_listeners.append(f"{child_uid}/{stream}")
+                else:
+                    self._streams[(child_uid, stream)].last_subscribed = time.time()
+
+        start = time.monotonic()
+        # The listeners share one Firestore client, create it before they race for it
         try:
-            await self.hass.async_add_executor_job(self.api.maintain_session)
-        except Exception as err:
-            _LOGGER.error("Failed to maintain Huckleberry session: %s", err)
+            await self.async_api_call(self.firestore_client, lane=LANE_BACKGROUND)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Error creating the Firestore client: %s", err)
+        await asyncio.gather(*(
+            _async_setup_listener(stream, child["uid"])
+            for child in self.children
+            for stream in LISTENER_STREAMS
+        ))
+        self.listener_setup_seconds = time.monotonic() - start
+
+        _LOGGER.info(
+            "Real-time listeners active for %d children in %.2f s (%d failed) - updates will be instant!",
+            len(self.children), self.listener_setup_seconds, len(self.failed_listeners),
+        )
 
-        # If we have real-time data, return it (listeners populate sleep, feed, health, diaper)
-        if self._realtime_data:
-            return dict(self._realtime_data)
+        # Watch every stream and resubscribe the ones that stall or failed to register
+        if self._unsub_watchdog is None:
+            self._unsub_watchdog = async_track_time_interval(
+                self.hass, self._async_watchdog, WATCHDOG_INTERVAL, cancel_on_shutdown=True
+            )
 
-        # Initial data structure - listeners will populate it
+    async def _async_update_data(self) -> Mapping[str, ChildRealtimeData]:
+        """Return the realtime data (listeners are the only data source)."""
+        # Initial data structure - listeners populate sleep, feed, health and diaper
         # Don't fetch growth data here - the health listener handles it
-        data: dict[str, ChildRealtimeData] = {}
         for child in self.children:
-            child_uid = child["uid"]
-            data[child_uid] = {
-                "child": child,
-                "sleep_status": {},
-                # growth_data will be populated by health listener
-            }
+            if child["uid"] not in self._realtime_data:
+                self._realtime_data[child["uid"]] = _freeze_child_data({
+                    "child": child,
+                    "sleep_status": {},
+                })
 
-        return data
+        self._parse_child_states(self._realtime_data)
+        return MappingProxyType(self._realtime_data)
 
     async def async_shutdown(self) -> None:
-        """Shutdown coordinator and stop listeners."""
+        """Shutdown coordinator, stop listeners and release the worker threads."""
+        if self._stopped:
+            return
+        self._stopped = True
         _LOGGER.info("Shutting down Huckleberry coordinator")
-        await self.hass.async_add_executor_job(self.api.stop_all_listeners)
+        if self._unsub_drain:
+            self._unsub_drain()
+            self._unsub_drain = None
+        if self._unsub_watchdog:
+            self._unsub_watchdog()
+            self._unsub_watchdog = None
+        if self._unsub_session_refresh:
+            self._unsub_session_refresh()
+            self._unsub_session_refresh = None
+        try:
+            await self.executor.async_run(LANE_BACKGROUND, self.api.stop_all_listeners)
+        finally:
+            try:
+                if self.history is not None:
+                    await self.history.async_close()
+            finally:
+                await self.executor.async_shutdown()
@@ -0,0 +1,160 @@
+"""Bulk export of a child's raw history to a columnar file.
+
+Each window is synced into the history store through the child's calendar,
+then its typed rows are read back and appended to the file. Parquet needs
+pyarrow, which is not a requirement of the integration; without it the
+export falls back to gzip compressed CSV.
+"""
+from __future__ import annotations
+
+import csv
+from datetime import datetime
+import gzip
+import importlib.util
+import os
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from .executor import LANE_BACKGROUND
+from .export import EXPORT_WINDOW, async_sync_window
+from .intervals import FIELDS, Row
+
+if TYPE_CHECKING:
+    from . import HuckleberryDataUpdateCoordinator
+    from .calendar import HuckleberryCalendar
+
+EXPORT_DIR = "huckleberry_exports"
+
+FORMAT_PARQUET = "parquet"
+FORMAT_CSV = "csv"
+
+# Category columns are empty for the rows of other categories. Durations are
+# in seconds, timestamps in UTC.
+COLUMNS: tuple[str, ...] = ("category", "start", "end", *FIELDS)
+
+
+class _ParquetWriter:
+    """Append row batches to a Parquet file as row groups."""
+
+    extension = "parquet"
+
+    def __init__(self, path: str) -> None:
+        """Open the file."""
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        duration = pa.duration("s")
+        timestamp = pa.timestamp("s", tz="UTC")
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("category", pa.dictionary(pa.int8(), pa.string())),
+                ("start", timestamp),
+                ("end", timestamp),
+                ("duration", duration),
+                ("left_duration", duration),
+                ("right_duration", duration),
+                ("mode", pa.string()),
+                ("poo_color", pa.string()),
+                ("poo_consistency", pa.string()),
+                ("amount", pa.string()),
+                ("weight", pa.float64()),
+                ("height", pa.float64()),
+                ("head", pa.float64()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, rows: list[Row]) -> None:
+        """Append a batch."""
+        self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self) -> None:
+        """Finish the file."""
+        self._writer.close()
+
+
+class _CsvWriter:
+    """Append row batches to a gzip compressed CSV file."""
+
+    extension = "csv.gz"
+
+    def __init__(self, path: str) -> None:
+        """Open the file and write the header."""
+        self._file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, COLUMNS, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, rows: list[Row]) -> None:
+        """Append a batch."""
+        self._writer.writerows(
+            {
+                **row,
+                "start": dt_util.utc_from_timestamp(row["start"]).isoformat(),
+                "end": dt_util.utc_from_timestamp(row["end"]).isoformat(),
+            }
+            for row in rows
+        )
+
+    def close(self) -> None:
+        """Finish the file."""
+        self._file.close()
+
+
+def _has_pyarrow() -> bool:
+    """Return True if pyarrow can be imported."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _open_writer(fmt: str, directory: str, name: str) -> tuple[_ParquetWriter | _CsvWriter, str]:
+    """Open the export file, falling back to CSV if pyarrow is not installed."""
+    writer_class = _ParquetWriter if fmt == FORMAT_PARQUET and _has_pyarrow() else _CsvWriter
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.{writer_class.extension}")
+    return writer_class(path), path
+
+
+async def async_export_history(
+    coordinator: HuckleberryDataUpdateCoordinator,
+    calendar: HuckleberryCalendar,
+    start: datetime,
+    end: datetime,
+    fmt: str,
+) -> dict[str, Any]:
+    """Write the history of a child between start and end to a file in the export directory.
+
+    Raises HistoryUnavailable, and removes the file, if a window can't be synced.
+    """
+    executor = coordinator.executor
+    child_uid = calendar.child_uid
+    name = f"{child_uid}_{dt_util.utcnow().strftime('%Y%m%dT%H%M%S')}"
+    writer, path = await executor.async_run(
+        LANE_BACKGROUND, _open_writer, fmt, coordinator.hass.config.path(EXPORT_DIR), name
+    )
+
+    rows = 0
+    completed = False
+    try:
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + EXPORT_WINDOW, end)
+            await async_sync_window(calendar, window_start, window_end)
+            async for batch in coordinator.history.async_iter_intervals(
+                child_uid, int(window_start.timestamp()), int(window_end.timestamp())
+            ):
+                await executor.async_run(LANE_BACKGROUND, writer.write, batch)
+                rows += len(batch)
+            window_start = window_end
+        completed = True
+    finally:
+        await executor.async_run(LANE_BACKGROUND, writer.close)
+        if not completed:
+            # A partial file must not pass for a complete export
+            await executor.async_run(LANE_BACKGROUND, os.remove, path)
+
+    return {
+        "path": path,
+        "format": FORMAT_PARQUET if isinstance(writer, _ParquetWriter) else FORMAT_CSV,
+        "rows": rows,
+    }
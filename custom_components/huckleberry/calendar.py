@@ -1,22 +1,94 @@
 """Calendar platform for Huckleberry integration."""
 from __future__ import annotations
 
+import asyncio
+from bisect import bisect_right
+from collections.abc import Callable
 import logging
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.util import dt as dt_util
 
 from . import HuckleberryEntryData
-from .const import DOMAIN
+from .const import CONF_HOUSEHOLD_CALENDAR, DEFAULT_HOUSEHOLD_CALENDAR, DOMAIN
 from .entity import HuckleberryBaseEntity
+from .executor import LANE_BACKGROUND
+from .export import async_register_export_view
+from .history_store import IntervalCoverage
+from .intervals import Row, fetch_multi_entry_rows, fetch_rows, rows_between
+from .models import ChildState
 
 _LOGGER = logging.getLogger(__name__)
 
+CATEGORIES = ("sleep", "feed", "diaper", "health")
+
+# Window around a new realtime entry that is fetched again
+INVALIDATION_MARGIN = int(timedelta(hours=1).total_seconds())
+
+# Synced history is fetched again periodically to pick up edits and deletions
+RECONCILE_INTERVAL = timedelta(hours=6)
+RECONCILE_WINDOW = int(timedelta(days=7).total_seconds())
+
+# The windows before and after a viewed one are prefetched once the user has
+# stayed on it this long, so fast paging doesn't queue fetches nobody waits for
+PREFETCH_DELAY = timedelta(seconds=1)
+# Longer windows, like list views over months, are not prefetched
+PREFETCH_MAX_SPAN = timedelta(days=31)
+
+# Unsynced ranges are fetched in chunks of this size, a few at a time per calendar
+FETCH_CHUNK = int(timedelta(days=14).total_seconds())
+MAX_CONCURRENT_CHUNKS = 4
+
+
+def _latest_entries(state: ChildState) -> dict[str, float | None]:
+    """Return the start of the latest entry per category reported by the listeners."""
+    return {
+        "sleep": state.sleep.last_sleep_start,
+        "feed": state.feed.last_nursing_start,
+        "diaper": state.diaper.start,
+        "health": state.growth.timestamp,
+    }
+
+
+def _utc_datetime(timestamp: int) -> datetime:
+    """Convert a timestamp in seconds to an aware datetime."""
+    return datetime.fromtimestamp(timestamp, tz=dt_util.UTC)
+
+
+class _UpcomingEvents:
+    """Events of the last served window, sorted by start, with a memoized next event."""
+
+    def __init__(self) -> None:
+        """Initialize without events."""
+        self._events: list[CalendarEvent] = []
+        self._starts: list[datetime] = []
+        # Valid until its start passes or the events are replaced
+        self._next: CalendarEvent | None = None
+        self._next_valid = False
+
+    def replace(self, events: list[CalendarEvent]) -> None:
+        """Replace the events with a list sorted by start time."""
+        self._events = events
+        self._starts = [event.start for event in events]
+        self._next_valid = False
+
+    def next_after(self, now: datetime) -> CalendarEvent | None:
+        """Return the first event starting after now."""
+        if self._next_valid and (self._next is None or now < self._next.start):
+            return self._next
+
+        index = bisect_right(self._starts, now)
+        self._next = self._events[index] if index < len(self._events) else None
+        self._next_valid = True
+        return self._next
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -32,6 +104,12 @@ async def async_setup_entry(
     entities = []
     for child in children:
         entities.append(HuckleberryCalendar(coordinator, child, api))
+    # The export view looks the child calendars up here
+    data["calendars"] = {calendar.child_uid: calendar for calendar in entities}
+    async_register_export_view(hass)
+
+    if entry.options.get(CONF_HOUSEHOLD_CALENDAR, DEFAULT_HOUSEHOLD_CALENDAR):
+        entities.append(HuckleberryHouseholdCalendar(entry, coordinator, list(entities)))
 
     async_add_entities(entities)
 
@@ -41,20 +119,47 @@ class HuckleberryCalendar(HuckleberryBaseEntity, CalendarEntity):
 
     _attr_has_entity_name = True
     _attr_name = "Events"
+    # New entries show up in these documents and invalidate the synced windows
+    _data_keys = ("sleep_status", "feed_status", "diaper_data", "growth_data")
 
     def __init__(self, coordinator, child, api) -> None:
         """Initialize the calendar."""
         super().__init__(coordinator, child)
         self._api = api
         self._attr_unique_id = f"{child['uid']}_calendar"
-        self._events: list[CalendarEvent] = []
+        self._upcoming = _UpcomingEvents()
+        # At most the two windows next to the last viewed one, synced one category at a time
+        self._prefetches: dict[tuple[datetime, datetime], asyncio.Task[None]] = {}
+        self._prefetch_window: tuple[datetime, datetime] | None = None
+        self._unsub_prefetch: CALLBACK_TYPE | None = None
+        self._prefetch_job = HassJob(
+            self._async_start_prefetch, "Huckleberry calendar prefetch", cancel_on_shutdown=True
+        )
+        self._fetch_slots = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+        # Gaps being fetched per category, resolved with False if their sync was cancelled
+        self._pending: dict[str, dict[tuple[int, int], asyncio.Future[bool]]] = {
+            category: {} for category in CATEGORIES
+        }
+        self._history = coordinator.history
+        self._latest_entries: dict[str, float | None] = {}
+
+    async def async_added_to_hass(self) -> None:
+        """Schedule the reconciliation of synced history."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_prefetch)
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_schedule_reconcile,
+                RECONCILE_INTERVAL,
+                cancel_on_shutdown=True,
+            )
+        )
 
     @property
     def event(self) -> CalendarEvent | None:
         """Return the next upcoming event."""
-        now = dt_util.now()
-        upcoming = [e for e in self._events if e.start > now]
-        return min(upcoming, key=lambda e: e.start) if upcoming else None
+        return self._upcoming.next_after(dt_util.now())
 
     async def async_get_events(
         self,
@@ -70,264 +175,396 @@ class HuckleberryCalendar(HuckleberryBaseEntity, CalendarEntity):
             end_date,
         )
 
-        events: list[CalendarEvent] = []
+        # The user moved on, prefetching anything but this window is wasted
+        self._async_cancel_prefetch(keep=(start_date, end_date))
 
-        # Fetch sleep intervals
-        events.extend(
-            await self.hass.async_add_executor_job(
-                self._fetch_sleep_events, start_date, end_date
-            )
-        )
+        return await self._async_fetch_events(start_date, end_date)
 
-        # Fetch feeding intervals
-        events.extend(
-            await self.hass.async_add_executor_job(
-                self._fetch_feed_events, start_date, end_date
-            )
-        )
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Invalidate the synced windows that new realtime entries fall in."""
+        if (state := self.child_state) is None:
+            return
 
-        # Fetch diaper intervals
-        events.extend(
-            await self.hass.async_add_executor_job(
-                self._fetch_diaper_events, start_date, end_date
-            )
-        )
+        latest = _latest_entries(state)
+        for category, start in latest.items():
+            if start is not None and start != self._latest_entries.get(category):
+                _LOGGER.debug("New %s entry for %s, invalidating its window", category, self.child_name)
+                start = int(start)
+                self._history.async_invalidate(
+                    self._child["uid"], category, start - INVALIDATION_MARGIN, start + INVALIDATION_MARGIN
+                )
+        self._latest_entries = latest
 
-        # Fetch health/growth entries
-        events.extend(
-            await self.hass.async_add_executor_job(
-                self._fetch_health_events, start_date, end_date
-            )
+    @callback
+    def _async_schedule_reconcile(self, _now: datetime) -> None:
+        """Reconcile synced history without holding up anything else."""
+        self.hass.async_create_background_task(
+            self._async_reconcile(), f"huckleberry reconcile {self._child['uid']}"
         )
 
-        # Sort by start time
-        events.sort(key=lambda e: e.start)
-
-        self._events = events
-        _LOGGER.debug("Found %d events for %s", len(events), self._child["name"])
-
-        return events
-
-    def _fetch_sleep_events(
-        self, start_date: datetime, end_date: datetime
-    ) -> list[CalendarEvent]:
-        """Fetch sleep intervals using API."""
-        events = []
+    async def _async_reconcile(self) -> None:
+        """Fetch the recently synced history again to pick up edited entries."""
+        now = int(dt_util.utcnow().timestamp())
         child_uid = self._child["uid"]
-
-        try:
-            # Convert to timestamps (seconds)
-            start_s = int(start_date.timestamp())
-            end_s = int(end_date.timestamp())
-
-            # Fetch intervals from API
-            intervals = self._api.get_sleep_intervals(child_uid, start_s, end_s)
-
-            for interval in intervals:
-                start_time = datetime.fromtimestamp(
-                    interval["start"], tz=dt_util.DEFAULT_TIME_ZONE
+        fetchers = self._category_fetchers()
+        for category in CATEGORIES:
+            if (high_water_mark := self._history.high_water_mark(child_uid, category)) is None:
+                continue
+            # Only the last days up to the high-water mark are checked for edits
+            ranges = [
+                (max(range_start, now - RECONCILE_WINDOW), range_end)
+                for range_start, range_end in self._history.coverage(child_uid, category).ranges
+                if range_end > now - RECONCILE_WINDOW
+            ]
+            if not ranges:
+                continue
+            _LOGGER.debug(
+                "Reconciling %s events for %s up to %s", category, self.child_name, high_water_mark
+            )
+            try:
+                multi_entry_rows = await self.coordinator.async_api_call(
+                    self._fetch_multi_entries, category, lane=LANE_BACKGROUND
                 )
-
-                duration_seconds = interval.get("duration", 0)
-                duration_minutes = int(duration_seconds / 60)
-                end_time = start_time + timedelta(minutes=duration_minutes)
-
-                # Format duration as hours and minutes
-                if duration_minutes >= 60:
-                    hours = duration_minutes // 60
-                    mins = duration_minutes % 60
-                    duration_str = f"{hours}h {mins}m" if mins > 0 else f"{hours}h"
-                else:
-                    duration_str = f"{duration_minutes}m"
-
-                summary = f"💤 Sleep ({duration_str})"
-                description = f"Sleep duration: {duration_str}"
-
-                events.append(
-                    CalendarEvent(
-                        start=start_time,
-                        end=end_time,
-                        summary=summary,
-                        description=description,
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Error reconciling %s events: %s", category, err)
+                continue
+            for range_start, range_end in ranges:
+                generation = self._history.generation(child_uid, category)
+                try:
+                    rows = await self.coordinator.async_api_call(
+                        fetchers[category],
+                        _utc_datetime(range_start),
+                        _utc_datetime(range_end),
+                        lane=LANE_BACKGROUND,
                     )
-                )
-
-            _LOGGER.debug("Found %d sleep events", len(events))
-
-        except Exception as err:
-            _LOGGER.error("Error fetching sleep events: %s", err)
-
-        return events
-
-    def _fetch_feed_events(
+                    rows += rows_between(multi_entry_rows, range_start, range_end)
+                    # A realtime invalidation wins over the reconciled copy
+                    if self._history.generation(child_uid, category) == generation:
+                        await self._history.async_add(
+                            child_uid, category, range_start, range_end, rows
+                        )
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.debug("Error reconciling %s events: %s", category, err)
+
+    def _category_fetchers(
+        self,
+    ) -> dict[str, Callable[[datetime, datetime], list[Row]]]:
+        """Return the blocking fetch method of each category."""
+        return {
+            "sleep": self._fetch_sleep_events,
+            "feed": self._fetch_feed_events,
+            "diaper": self._fetch_diaper_events,
+            "health": self._fetch_health_events,
+        }
+
+    async def _async_fetch_events(
         self, start_date: datetime, end_date: datetime
     ) -> list[CalendarEvent]:
-        """Fetch feeding intervals using API."""
-        events = []
-        child_uid = self._child["uid"]
-
-        try:
-            # Convert to timestamps (seconds)
-            start_s = int(start_date.timestamp())
-            end_s = int(end_date.timestamp())
+        """Sync a window, then read it from the history store."""
+        await self.async_sync(start_date, end_date)
+        # Sorted by start time
+        events = await self._history.async_events_between(
+            self._child["uid"], int(start_date.timestamp()), int(end_date.timestamp())
+        )
 
-            # Fetch intervals from API
-            intervals = self._api.get_feed_intervals(child_uid, start_s, end_s)
+        self._upcoming.replace(events)
+        _LOGGER.debug("Found %d events for %s", len(events), self._child["name"])
 
-            for interval in intervals:
-                start_time = datetime.fromtimestamp(
-                    interval["start"], tz=dt_util.DEFAULT_TIME_ZONE
-                )
+        self._async_schedule_prefetch(start_date, end_date)
 
-                # Check if this is a multi-entry document (durations in seconds)
-                # or regular document (durations in minutes)
-                if interval.get("is_multi_entry"):
-                    # Multi-entry: durations are in SECONDS, convert to minutes
-                    left_duration = round(interval.get("leftDuration", 0) / 60)
-                    right_duration = round(interval.get("rightDuration", 0) / 60)
-                else:
-                    # Regular doc: durations are in minutes
-                    left_duration = int(interval.get("leftDuration", 0))
-                    right_duration = int(interval.get("rightDuration", 0))
-
-                total_duration = left_duration + right_duration
-                end_time = start_time + timedelta(minutes=total_duration)
-
-                # Build summary based on sides used
-                sides = []
-                if left_duration > 0:
-                    sides.append(f"L:{left_duration}m")
-                if right_duration > 0:
-                    sides.append(f"R:{right_duration}m")
-
-                sides_str = " ".join(sides) if sides else f"{total_duration}m"
-                summary = f"🍼 Feed ({sides_str})"
-                description = f"Feeding - Total: {total_duration} minutes"
-                if left_duration > 0:
-                    description += f"\nLeft: {left_duration} minutes"
-                if right_duration > 0:
-                    description += f"\nRight: {right_duration} minutes"
-
-                events.append(
-                    CalendarEvent(
-                        start=start_time,
-                        end=end_time,
-                        summary=summary,
-                        description=description,
-                    )
-                )
+        return events
 
-            _LOGGER.debug("Found %d feed events", len(events))
+    async def async_sync(self, start_date: datetime, end_date: datetime) -> None:
+        """Sync the unsynced parts of a window into the history store, all categories at once.
+
+        Overlapping syncs, from this calendar, the household calendar or a
+        prefetch, fetch each gap once and wait for each other.
+        """
+        start_s = int(start_date.timestamp())
+        end_s = int(end_date.timestamp())
+        await asyncio.gather(
+            *(
+                self._async_sync_category(category, fetch, start_s, end_s)
+                for category, fetch in self._category_fetchers().items()
+            )
+        )
 
-        except Exception as err:
-            _LOGGER.error("Error fetching feed events: %s", err)
+    @callback
+    def _async_schedule_prefetch(self, start_date: datetime, end_date: datetime) -> None:
+        """Prefetch the windows around a served one if the user stays on it."""
+        if self._unsub_prefetch:
+            self._unsub_prefetch()
+            self._unsub_prefetch = None
+        if end_date - start_date > PREFETCH_MAX_SPAN:
+            return
+        self._prefetch_window = (start_date, end_date)
+        self._unsub_prefetch = async_call_later(self.hass, PREFETCH_DELAY, self._prefetch_job)
+
+    @callback
+    def _async_start_prefetch(self, _now: datetime) -> None:
+        """Start background syncs of the next and previous windows."""
+        self._unsub_prefetch = None
+        if self._prefetch_window is None:
+            return
+        start_date, end_date = self._prefetch_window
+        span = end_date - start_date
+        for window in ((end_date, end_date + span), (start_date - span, start_date)):
+            if window in self._prefetches or self.is_synced(*window):
+                continue
+            _LOGGER.debug("Prefetching calendar events for %s from %s to %s", self.child_name, *window)
+            task = self.hass.async_create_background_task(
+                self._async_prefetch(*window), f"huckleberry prefetch {self._child['uid']}"
+            )
+            self._prefetches[window] = task
+            task.add_done_callback(partial(self._async_prefetch_done, window))
+
+    @callback
+    def _async_prefetch_done(
+        self, window: tuple[datetime, datetime], task: asyncio.Task[None]
+    ) -> None:
+        """Forget a finished prefetch, unless a newer one of the window replaced it."""
+        if self._prefetches.get(window) is task:
+            del self._prefetches[window]
+
+    @callback
+    def _async_cancel_prefetch(self, keep: tuple[datetime, datetime] | None = None) -> None:
+        """Cancel the pending and running prefetches, except the one of a window."""
+        if self._unsub_prefetch:
+            self._unsub_prefetch()
+            self._unsub_prefetch = None
+        for window, task in list(self._prefetches.items()):
+            if window != keep:
+                task.cancel()
+                del self._prefetches[window]
+
+    def is_synced(self, start_date: datetime, end_date: datetime) -> bool:
+        """Return True if every category of a window is synced already."""
+        start_s = int(start_date.timestamp())
+        end_s = int(end_date.timestamp())
+        return not any(
+            self._history.coverage(self._child["uid"], category).missing(start_s, end_s)
+            for category in CATEGORIES
+        )
 
-        return events
+    async def _async_prefetch(self, start_date: datetime, end_date: datetime) -> None:
+        """Sync a window into the history store without reading it back."""
+        start_s = int(start_date.timestamp())
+        end_s = int(end_date.timestamp())
+        # One category at a time, so a prefetch never fills the background lane
+        for category, fetch in self._category_fetchers().items():
+            await self._async_sync_category(category, fetch, start_s, end_s)
 
-    def _fetch_diaper_events(
-        self, start_date: datetime, end_date: datetime
-    ) -> list[CalendarEvent]:
-        """Fetch diaper intervals using API."""
-        events = []
+    async def _async_sync_category(
+        self,
+        category: str,
+        fetch: Callable[[datetime, datetime], list[Row]],
+        start_s: int,
+        end_s: int,
+    ) -> None:
+        """Fetch the ranges of a category not synced yet, or wait for the syncs fetching them."""
+        pending = self._pending[category]
+        while True:
+            waiting = [
+                future
+                for (gap_start, gap_end), future in pending.items()
+                if gap_start < end_s and gap_end > start_s
+            ]
+            in_flight = IntervalCoverage()
+            for gap in pending:
+                in_flight.add(*gap)
+            gaps = [
+                own_gap
+                for gap in self._history.coverage(self._child["uid"], category).missing(start_s, end_s)
+                for own_gap in in_flight.missing(*gap)
+            ]
+            if gaps:
+                done = self.hass.loop.create_future()
+                for gap in gaps:
+                    pending[gap] = done
+                completed = False
+                try:
+                    await self._async_fetch_gaps(category, fetch, gaps)
+                    completed = True
+                finally:
+                    for gap in gaps:
+                        del pending[gap]
+                    done.set_result(completed)
+            if not waiting:
+                return
+            await asyncio.wait(waiting)
+            # The gaps of a cancelled sync are fetched again by the syncs that waited for it
+            if all(future.result() for future in waiting):
+                return
+
+    async def _async_fetch_gaps(
+        self,
+        category: str,
+        fetch: Callable[[datetime, datetime], list[Row]],
+        gaps: list[tuple[int, int]],
+    ) -> None:
+        """Fetch gaps of a category into the history store."""
         child_uid = self._child["uid"]
-
+        generation = self._history.generation(child_uid, category)
+        # Entries can still be logged after this point, so only history up to
+        # now is marked synced and later requests fetch just the delta
+        synced_at = int(dt_util.utcnow().timestamp())
+        # Long gaps are fetched in chunks, so each call converts and stores a
+        # bounded number of intervals whatever the size of the window
+        chunks = [
+            (chunk_start, min(chunk_start + FETCH_CHUNK, gap_end))
+            for gap_start, gap_end in gaps
+            for chunk_start in range(gap_start, gap_end, FETCH_CHUNK)
+        ]
+        # Entries batched into multi-entry documents are fetched once and split over the chunks
         try:
-            # Convert to timestamps (seconds)
-            start_s = int(start_date.timestamp())
-            end_s = int(end_date.timestamp())
-
-            # Fetch intervals from API
-            intervals = self._api.get_diaper_intervals(child_uid, start_s, end_s)
-
-            for interval in intervals:
-                event_time = datetime.fromtimestamp(
-                    interval["start"], tz=dt_util.DEFAULT_TIME_ZONE
+            async with self._fetch_slots:
+                multi_entry_rows = await self.coordinator.async_api_call(
+                    self._fetch_multi_entries, category, lane=LANE_BACKGROUND
                 )
-
-                # Diaper change is an instant event (same start/end)
-                mode = interval.get("mode", "unknown")
-                mode_emoji = {
-                    "pee": "💧",
-                    "poo": "💩",
-                    "both": "💧💩",
-                    "dry": "✅",
-                }.get(mode, "🩲")
-
-                summary = f"{mode_emoji} Diaper ({mode.capitalize()})"
-                description = f"Diaper change: {mode}"
-
-                # Add details if available
-                if "pooColor" in interval:
-                    description += f"\nColor: {interval['pooColor']}"
-                if "pooConsistency" in interval:
-                    description += f"\nConsistency: {interval['pooConsistency']}"
-                if "amount" in interval:
-                    description += f"\nAmount: {interval['amount']}"
-
-                events.append(
-                    CalendarEvent(
-                        start=event_time,
-                        end=event_time,
-                        summary=summary,
-                        description=description,
-                    )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error("Error fetching %s events: %s", category, err)
+            return
+        await asyncio.gather(
+            *(
+                self._async_sync_chunk(
+                    category,
+                    fetch,
+                    rows_between(multi_entry_rows, chunk_start, chunk_end),
+                    generation,
+                    synced_at,
+                    chunk_start,
+                    chunk_end,
                 )
+                for chunk_start, chunk_end in chunks
+            )
+        )
 
-            _LOGGER.debug("Found %d diaper events", len(events))
-
-        except Exception as err:
-            _LOGGER.error("Error fetching diaper events: %s", err)
-
-        return events
-
-    def _fetch_health_events(
-        self, start_date: datetime, end_date: datetime
-    ) -> list[CalendarEvent]:
-        """Fetch health/growth entries using API."""
-        events = []
+    async def _async_sync_chunk(
+        self,
+        category: str,
+        fetch: Callable[[datetime, datetime], list[Row]],
+        multi_entry_rows: list[Row],
+        generation: int,
+        synced_at: int,
+        chunk_start: int,
+        chunk_end: int,
+    ) -> None:
+        """Fetch one chunk of a category and store it with its multi-entry rows as soon as it arrives."""
         child_uid = self._child["uid"]
-
         try:
-            # Convert to timestamps (seconds)
-            start_s = int(start_date.timestamp())
-            end_s = int(end_date.timestamp())
+            async with self._fetch_slots:
+                rows = await self.coordinator.async_api_call(
+                    fetch, _utc_datetime(chunk_start), _utc_datetime(chunk_end), lane=LANE_BACKGROUND
+                )
+        except Exception as err:  # pylint: disable=broad-except
+            # Whatever was stored for the chunk before is served instead
+            _LOGGER.error("Error fetching %s events: %s", category, err)
+            return
+
+        if self._history.generation(child_uid, category) != generation:
+            # Invalidated while fetching: store the result but fetch it again next time
+            synced_until = chunk_start
+        else:
+            synced_until = min(chunk_end, max(chunk_start, synced_at))
+        try:
+            await self._history.async_add(
+                child_uid, category, chunk_start, chunk_end, rows + multi_entry_rows, synced_until
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error("Error storing %s events: %s", category, err)
+
+    def _fetch_sleep_events(self, start_date: datetime, end_date: datetime) -> list[Row]:
+        """Fetch the sleep intervals starting in a window."""
+        return self._fetch_rows("sleep", start_date, end_date)
+
+    def _fetch_feed_events(self, start_date: datetime, end_date: datetime) -> list[Row]:
+        """Fetch the feeding intervals starting in a window."""
+        return self._fetch_rows("feed", start_date, end_date)
+
+    def _fetch_diaper_events(self, start_date: datetime, end_date: datetime) -> list[Row]:
+        """Fetch the diaper changes in a window."""
+        return self._fetch_rows("diaper", start_date, end_date)
+
+    def _fetch_health_events(self, start_date: datetime, end_date: datetime) -> list[Row]:
+        """Fetch the growth measurements in a window."""
+        return self._fetch_rows("health", start_date, end_date)
+
+    def _fetch_multi_entries(self, category: str) -> list[Row]:
+        """Fetch the rows of a category batched into multi-entry documents, raising if the fetch fails."""
+        return fetch_multi_entry_rows(self.coordinator.firestore_client(), self._child["uid"], category)
+
+    def _fetch_rows(self, category: str, start_date: datetime, end_date: datetime) -> list[Row]:
+        """Fetch the rows of a category starting in a window, raising if the fetch fails."""
+        rows = fetch_rows(
+            self.coordinator.firestore_client(),
+            self._child["uid"],
+            category,
+            int(start_date.timestamp()),
+            int(end_date.timestamp()),
+        )
+        _LOGGER.debug("Found %d %s events", len(rows), category)
+        return rows
 
-            # Fetch entries from API
-            entries = self._api.get_health_entries(child_uid, start_s, end_s)
 
-            for entry in entries:
-                event_time = datetime.fromtimestamp(
-                    entry["start"], tz=dt_util.DEFAULT_TIME_ZONE
-                )
+class HuckleberryHouseholdCalendar(CalendarEntity):
+    """Calendar merging the events of every child of an account.
 
-                # Growth entry is an instant event
-                summary = "📏 Growth Measurement"
-                description = "Growth tracking:"
-
-                # Build description from available measurements
-                measurements = []
-                if "weight" in entry:
-                    measurements.append(f"Weight: {entry['weight']}")
-                if "height" in entry:
-                    measurements.append(f"Height: {entry['height']}")
-                if "head" in entry:
-                    measurements.append(f"Head: {entry['head']}")
-
-                if measurements:
-                    description += "\n" + "\n".join(measurements)
-
-                events.append(
-                    CalendarEvent(
-                        start=event_time,
-                        end=event_time,
-                        summary=summary,
-                        description=description,
-                    )
-                )
+    Syncs all children in one pass through their calendars, so the history
+    store and the synced ranges are shared, and reads the merged window
+    with a single query.
+    """
+
+    _attr_has_entity_name = False
+    _attr_name = "Huckleberry household events"
+    _attr_should_poll = False
 
-            _LOGGER.debug("Found %d health events", len(events))
+    def __init__(self, entry: ConfigEntry, coordinator, calendars: list[HuckleberryCalendar]) -> None:
+        """Initialize the calendar."""
+        self._attr_unique_id = f"{entry.entry_id}_household_calendar"
+        self._calendars = calendars
+        self._coordinator = coordinator
+        self._history = coordinator.history
+        self._child_names = {calendar.child_uid: calendar.child_name for calendar in calendars}
+        self._upcoming = _UpcomingEvents()
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state on coordinator updates and realtime entries of any child."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._coordinator.async_add_listener(self.async_write_ha_state))
+        for child_uid in self._child_names:
+            self.async_on_remove(
+                self._coordinator.async_add_topic_listener(
+                    self.async_write_ha_state, child_uid, HuckleberryCalendar._data_keys
+                )
+            )
 
-        except Exception as err:
-            _LOGGER.error("Error fetching health events: %s", err)
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next upcoming event."""
+        return self._upcoming.next_after(dt_util.now())
 
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Get the events of all children between start and end date."""
+        await asyncio.gather(*(calendar.async_sync(start_date, end_date) for calendar in self._calendars))
+        rows = await self._history.async_events_by_child_between(
+            list(self._child_names), int(start_date.timestamp()), int(end_date.timestamp())
+        )
+        events = [
+            CalendarEvent(
+                start=event.start,
+                end=event.end,
+                summary=f"{self._child_names[child_uid]}: {event.summary}",
+                description=event.description,
+                uid=event.uid,
+            )
+            for child_uid, event in rows
+        ]
+        self._upcoming.replace(events)
+        _LOGGER.debug("Found %d household events", len(events))
         return events
@@ -9,11 +9,19 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.util import dt as dt_util
 
 from huckleberry_api import HuckleberryAPI
-from .const import DOMAIN
+from .const import (
+    CONF_COALESCE_WINDOW_MS,
+    CONF_HOUSEHOLD_CALENDAR,
+    DATA_FLOW_SESSIONS,
+    DEFAULT_COALESCE_WINDOW_MS,
+    DEFAULT_HOUSEHOLD_CALENDAR,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +38,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -57,6 +73,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     await self.async_set_unique_id(api.user_uid)
                     self._abort_if_unique_id_configured()
 
+                    # Let setup reuse this session instead of signing in again
+                    self.hass.data.setdefault(DATA_FLOW_SESSIONS, {})[api.user_uid] = {
+                        "api": api,
+                        "children": children,
+                    }
+
                     return self.async_create_entry(
                         title=f"Huckleberry ({user_input[CONF_EMAIL]})",
                         data=user_input,
@@ -77,3 +99,31 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Huckleberry options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_COALESCE_WINDOW_MS,
+                        default=options.get(CONF_COALESCE_WINDOW_MS, DEFAULT_COALESCE_WINDOW_MS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                    vol.Optional(
+                        CONF_HOUSEHOLD_CALENDAR,
+                        default=options.get(CONF_HOUSEHOLD_CALENDAR, DEFAULT_HOUSEHOLD_CALENDAR),
+                    ): bool,
+                }
+            ),
+        )
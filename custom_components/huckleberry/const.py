@@ -2,3 +2,13 @@
 from typing import Final
 
 DOMAIN: Final = "huckleberry"
+
+# Authenticated sessions handed from the config flow to setup, keyed by unique_id
+DATA_FLOW_SESSIONS: Final = f"{DOMAIN}_flow_sessions"
+
+# Options
+CONF_COALESCE_WINDOW_MS: Final = "coalesce_window_ms"
+CONF_HOUSEHOLD_CALENDAR: Final = "household_calendar"
+
+DEFAULT_COALESCE_WINDOW_MS: Final = 100
+DEFAULT_HOUSEHOLD_CALENDAR: Final = False
@@ -0,0 +1,35 @@
+"""Diagnostics support for Huckleberry."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from . import HuckleberryEntryData
+from .const import DOMAIN
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data: HuckleberryEntryData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data["coordinator"]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "children": len(data["children"]),
+        "realtime": {
+            "listener_setup_seconds": coordinator.listener_setup_seconds,
+            "failed_listeners": coordinator.failed_listeners,
+            "suppressed_updates": coordinator.suppressed_updates,
+            "suppressed_updates_by_stream": coordinator.suppressed_updates_by_stream,
+            "streams": coordinator.stream_health,
+        },
+        "executor": coordinator.executor.stats,
+    }
@@ -3,14 +3,19 @@ from __future__ import annotations
 
 from typing import Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .models import ChildState
 
 
 class HuckleberryBaseEntity(CoordinatorEntity):
     """Base entity for Huckleberry."""
 
+    # ChildRealtimeData keys this entity reads; realtime updates of other keys skip it
+    _data_keys: tuple[str, ...] = ()
+
     def __init__(self, coordinator, child: dict[str, Any]) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
@@ -19,23 +24,53 @@ class HuckleberryBaseEntity(CoordinatorEntity):
         self.child_name = child["name"]
         self._attr_has_entity_name = True
 
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information."""
         device_info = {
             "identifiers": {(DOMAIN, self.child_uid)},
             "name": self.child_name,
             "manufacturer": "Huckleberry",
         }
         # Add profile picture as configuration_url if available
-        if self._child.get("picture"):
-            device_info["configuration_url"] = self._child["picture"]
-        return device_info
+        if child.get("picture"):
+            device_info["configuration_url"] = child["picture"]
+        self._attr_device_info = device_info
 
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return (
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to realtime updates of the keys this entity depends on."""
+        await super().async_added_to_hass()
+        if self._data_keys:
+            self.async_on_remove(
+                self.coordinator.async_add_topic_listener(
+                    self._handle_coordinator_update, self.child_uid, self._data_keys
+                )
+            )
+        self._async_update_available()
+        self._async_update_attrs()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute the cached attributes, then write the state."""
+        self._async_update_available()
+        self._async_update_attrs()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_update_available(self) -> None:
+        """Update the cached availability."""
+        self._attr_available = (
             self.coordinator.last_update_success
             and self.child_uid in self.coordinator.data
         )
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the cached _attr_* values from the parsed child state."""
+
+    @property
+    def child_state(self) -> ChildState | None:
+        """Return the parsed realtime state of this entity's child."""
+        return self.coordinator.child_states.get(self.child_uid)
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return self._attr_available
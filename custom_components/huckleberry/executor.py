@@ -0,0 +1,118 @@
+"""Dedicated thread pools for blocking Huckleberry API calls."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+_T = TypeVar("_T")
+
+# User-triggered commands: services, switches and session refreshes
+LANE_INTERACTIVE = "interactive"
+# Listener setup, calendar and history fetches
+LANE_BACKGROUND = "background"
+# History database, one thread so queries run in submission order
+LANE_DATABASE = "database"
+
+LANE_WORKERS = {
+    LANE_INTERACTIVE: 2,
+    LANE_BACKGROUND: 4,
+    LANE_DATABASE: 1,
+}
+
+
+@dataclass(slots=True)
+class LaneStats:
+    """Queue and wait-time counters of one executor lane."""
+
+    workers: int
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters in a diagnostics friendly form."""
+        with self.lock:
+            started = self.completed + self.running
+            return {
+                "workers": self.workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "wait_avg_ms": round(self.wait_total / started * 1000, 1) if started else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 1),
+            }
+
+
+class HuckleberryExecutor:
+    """Size-limited thread pools, one per lane, owned by a config entry.
+
+    Keeps slow cloud calls from tying up Home Assistant's shared executor,
+    and keeps background fetches from queueing in front of user commands.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """Initialize the lanes."""
+        self.hass = hass
+        self._pools = {
+            lane: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}_{lane}")
+            for lane, workers in LANE_WORKERS.items()
+        }
+        self._stats = {lane: LaneStats(workers) for lane, workers in LANE_WORKERS.items()}
+
+    @callback
+    def async_submit(
+        self, lane: str, target: Callable[..., _T], *args: Any
+    ) -> asyncio.Future[_T]:
+        """Queue a blocking call in the given lane right away."""
+        stats = self._stats[lane]
+        with stats.lock:
+            stats.queued += 1
+        return asyncio.wrap_future(
+            self._pools[lane].submit(self._run, stats, time.monotonic(), target, args)
+        )
+
+    async def async_run(
+        self, lane: str, target: Callable[..., _T], *args: Any
+    ) -> _T:
+        """Run a blocking call in the given lane."""
+        return await self.async_submit(lane, target, *args)
+
+    @staticmethod
+    def _run(stats: LaneStats, queued_at: float, target: Callable[..., _T], args: tuple) -> _T:
+        """Run the call in a worker thread and account for its queue time."""
+        wait = time.monotonic() - queued_at
+        with stats.lock:
+            stats.queued -= 1
+            stats.running += 1
+            stats.wait_total += wait
+            stats.wait_max = max(stats.wait_max, wait)
+        try:
+            return target(*args)
+        finally:
+            with stats.lock:
+                stats.running -= 1
+                stats.completed += 1
+
+    @property
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return queue depth and wait times per lane."""
+        return {lane: stats.as_dict() for lane, stats in self._stats.items()}
+
+    def shutdown(self) -> None:
+        """Drop queued calls and wait for running calls to finish."""
+        for pool in self._pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    async def async_shutdown(self) -> None:
+        """Shut the lanes down without blocking the event loop."""
+        await self.hass.async_add_executor_job(self.shutdown)
@@ -0,0 +1,221 @@
+"""HTTP export of a child's history as iCalendar or JSON Lines."""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime, timedelta
+from functools import partial
+from http import HTTPStatus
+import json
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .history_store import HistoryStore, event_uid
+from .intervals import Row, describe
+
+if TYPE_CHECKING:
+    from .calendar import HuckleberryCalendar
+
+# Each window is synced from the cloud, then streamed from the history store
+EXPORT_WINDOW = timedelta(days=28)
+
+DATA_EXPORT_VIEW = f"{DOMAIN}_export_view"
+
+ICS_HEADER = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Huckleberry//Home Assistant//EN\r\n"
+ICS_FOOTER = "END:VCALENDAR\r\n"
+
+
+class HistoryUnavailable(Exception):
+    """A window of history could not be synced from the cloud."""
+
+
+def _ics_text(value: str) -> str:
+    """Escape an iCalendar TEXT value."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_line(line: str) -> str:
+    """Fold a content line to 75 octets, as RFC 5545 requires."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return f"{line}\r\n"
+    parts: list[str] = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split a UTF-8 sequence
+        while cut < len(encoded) and encoded[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+        # Continuation lines start with a space
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_time(timestamp: float) -> str:
+    """Format a timestamp as an iCalendar UTC date-time."""
+    return dt_util.utc_from_timestamp(timestamp).strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_ics(row: Row, stamp: str) -> str:
+    """Format a stored interval as a VEVENT."""
+    category, start, end = row["category"], row["start"], row["end"]
+    summary, description = describe(row)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event_uid(row['child_uid'], category, row['entry_id'])}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{_ics_time(start)}",
+    ]
+    # Instant entries like diaper changes have no DTEND
+    if end > start:
+        lines.append(f"DTEND:{_ics_time(end)}")
+    lines.append(f"SUMMARY:{_ics_text(summary)}")
+    if description:
+        lines.append(f"DESCRIPTION:{_ics_text(description)}")
+    lines += [f"CATEGORIES:{category.upper()}", "END:VEVENT"]
+    return "".join(_ics_line(line) for line in lines)
+
+
+def format_jsonl(row: Row) -> str:
+    """Format a stored interval as a JSON line."""
+    summary, description = describe(row)
+    return json.dumps(
+        {
+            "uid": event_uid(row["child_uid"], row["category"], row["entry_id"]),
+            "category": row["category"],
+            "start": dt_util.utc_from_timestamp(row["start"]).isoformat(),
+            "end": dt_util.utc_from_timestamp(row["end"]).isoformat(),
+            "summary": summary,
+            "description": description,
+        }
+    ) + "\n"
+
+
+async def async_sync_window(calendar: HuckleberryCalendar, start: datetime, end: datetime) -> None:
+    """Sync a window of a child's history, raising HistoryUnavailable if part of it failed."""
+    await calendar.async_sync(start, end)
+    # History is only synced up to now
+    if not calendar.is_synced(start, min(end, dt_util.utcnow())):
+        raise HistoryUnavailable(f"Could not sync the history from {start} to {end}")
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    """Parse an ISO date or date-time query parameter."""
+    if not value:
+        return None
+    if (parsed := dt_util.parse_datetime(value)) is None:
+        if (date := dt_util.parse_date(value)) is None:
+            raise ValueError(value)
+        parsed = dt_util.start_of_local_day(date)
+    return dt_util.as_utc(parsed)
+
+
+@callback
+def async_register_export_view(hass: HomeAssistant) -> None:
+    """Register the export view once for all entries."""
+    if hass.data.get(DATA_EXPORT_VIEW):
+        return
+    hass.data[DATA_EXPORT_VIEW] = True
+    hass.http.register_view(HuckleberryHistoryExportView())
+
+
+class HuckleberryHistoryExportView(HomeAssistantView):
+    """Stream a child's history, syncing it window by window.
+
+    GET /api/huckleberry/history/{child_uid}.ics or .jsonl, optionally with
+    start and end (ISO dates or date-times). start defaults to the child's
+    birthday and end to now.
+    """
+
+    url = "/api/huckleberry/history/{child_uid}.{fmt}"
+    name = "api:huckleberry:history"
+
+    async def get(self, request: web.Request, child_uid: str, fmt: str) -> web.StreamResponse:
+        """Stream the history of a child."""
+        hass: HomeAssistant = request.app["hass"]
+        if fmt not in ("ics", "jsonl"):
+            return self.json_message("Format must be ics or jsonl", HTTPStatus.NOT_FOUND)
+
+        entry_data = next(
+            (
+                entry_data
+                for entry_data in hass.data.get(DOMAIN, {}).values()
+                if child_uid in entry_data.get("calendars", {})
+            ),
+            None,
+        )
+        if entry_data is None:
+            return self.json_message("Unknown child", HTTPStatus.NOT_FOUND)
+        calendar = entry_data["calendars"][child_uid]
+        history = entry_data["coordinator"].history
+        child = next(child for child in entry_data["children"] if child["uid"] == child_uid)
+
+        try:
+            start = _parse_time(request.query.get("start")) or _parse_time(child.get("birthday"))
+            end = _parse_time(request.query.get("end")) or dt_util.utcnow()
+        except ValueError:
+            return self.json_message("Invalid start or end", HTTPStatus.BAD_REQUEST)
+        if start is None:
+            return self.json_message("start is required", HTTPStatus.BAD_REQUEST)
+
+        if fmt == "ics":
+            stamp = _ics_time(dt_util.utcnow().timestamp())
+            content_type = "text/calendar"
+            formatter: Callable[[Row], str] = partial(format_ics, stamp=stamp)
+        else:
+            content_type = "application/x-ndjson"
+            formatter = format_jsonl
+
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": f"{content_type}; charset=utf-8",
+                "Content-Disposition": f'attachment; filename="huckleberry_{child_uid}.{fmt}"',
+            }
+        )
+        response.enable_chunked_encoding()
+        pages = self._async_rows(calendar, history, start, end)
+        try:
+            # Synced before answering, so an unreachable cloud is reported with a status
+            first_page = await anext(pages, [])
+        except HistoryUnavailable as err:
+            return self.json_message(str(err), HTTPStatus.SERVICE_UNAVAILABLE)
+        await response.prepare(request)
+
+        if fmt == "ics":
+            await response.write(ICS_HEADER.encode())
+        await response.write("".join(formatter(row) for row in first_page).encode())
+        # A later window that can't be synced raises, aborting the download
+        # instead of ending it like a complete file
+        async for rows in pages:
+            await response.write("".join(formatter(row) for row in rows).encode())
+        if fmt == "ics":
+            await response.write(ICS_FOOTER.encode())
+        await response.write_eof()
+        return response
+
+    @staticmethod
+    async def _async_rows(
+        calendar: HuckleberryCalendar, history: HistoryStore, start: datetime, end: datetime
+    ) -> AsyncIterator[list[Row]]:
+        """Sync the range one window at a time and yield its stored rows in pages."""
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + EXPORT_WINDOW, end)
+            await async_sync_window(calendar, window_start, window_end)
+            async for rows in history.async_iter_intervals(
+                calendar.child_uid, int(window_start.timestamp()), int(window_end.timestamp())
+            ):
+                yield rows
+            window_start = window_end
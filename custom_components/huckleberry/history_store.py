@@ -0,0 +1,460 @@
+"""On-disk store of synced Huckleberry history.
+
+Intervals fetched from the cloud are normalized into typed columns of a
+SQLite database per config entry, so range queries over months of history
+are answered locally and keep working while Huckleberry is unreachable. The
+cloud is only used to fill the ranges that have not been synced yet.
+Calendar text is rendered from the columns when events are read.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
+import logging
+import sqlite3
+import time
+from typing import Any
+
+from homeassistant.components.calendar import CalendarEvent
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .executor import LANE_DATABASE, HuckleberryExecutor
+from .intervals import FIELDS, Row, describe
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS intervals (
+        child_uid TEXT NOT NULL,
+        category TEXT NOT NULL,
+        entry_id TEXT NOT NULL,
+        start_ts REAL NOT NULL,
+        end_ts REAL NOT NULL,
+        duration INTEGER,
+        left_duration INTEGER,
+        right_duration INTEGER,
+        mode TEXT,
+        poo_color TEXT,
+        poo_consistency TEXT,
+        amount TEXT,
+        weight REAL,
+        height REAL,
+        head REAL,
+        updated_ts REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS intervals_child_start ON intervals (child_uid, start_ts)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS intervals_entry ON intervals (child_uid, category, entry_id)",
+    "CREATE INDEX IF NOT EXISTS intervals_child_updated ON intervals (child_uid, updated_ts)",
+    """
+    CREATE TABLE IF NOT EXISTS removed (
+        child_uid TEXT NOT NULL,
+        category TEXT NOT NULL,
+        entry_id TEXT NOT NULL,
+        removed_ts REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS removed_child_removed ON removed (child_uid, removed_ts)",
+    """
+    CREATE TABLE IF NOT EXISTS coverage (
+        child_uid TEXT NOT NULL,
+        category TEXT NOT NULL,
+        start_ts INTEGER NOT NULL,
+        end_ts INTEGER NOT NULL
+    )
+    """,
+)
+
+# Removals are remembered this long; older "changed since" requests need a full resync
+REMOVED_RETENTION = 30 * 24 * 3600
+
+# Rows read per database call when streaming
+PAGE_SIZE = 500
+
+# Intervals are read as rows keyed like the fetched ones, plus child_uid
+ROW_COLUMNS = ", ".join(
+    ("child_uid", "category", "entry_id", "start_ts AS start", 'end_ts AS "end"', *FIELDS)
+)
+
+# (child_uid, category, entry_id, start_ts, end_ts, *FIELDS)
+IntervalValues = tuple[Any, ...]
+
+
+class IntervalCoverage:
+    """Set of half-open [start, end) second ranges, kept merged and sorted."""
+
+    def __init__(self) -> None:
+        """Initialize an empty coverage."""
+        self._ranges: list[tuple[int, int]] = []
+
+    def add(self, start: int, end: int) -> None:
+        """Mark a range as covered."""
+        if start >= end:
+            return
+        merged: list[tuple[int, int]] = []
+        for range_start, range_end in self._ranges:
+            if range_end < start or range_start > end:
+                merged.append((range_start, range_end))
+            else:
+                start = min(start, range_start)
+                end = max(end, range_end)
+        merged.append((start, end))
+        merged.sort()
+        self._ranges = merged
+
+    def remove(self, start: int, end: int) -> None:
+        """Mark a range as no longer covered."""
+        remaining: list[tuple[int, int]] = []
+        for range_start, range_end in self._ranges:
+            if range_end <= start or range_start >= end:
+                remaining.append((range_start, range_end))
+                continue
+            if range_start < start:
+                remaining.append((range_start, start))
+            if range_end > end:
+                remaining.append((end, range_end))
+        self._ranges = remaining
+
+    def missing(self, start: int, end: int) -> list[tuple[int, int]]:
+        """Return the parts of [start, end) that are not covered."""
+        gaps: list[tuple[int, int]] = []
+        cursor = start
+        for range_start, range_end in self._ranges:
+            if range_end <= cursor:
+                continue
+            if range_start >= end:
+                break
+            if range_start > cursor:
+                gaps.append((cursor, range_start))
+            cursor = max(cursor, range_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    @property
+    def ranges(self) -> list[tuple[int, int]]:
+        """Return the covered ranges."""
+        return list(self._ranges)
+
+    @property
+    def end(self) -> int | None:
+        """Return the end of the latest covered range."""
+        return self._ranges[-1][1] if self._ranges else None
+
+
+def _local_datetime(timestamp: float) -> datetime:
+    """Convert a stored timestamp to an aware datetime in the configured time zone."""
+    return datetime.fromtimestamp(timestamp, tz=dt_util.DEFAULT_TIME_ZONE)
+
+
+def event_uid(child_uid: str, category: str, entry_id: str) -> str:
+    """Return the stable uid of a child's entry, which survives edits of its times."""
+    return f"{child_uid}-{category}-{entry_id}"
+
+
+def _calendar_event(row: Row) -> CalendarEvent:
+    """Build a calendar event from a stored interval."""
+    summary, description = describe(row)
+    return CalendarEvent(
+        start=_local_datetime(row["start"]),
+        end=_local_datetime(row["end"]),
+        summary=summary,
+        description=description,
+        uid=event_uid(row["child_uid"], row["category"], row["entry_id"]),
+    )
+
+
+class HistoryStore:
+    """Synced intervals per child and category, backed by SQLite.
+
+    The synced ranges are mirrored in memory so the calendar can work out
+    what to fetch without a query. Every database call runs in the single
+    thread of the database lane, in the order it was submitted, so a query
+    always sees the writes queued before it.
+    """
+
+    def __init__(self, executor: HuckleberryExecutor, path: str) -> None:
+        """Initialize the store."""
+        self._executor = executor
+        self._path = path
+        # Only used from the database thread
+        self._connection: sqlite3.Connection | None = None
+        self._coverage: dict[tuple[str, str], IntervalCoverage] = {}
+        # Bumped on invalidation, so fetches started before it are not stored
+        self._generations: dict[tuple[str, str], int] = {}
+
+    async def async_open(self) -> None:
+        """Open the database and load the synced ranges."""
+        rows = await self._executor.async_run(LANE_DATABASE, self._open)
+        for child_uid, category, start, end in rows:
+            self.coverage(child_uid, category).add(start, end)
+
+    async def async_close(self) -> None:
+        """Close the database."""
+        await self._executor.async_run(LANE_DATABASE, self._close)
+
+    def coverage(self, child_uid: str, category: str) -> IntervalCoverage:
+        """Return the synced ranges of a child and category."""
+        return self._coverage.setdefault((child_uid, category), IntervalCoverage())
+
+    def generation(self, child_uid: str, category: str) -> int:
+        """Return the invalidation counter of a child and category."""
+        return self._generations.get((child_uid, category), 0)
+
+    def high_water_mark(self, child_uid: str, category: str) -> int | None:
+        """Return the time up to which a category has been synced."""
+        return self.coverage(child_uid, category).end
+
+    async def async_add(
+        self,
+        child_uid: str,
+        category: str,
+        start: int,
+        end: int,
+        rows: Iterable[Row],
+        synced_end: int | None = None,
+    ) -> None:
+        """Replace the stored intervals of [start, end) with the rows starting in it.
+
+        [start, synced_end) is marked synced, all of it unless given.
+        """
+        if start >= end:
+            return
+        if synced_end is None:
+            synced_end = end
+        values: list[IntervalValues] = [
+            (
+                child_uid,
+                category,
+                row["entry_id"],
+                row["start"],
+                row["end"],
+                *(row.get(field) for field in FIELDS),
+            )
+            for row in rows
+            if start <= row["start"] < end
+        ]
+        coverage = self.coverage(child_uid, category)
+        # Later queries are queued behind this write, so they may rely on it already
+        coverage.add(start, synced_end)
+        try:
+            # A cancelled caller must not drop a write the coverage already counts on
+            await asyncio.shield(
+                self._executor.async_submit(
+                    LANE_DATABASE, self._write, child_uid, category, start, end, values, coverage.ranges
+                )
+            )
+        except Exception:
+            coverage.remove(start, synced_end)
+            raise
+
+    @callback
+    def async_invalidate(self, child_uid: str, category: str, start: int, end: int) -> None:
+        """Mark [start, end) as no longer synced so the next request fetches it again."""
+        coverage = self.coverage(child_uid, category)
+        coverage.remove(start, end)
+        self._generations[(child_uid, category)] = self.generation(child_uid, category) + 1
+        self._executor.async_submit(
+            LANE_DATABASE, self._save_coverage, child_uid, category, coverage.ranges
+        ).add_done_callback(self._log_write_error)
+
+    async def async_events_between(
+        self, child_uid: str, start: int, end: int
+    ) -> list[CalendarEvent]:
+        """Return the stored events of a child starting in [start, end), by start time."""
+        rows = await self._executor.async_run(LANE_DATABASE, self._query, child_uid, start, end)
+        return [_calendar_event(row) for row in rows]
+
+    async def async_events_by_child_between(
+        self, child_uids: list[str], start: int, end: int
+    ) -> list[tuple[str, CalendarEvent]]:
+        """Return the stored events of several children in [start, end), by start time."""
+        rows = await self._executor.async_run(
+            LANE_DATABASE, self._query_children, child_uids, start, end
+        )
+        return [(row["child_uid"], _calendar_event(row)) for row in rows]
+
+    async def async_iter_intervals(
+        self, child_uid: str, start: int, end: int
+    ) -> AsyncIterator[list[Row]]:
+        """Yield the stored intervals of a child starting in [start, end) in pages, by start time."""
+        after: tuple[float, int] = (start, 0)
+        while rows := await self._executor.async_run(
+            LANE_DATABASE, self._query_page, child_uid, after, end
+        ):
+            after = (rows[-1]["start"], rows[-1]["rowid"])
+            for row in rows:
+                del row["rowid"]
+            yield rows
+
+    async def async_changes_since(
+        self, child_uid: str, since: float
+    ) -> tuple[list[CalendarEvent], list[str], float]:
+        """Return the events of a child added or changed after since, and the uids removed.
+
+        The returned time is the since of the next request.
+        """
+        changed, removed, now = await self._executor.async_run(
+            LANE_DATABASE, self._query_changes, child_uid, since
+        )
+        return (
+            [_calendar_event(row) for row in changed],
+            [event_uid(*row) for row in removed],
+            now,
+        )
+
+    @staticmethod
+    def _log_write_error(future: asyncio.Future[None]) -> None:
+        """Log a failed write that nobody awaits."""
+        if not future.cancelled() and (err := future.exception()):
+            _LOGGER.error("Error writing Huckleberry history: %s", err)
+
+    def _open(self) -> list[tuple[str, str, int, int]]:
+        """Open the database in the database thread and return the synced ranges."""
+        self._connection = sqlite3.connect(self._path)
+        with self._connection:
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+        return self._connection.execute(
+            "SELECT child_uid, category, start_ts, end_ts FROM coverage"
+        ).fetchall()
+
+    def _close(self) -> None:
+        """Close the database in the database thread."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _write(
+        self,
+        child_uid: str,
+        category: str,
+        start: int,
+        end: int,
+        values: list[IntervalValues],
+        ranges: list[tuple[int, int]],
+    ) -> None:
+        """Replace the intervals of a range and the synced ranges in one transaction.
+
+        Intervals are identified by entry id. Unchanged ones keep their update
+        time, one moved here from another range replaces its old row, and
+        intervals missing from the new rows are remembered as removed.
+        """
+        now = time.time()
+        where = "WHERE child_uid = ? AND start_ts >= ? AND start_ts < ? AND category = ?"
+        params = (child_uid, start, end, category)
+        columns = ", ".join(("start_ts", "end_ts", *FIELDS, "updated_ts"))
+        with self._connection:
+            previous = {
+                row[0]: row[1:]
+                for row in self._connection.execute(
+                    f"SELECT entry_id, {columns} FROM intervals {where}", params
+                )
+            }
+            updated = [
+                (
+                    *row,
+                    old[-1] if (old := previous.get(row[2])) and old[:-1] == row[3:] else now,
+                )
+                for row in values
+            ]
+            entry_ids = [(child_uid, category, row[2]) for row in values]
+            self._connection.execute(f"DELETE FROM intervals {where}", params)
+            # Replaces the row of an entry whose start moved out of another range
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO intervals VALUES ({', '.join('?' * (len(FIELDS) + 6))})",
+                updated,
+            )
+            self._connection.executemany(
+                "DELETE FROM removed WHERE child_uid = ? AND category = ? AND entry_id = ?", entry_ids
+            )
+            kept = {row[2] for row in values}
+            self._connection.executemany(
+                "INSERT INTO removed VALUES (?, ?, ?, ?)",
+                [
+                    (child_uid, category, entry_id, now)
+                    for entry_id in previous
+                    if entry_id not in kept
+                ],
+            )
+            self._connection.execute(
+                "DELETE FROM removed WHERE removed_ts < ?", (now - REMOVED_RETENTION,)
+            )
+            self._replace_coverage(child_uid, category, ranges)
+
+    def _save_coverage(
+        self, child_uid: str, category: str, ranges: list[tuple[int, int]]
+    ) -> None:
+        """Store the synced ranges of a child and category."""
+        with self._connection:
+            self._replace_coverage(child_uid, category, ranges)
+
+    def _replace_coverage(
+        self, child_uid: str, category: str, ranges: list[tuple[int, int]]
+    ) -> None:
+        """Replace the coverage rows of a child and category inside a transaction."""
+        self._connection.execute(
+            "DELETE FROM coverage WHERE child_uid = ? AND category = ?", (child_uid, category)
+        )
+        self._connection.executemany(
+            "INSERT INTO coverage VALUES (?, ?, ?, ?)",
+            [(child_uid, category, start, end) for start, end in ranges],
+        )
+
+    def _select(self, sql: str, params: tuple[Any, ...]) -> list[Row]:
+        """Run a query and return its rows as dicts keyed by column name."""
+        cursor = self._connection.execute(sql, params)
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, values)) for values in cursor]
+
+    def _query(self, child_uid: str, start: int, end: int) -> list[Row]:
+        """Read the intervals of a child starting in [start, end)."""
+        return self._select(
+            f"SELECT {ROW_COLUMNS} FROM intervals"
+            " WHERE child_uid = ? AND start_ts >= ? AND start_ts < ? ORDER BY start_ts",
+            (child_uid, start, end),
+        )
+
+    def _query_page(self, child_uid: str, after: tuple[float, int], end: int) -> list[Row]:
+        """Read the next page of a child's intervals after a (start_ts, rowid) key, with their rowid."""
+        after_start, after_rowid = after
+        return self._select(
+            f"SELECT {ROW_COLUMNS}, rowid"
+            " FROM intervals WHERE child_uid = ? AND (start_ts, rowid) > (?, ?) AND start_ts < ?"
+            " ORDER BY start_ts, rowid LIMIT ?",
+            (child_uid, after_start, after_rowid, end, PAGE_SIZE),
+        )
+
+    def _query_changes(
+        self, child_uid: str, since: float
+    ) -> tuple[list[Row], list[tuple[str, str, str]], float]:
+        """Read the intervals of a child updated or removed after since."""
+        now = time.time()
+        changed = self._select(
+            f"SELECT {ROW_COLUMNS} FROM intervals"
+            " WHERE child_uid = ? AND updated_ts > ? ORDER BY start_ts",
+            (child_uid, since),
+        )
+        removed = self._connection.execute(
+            "SELECT child_uid, category, entry_id FROM removed"
+            " WHERE child_uid = ? AND removed_ts > ? ORDER BY removed_ts",
+            (child_uid, since),
+        ).fetchall()
+        return changed, removed, now
+
+    def _query_children(
+        self, child_uids: list[str], start: int, end: int
+    ) -> list[Row]:
+        """Read the intervals of several children starting in [start, end)."""
+        placeholders = ", ".join("?" * len(child_uids))
+        return self._select(
+            f"SELECT {ROW_COLUMNS} FROM intervals"
+            f" WHERE child_uid IN ({placeholders}) AND start_ts >= ? AND start_ts < ?"
+            " ORDER BY start_ts",
+            (*child_uids, start, end),
+        )
@@ -0,0 +1,289 @@
+"""Bulk import of past entries in batched Firestore writes.
+
+Entries are validated with the same fields as the logging services and
+written to the interval collections the app reads, several hundred per
+commit. Document ids are derived from the import and the entry position,
+so an interrupted import resumes from its checkpoint and rewriting a
+batch that was committed before the checkpoint was saved is harmless.
+
+Imported entries are history only: the last sleep, feed, diaper and
+growth shown by the sensors are not changed.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+import csv
+from datetime import datetime, timedelta
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+import voluptuous as vol
+
+from .const import DOMAIN
+from .executor import LANE_BACKGROUND
+from .intervals import AMOUNT_QUANTITIES
+from .schemas import DIAPER_FIELDS, GROWTH_FIELDS, PEE_FIELDS, POO_FIELDS
+
+if TYPE_CHECKING:
+    from . import HuckleberryDataUpdateCoordinator
+
+# Firestore allows 500 writes per commit
+BATCH_SIZE = 400
+
+IMPORT_CHECKPOINT_VERSION = 1
+
+EVENT_IMPORT_PROGRESS = f"{DOMAIN}_import_progress"
+
+# Metric and imperial units of the growth measurements, as the app stores them
+GROWTH_UNITS = {
+    "metric": {"weight": "kg", "height": "cm", "head": "hcm"},
+    "imperial": {"weight": "lbs", "height": "in", "head": "hin"},
+}
+
+
+def _has_measurement(entry: dict[str, Any]) -> dict[str, Any]:
+    """Require at least one growth measurement."""
+    if not any(entry.get(key) is not None for key in ("weight", "height", "head")):
+        raise vol.Invalid("At least one of weight, height or head is required")
+    return entry
+
+
+def _ends_after_start(entry: dict[str, Any]) -> dict[str, Any]:
+    """Require a sleep to end after it starts."""
+    if entry["end"] <= entry["start"]:
+        raise vol.Invalid("end must be after start")
+    return entry
+
+
+ENTRY_SCHEMA = cv.key_value_schemas(
+    "type",
+    {
+        "sleep": vol.All(
+            vol.Schema({
+                vol.Required("type"): "sleep",
+                vol.Required("start"): cv.datetime,
+                vol.Required("end"): cv.datetime,
+            }),
+            _ends_after_start,
+        ),
+        "feed": vol.Schema({
+            vol.Required("type"): "feed",
+            vol.Required("start"): cv.datetime,
+            # Minutes on each side
+            vol.Optional("left_duration", default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional("right_duration", default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        }),
+        "diaper": vol.Schema({
+            vol.Required("type"): "diaper",
+            vol.Required("start"): cv.datetime,
+            vol.Required("mode"): vol.In(["pee", "poo", "both", "dry"]),
+            **PEE_FIELDS,
+            **POO_FIELDS,
+            **DIAPER_FIELDS,
+        }),
+        "growth": vol.All(
+            vol.Schema({
+                vol.Required("type"): "growth",
+                vol.Required("start"): cv.datetime,
+                **GROWTH_FIELDS,
+            }),
+            _has_measurement,
+        ),
+    },
+)
+
+# Entry type -> (collection, subcollection, history store category)
+DESTINATIONS: dict[str, tuple[str, str, str]] = {
+    "sleep": ("sleep", "intervals", "sleep"),
+    "feed": ("feed", "intervals", "feed"),
+    "diaper": ("diaper", "intervals", "diaper"),
+    "growth": ("health", "data", "health"),
+}
+
+
+def read_entries(path: str) -> list[dict[str, Any]]:
+    """Read raw entries from a JSON list or a CSV file with a header row."""
+    with open(path, encoding="utf-8", newline="") as file:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            # Empty cells are missing values, not empty strings
+            return [
+                {key: value for key, value in row.items() if value not in (None, "")}
+                for row in csv.DictReader(file)
+            ]
+        entries = json.load(file)
+    if not isinstance(entries, list):
+        raise ValueError("The file must contain a list of entries")
+    return entries
+
+
+def import_id(child_uid: str, raw_entries: list[dict[str, Any]]) -> str:
+    """Return the id of an import, the same for the same child and entries."""
+    payload = json.dumps([child_uid, raw_entries], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _offset_minutes(when: datetime) -> float:
+    """Return the timezone offset the app stores, negative east of UTC."""
+    offset = dt_util.as_local(when).utcoffset()
+    return -offset.total_seconds() / 60 if offset else 0.0
+
+
+def _document(entry: dict[str, Any], document_id: str, now: float) -> dict[str, Any]:
+    """Build the Firestore document of a validated entry, as the app writes it."""
+    start = dt_util.as_utc(entry["start"])
+    start_s = start.timestamp()
+    offset = _offset_minutes(start)
+    entry_type = entry["type"]
+
+    if entry_type == "sleep":
+        return {
+            "_id": document_id,
+            "start": int(start_s),
+            "duration": int((dt_util.as_utc(entry["end"]) - start).total_seconds()),
+            "offset": offset,
+            "end_offset": _offset_minutes(entry["end"]),
+            "details": {},
+            "lastUpdated": now,
+        }
+
+    if entry_type == "feed":
+        # Regular feed intervals store the time per side in minutes
+        left = entry["left_duration"]
+        right = entry["right_duration"]
+        return {
+            "mode": "breast",
+            "start": start_s,
+            "lastSide": "right" if right >= left else "left",
+            "lastUpdated": now,
+            "leftDuration": left,
+            "rightDuration": right,
+            "offset": offset,
+            "end_offset": _offset_minutes(start + timedelta(minutes=left + right)),
+        }
+
+    if entry_type == "diaper":
+        document: dict[str, Any] = {
+            "start": start_s,
+            "lastUpdated": now,
+            "mode": entry["mode"],
+            "offset": offset,
+        }
+        quantity = {
+            kind: AMOUNT_QUANTITIES[entry[f"{kind}_amount"]]
+            for kind in ("pee", "poo")
+            if f"{kind}_amount" in entry
+        }
+        if quantity:
+            document["quantity"] = quantity
+        for key in ("color", "consistency", "notes"):
+            if entry.get(key):
+                document[key] = entry[key]
+        if entry.get("diaper_rash"):
+            document["diaperRash"] = True
+        return document
+
+    units = GROWTH_UNITS[entry.get("units", "metric")]
+    document = {
+        "_id": document_id,
+        "type": "health",
+        "mode": "growth",
+        "start": start_s,
+        "lastUpdated": now,
+        "offset": offset,
+        "isNight": False,
+        "multientry_key": None,
+    }
+    for key, unit in units.items():
+        if entry.get(key) is not None:
+            document[key] = float(entry[key])
+            document[f"{key}Units"] = unit
+    return document
+
+
+def _commit(
+    get_client: Callable[[], Any], child_uid: str, writes: list[tuple[str, str, str, dict[str, Any]]]
+) -> None:
+    """Write a batch of documents in one commit."""
+    client = get_client()
+    batch = client.batch()
+    for collection, subcollection, document_id, document in writes:
+        batch.set(
+            client.collection(collection).document(child_uid).collection(subcollection).document(document_id),
+            document,
+        )
+    batch.commit()
+
+
+def import_checkpoint_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store holding the progress of unfinished imports of an entry."""
+    return Store(hass, IMPORT_CHECKPOINT_VERSION, f"{DOMAIN}.{entry.entry_id}.import")
+
+
+async def async_import_history(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: HuckleberryDataUpdateCoordinator,
+    child_uid: str,
+    raw_entries: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Validate and write entries, resuming an earlier run of the same import.
+
+    Raises vol.Invalid naming the first invalid entry before anything is written.
+    """
+    entries = []
+    for index, raw_entry in enumerate(raw_entries):
+        try:
+            entries.append(ENTRY_SCHEMA(raw_entry))
+        except vol.Invalid as err:
+            raise vol.Invalid(f"Entry {index + 1}: {err}") from err
+
+    current_import = import_id(child_uid, raw_entries)
+    store = import_checkpoint_store(hass, entry)
+    checkpoints: dict[str, int] = (await store.async_load() or {}).get("imports", {})
+    resumed = done = checkpoints.get(current_import, 0)
+    total = len(entries)
+
+    while done < total:
+        now = dt_util.utcnow().timestamp()
+        writes = []
+        for index in range(done, min(done + BATCH_SIZE, total)):
+            item = entries[index]
+            collection, subcollection, _ = DESTINATIONS[item["type"]]
+            # Same format as the app, "<start ms>-<20 hex>", but stable across retries
+            suffix = hashlib.sha256(f"{current_import}:{index}".encode()).hexdigest()[:20]
+            document_id = f"{int(dt_util.as_utc(item['start']).timestamp() * 1000)}-{suffix}"
+            writes.append((collection, subcollection, document_id, _document(item, document_id, now)))
+
+        await coordinator.async_api_call(
+            _commit, coordinator.firestore_client, child_uid, writes, lane=LANE_BACKGROUND
+        )
+        done += len(writes)
+        checkpoints[current_import] = done
+        await store.async_save({"imports": checkpoints})
+        hass.bus.async_fire(
+            EVENT_IMPORT_PROGRESS,
+            {"child_uid": child_uid, "import_id": current_import, "imported": done, "total": total},
+        )
+
+    checkpoints.pop(current_import, None)
+    if checkpoints:
+        await store.async_save({"imports": checkpoints})
+    else:
+        await store.async_remove()
+
+    # Let the calendar refetch the imported ranges. Naive starts are local
+    # time, like in the documents, not the time zone of the host.
+    for entry_type, (_, _, category) in DESTINATIONS.items():
+        if starts := [
+            dt_util.as_utc(item["start"]).timestamp() for item in entries if item["type"] == entry_type
+        ]:
+            coordinator.history.async_invalidate(child_uid, category, int(min(starts)), int(max(starts)) + 1)
+
+    return {"import_id": current_import, "imported": total - resumed, "resumed": resumed, "total": total}
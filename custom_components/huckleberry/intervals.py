@@ -0,0 +1,215 @@
+"""Typed rows of a child's history, read from the interval collections.
+
+The interval methods of the API log and swallow Firestore errors, so a
+failed query looks like an empty or partial range. These queries are the
+same, but errors propagate, so only complete results replace stored
+history. Durations of the rows are in seconds, timestamps in UTC.
+
+Every row has an entry_id, the id of its document, followed by the key of
+the entry for documents batching several entries.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from google.cloud import firestore
+
+# Category -> (collection, subcollection) of its entries
+COLLECTIONS: dict[str, tuple[str, str]] = {
+    "sleep": ("sleep", "intervals"),
+    "feed": ("feed", "intervals"),
+    "diaper": ("diaper", "intervals"),
+    "health": ("health", "data"),
+}
+
+# Columns of a row after category, start and end, empty where they don't apply
+FIELDS: tuple[str, ...] = (
+    "duration",
+    "left_duration",
+    "right_duration",
+    "mode",
+    "poo_color",
+    "poo_consistency",
+    "amount",
+    "weight",
+    "height",
+    "head",
+)
+
+Row = dict[str, Any]
+
+DIAPER_EMOJI = {"pee": "💧", "poo": "💩", "both": "💧💩", "dry": "✅"}
+
+# App values of the diaper amounts
+AMOUNT_QUANTITIES = {"little": 0.0, "medium": 50.0, "big": 100.0}
+QUANTITY_AMOUNTS = {quantity: amount for amount, quantity in AMOUNT_QUANTITIES.items()}
+
+
+def _sleep_row(entry: Mapping[str, Any], multi_entry: bool) -> Row:
+    """Build the row of a sleep."""
+    start = entry["start"]
+    duration = round(entry.get("duration", 0))
+    return {"category": "sleep", "start": start, "end": start + duration, "duration": duration}
+
+
+def _feed_row(entry: Mapping[str, Any], multi_entry: bool) -> Row:
+    """Build the row of a feeding."""
+    start = entry["start"]
+    # Multi-entry documents store seconds, regular ones minutes
+    scale = 1 if multi_entry else 60
+    left = round(entry.get("leftDuration", 0) * scale)
+    right = round(entry.get("rightDuration", 0) * scale)
+    return {
+        "category": "feed",
+        "start": start,
+        "end": start + left + right,
+        "duration": left + right,
+        "left_duration": left,
+        "right_duration": right,
+    }
+
+
+def _diaper_row(entry: Mapping[str, Any], multi_entry: bool) -> Row:
+    """Build the row of a diaper change.
+
+    The app writes color, consistency and the quantity per kind, older
+    entries pooColor, pooConsistency and amount.
+    """
+    start = entry["start"]
+    amount = entry.get("amount")
+    if isinstance(quantity := entry.get("quantity"), dict):
+        amount = ", ".join(
+            f"{kind} {QUANTITY_AMOUNTS.get(value, value)}" for kind, value in quantity.items()
+        )
+    return {
+        "category": "diaper",
+        "start": start,
+        "end": start,
+        "duration": 0,
+        "mode": entry.get("mode", "unknown"),
+        "poo_color": entry.get("color", entry.get("pooColor")),
+        "poo_consistency": entry.get("consistency", entry.get("pooConsistency")),
+        "amount": None if amount is None else str(amount),
+    }
+
+
+def _health_row(entry: Mapping[str, Any], multi_entry: bool) -> Row:
+    """Build the row of a growth measurement."""
+    start = entry["start"]
+    row: Row = {"category": "health", "start": start, "end": start, "duration": 0}
+    for key in ("weight", "height", "head"):
+        if entry.get(key) is not None:
+            try:
+                row[key] = float(entry[key])
+            except (TypeError, ValueError):
+                # A measurement that isn't a number is left empty
+                pass
+    return row
+
+
+ROW_BUILDERS: dict[str, Callable[[Mapping[str, Any], bool], Row]] = {
+    "sleep": _sleep_row,
+    "feed": _feed_row,
+    "diaper": _diaper_row,
+    "health": _health_row,
+}
+
+
+def _reference(client: firestore.Client, child_uid: str, category: str) -> Any:
+    """Return the collection holding the entries of a child's category."""
+    collection, subcollection = COLLECTIONS[category]
+    return client.collection(collection).document(child_uid).collection(subcollection)
+
+
+def fetch_rows(client: firestore.Client, child_uid: str, category: str, start: int, end: int) -> list[Row]:
+    """Fetch the rows of the regular documents of a category starting in [start, end)."""
+    build = ROW_BUILDERS[category]
+    return [
+        {**build(data, False), "entry_id": document.id}
+        for document in _reference(client, child_uid, category)
+        .where(filter=firestore.FieldFilter("start", ">=", start))
+        .where(filter=firestore.FieldFilter("start", "<", end))
+        .order_by("start")
+        .stream()
+        if (data := document.to_dict()) and not data.get("multi")
+    ]
+
+
+def fetch_multi_entry_rows(client: firestore.Client, child_uid: str, category: str) -> list[Row]:
+    """Fetch the rows of every entry of a category batched into multi-entry documents.
+
+    Their entries can't be filtered by start in the query, so they are
+    fetched whole, once per sync, and split with rows_between.
+    """
+    build = ROW_BUILDERS[category]
+    rows: list[Row] = []
+    for document in (
+        _reference(client, child_uid, category).where(filter=firestore.FieldFilter("multi", "==", True)).stream()
+    ):
+        data = document.to_dict()
+        if not data or not isinstance(data.get("data"), dict):
+            continue
+        # Document ids never contain a slash, so the entry ids stay unique
+        rows.extend(
+            {**build(entry, True), "entry_id": f"{document.id}/{key}"}
+            for key, entry in data["data"].items()
+            if isinstance(entry, dict) and "start" in entry
+        )
+    return rows
+
+
+def rows_between(rows: Iterable[Row], start: int, end: int) -> list[Row]:
+    """Return the rows starting in [start, end)."""
+    return [row for row in rows if start <= row["start"] < end]
+
+
+def _duration_text(minutes: int) -> str:
+    """Format minutes as hours and minutes."""
+    if minutes < 60:
+        return f"{minutes}m"
+    hours, mins = divmod(minutes, 60)
+    return f"{hours}h {mins}m" if mins > 0 else f"{hours}h"
+
+
+def describe(row: Mapping[str, Any]) -> tuple[str, str]:
+    """Return the calendar summary and description of a row."""
+    category = row["category"]
+
+    if category == "sleep":
+        duration = _duration_text(int((row.get("duration") or 0) / 60))
+        return f"💤 Sleep ({duration})", f"Sleep duration: {duration}"
+
+    if category == "feed":
+        left = round((row.get("left_duration") or 0) / 60)
+        right = round((row.get("right_duration") or 0) / 60)
+        total = left + right
+        sides = []
+        if left > 0:
+            sides.append(f"L:{left}m")
+        if right > 0:
+            sides.append(f"R:{right}m")
+        description = f"Feeding - Total: {total} minutes"
+        if left > 0:
+            description += f"\nLeft: {left} minutes"
+        if right > 0:
+            description += f"\nRight: {right} minutes"
+        return f"🍼 Feed ({' '.join(sides) if sides else f'{total}m'})", description
+
+    if category == "diaper":
+        mode = row.get("mode") or "unknown"
+        description = f"Diaper change: {mode}"
+        if row.get("poo_color") is not None:
+            description += f"\nColor: {row.get('poo_color')}"
+        if row.get("poo_consistency") is not None:
+            description += f"\nConsistency: {row.get('poo_consistency')}"
+        if row.get("amount") is not None:
+            description += f"\nAmount: {row.get('amount')}"
+        return f"{DIAPER_EMOJI.get(mode, '🩲')} Diaper ({mode.capitalize()})", description
+
+    measurements = [
+        f"{label}: {row[key]}"
+        for key, label in (("weight", "Weight"), ("height", "Height"), ("head", "Head"))
+        if row.get(key) is not None
+    ]
+    return "📏 Growth Measurement", "\n".join(["Growth tracking:", *measurements])
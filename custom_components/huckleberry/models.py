@@ -0,0 +1,255 @@
+"""Parsed realtime state of a Huckleberry child.
+
+Firestore documents are parsed once per published update into these
+immutable models, so entities read precomputed fields instead of walking
+the raw documents on every state write.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any
+
+
+def _mapping(value: Any) -> Mapping[str, Any]:
+    """Return value if it is a mapping, else an empty one."""
+    return value if isinstance(value, Mapping) else {}
+
+
+def _utc(timestamp: float | None) -> datetime | None:
+    """Convert a timestamp in seconds to an aware UTC datetime."""
+    return None if timestamp is None else datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _local(timestamp: float | None) -> datetime | None:
+    """Convert a timestamp in seconds to a naive local datetime."""
+    return datetime.fromtimestamp(timestamp) if timestamp else None
+
+
+def _side(value: Any) -> str | None:
+    """Return a feeding side, treating "none" as no side."""
+    return value if value and value != "none" else None
+
+
+@dataclass(frozen=True, slots=True)
+class SleepState:
+    """Parsed sleep document."""
+
+    # False for the legacy computed structure without a realtime timer
+    has_timer: bool = False
+    active: bool = False
+    paused: bool = False
+    timer_start_time_ms: float | None = None
+    timer_end_time_ms: float | None = None
+    # timer.timestamp.seconds, the time of the last timer change
+    timer_timestamp: int | None = None
+    has_last_sleep: bool = False
+    last_sleep_start: float | None = None
+    last_sleep_duration: float | None = None
+    last_sleep_start_at: datetime | None = None
+    last_sleep_end_at: datetime | None = None
+    # Legacy computed structure
+    last_updated: Any = None
+    sleep_start: Any = None
+    sleep_duration: float | None = None
+
+    @property
+    def is_sleeping(self) -> bool:
+        """Return True if a sleep timer is running."""
+        return self.active and not self.paused
+
+
+@dataclass(frozen=True, slots=True)
+class FeedState:
+    """Parsed feed document."""
+
+    has_timer: bool = False
+    active: bool = False
+    paused: bool = False
+    active_side: str | None = None
+    timer_last_side: str | None = None
+    feed_start_time: Any = None
+    left_duration: float = 0
+    right_duration: float = 0
+    timer_timestamp: int | None = None
+    has_last_nursing: bool = False
+    last_nursing_start: float | None = None
+    last_nursing_duration: float | None = None
+    last_nursing_left_duration: float | None = None
+    last_nursing_right_duration: float | None = None
+    last_nursing_timestamp: Any = None
+    last_nursing_start_at: datetime | None = None
+    # prefs.lastSide.lastSide, the side of the last completed feed
+    prefs_last_side: str | None = None
+    # Side shown by the last feeding side sensor, None if unknown
+    current_side: str | None = None
+
+    @property
+    def is_feeding(self) -> bool:
+        """Return True if a feeding timer is running."""
+        return self.active and not self.paused
+
+
+@dataclass(frozen=True, slots=True)
+class DiaperState:
+    """Parsed diaper document."""
+
+    has_last_diaper: bool = False
+    start: float | None = None
+    start_local: datetime | None = None
+    mode: str | None = None
+    offset: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class GrowthState:
+    """Parsed growth document."""
+
+    has_data: bool = False
+    weight: float | None = None
+    weight_units: str = "kg"
+    height: float | None = None
+    height_units: str = "cm"
+    head: float | None = None
+    head_units: str = "hcm"
+    timestamp: float | None = None
+    measured_local: datetime | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ChildState:
+    """Parsed realtime state of one child."""
+
+    sleep: SleepState = SleepState()
+    feed: FeedState = FeedState()
+    diaper: DiaperState = DiaperState()
+    growth: GrowthState = GrowthState()
+
+
+def parse_sleep(document: Any) -> SleepState:
+    """Parse a sleep document."""
+    document = _mapping(document)
+    timer = _mapping(document.get("timer"))
+    prefs = _mapping(document.get("prefs"))
+    last_sleep = _mapping(prefs.get("lastSleep"))
+    start = last_sleep.get("start")
+    duration = last_sleep.get("duration")
+    return SleepState(
+        has_timer="timer" in document,
+        active=bool(timer.get("active")),
+        paused=bool(timer.get("paused")),
+        timer_start_time_ms=timer.get("timerStartTime"),
+        timer_end_time_ms=timer.get("timerEndTime"),
+        timer_timestamp=_mapping(timer.get("timestamp")).get("seconds"),
+        has_last_sleep="lastSleep" in prefs,
+        last_sleep_start=start,
+        last_sleep_duration=duration,
+        last_sleep_start_at=_utc(start),
+        last_sleep_end_at=_utc(start + duration) if start is not None and duration is not None else None,
+        last_updated=document.get("last_updated"),
+        sleep_start=document.get("sleep_start"),
+        sleep_duration=document.get("sleep_duration"),
+    )
+
+
+def parse_feed(document: Any) -> FeedState:
+    """Parse a feed document."""
+    document = _mapping(document)
+    timer = _mapping(document.get("timer"))
+    prefs = _mapping(document.get("prefs"))
+    last_nursing = _mapping(prefs.get("lastNursing"))
+    active = bool(timer.get("active"))
+    active_side = timer.get("activeSide")
+    timer_last_side = timer.get("lastSide")
+    prefs_last_side = _mapping(prefs.get("lastSide")).get("lastSide")
+
+    # A running or paused feed shows its own side, otherwise the last completed one
+    candidates = (active_side, timer_last_side) if active else ()
+    current_side = next(
+        (side for side in (*candidates, prefs_last_side, timer_last_side) if _side(side)),
+        None,
+    )
+
+    start = last_nursing.get("start")
+    return FeedState(
+        has_timer="timer" in document,
+        active=active,
+        paused=bool(timer.get("paused")),
+        active_side=active_side,
+        timer_last_side=timer_last_side,
+        feed_start_time=timer.get("feedStartTime"),
+        left_duration=timer.get("leftDuration", 0),
+        right_duration=timer.get("rightDuration", 0),
+        timer_timestamp=_mapping(timer.get("timestamp")).get("seconds"),
+        has_last_nursing="lastNursing" in prefs,
+        last_nursing_start=start,
+        last_nursing_duration=last_nursing.get("duration"),
+        last_nursing_left_duration=last_nursing.get("leftDuration"),
+        last_nursing_right_duration=last_nursing.get("rightDuration"),
+        last_nursing_timestamp=last_nursing.get("timestamp"),
+        last_nursing_start_at=_utc(start),
+        prefs_last_side=prefs_last_side,
+        current_side=current_side,
+    )
+
+
+def parse_diaper(document: Any) -> DiaperState:
+    """Parse a diaper document."""
+    last_diaper = _mapping(_mapping(_mapping(document).get("prefs")).get("lastDiaper"))
+    if not last_diaper:
+        return DiaperState()
+
+    start = last_diaper.get("start")
+    return DiaperState(
+        has_last_diaper=True,
+        start=start,
+        start_local=_local(start),
+        mode=last_diaper.get("mode"),
+        offset=last_diaper.get("offset"),
+    )
+
+
+def parse_growth(document: Any) -> GrowthState:
+    """Parse the flattened growth data."""
+    document = _mapping(document)
+    if not document:
+        return GrowthState()
+
+    return GrowthState(
+        has_data=True,
+        weight=document.get("weight"),
+        weight_units=document.get("weight_units", "kg"),
+        height=document.get("height"),
+        height_units=document.get("height_units", "cm"),
+        head=document.get("head"),
+        head_units=document.get("head_units", "hcm"),
+        timestamp=document.get("timestamp"),
+        measured_local=_local(document.get("timestamp")),
+    )
+
+
+# ChildRealtimeData key -> (ChildState field, parser)
+DOCUMENT_PARSERS: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "sleep_status": ("sleep", parse_sleep),
+    "feed_status": ("feed", parse_feed),
+    "diaper_data": ("diaper", parse_diaper),
+    "growth_data": ("growth", parse_growth),
+}
+
+EMPTY_CHILD_STATE = ChildState()
+
+
+def update_child_state(state: ChildState, documents: Mapping[str, Any]) -> ChildState:
+    """Return state with the given documents parsed and replaced."""
+    changes = {
+        DOCUMENT_PARSERS[key][0]: DOCUMENT_PARSERS[key][1](document)
+        for key, document in documents.items()
+        if key in DOCUMENT_PARSERS
+    }
+    return replace(state, **changes) if changes else state
+
+
+def parse_child_state(child_data: Mapping[str, Any]) -> ChildState:
+    """Parse every document of a child snapshot."""
+    return update_child_state(EMPTY_CHILD_STATE, child_data)
@@ -0,0 +1,31 @@
+"""Voluptuous fields shared by the logging services and the history import."""
+from __future__ import annotations
+
+from homeassistant.helpers import config_validation as cv
+import voluptuous as vol
+
+AMOUNTS = ["little", "medium", "big"]
+POO_COLORS = ["yellow", "brown", "black", "green", "red", "gray"]
+POO_CONSISTENCIES = ["solid", "loose", "runny", "mucousy", "hard", "pebbles", "diarrhea"]
+
+PEE_FIELDS = {
+    vol.Optional("pee_amount"): vol.In(AMOUNTS),
+}
+
+POO_FIELDS = {
+    vol.Optional("poo_amount"): vol.In(AMOUNTS),
+    vol.Optional("color"): vol.In(POO_COLORS),
+    vol.Optional("consistency"): vol.In(POO_CONSISTENCIES),
+}
+
+DIAPER_FIELDS = {
+    vol.Optional("diaper_rash"): cv.boolean,
+    vol.Optional("notes"): cv.string,
+}
+
+GROWTH_FIELDS = {
+    vol.Optional("weight"): vol.Coerce(float),
+    vol.Optional("height"): vol.Coerce(float),
+    vol.Optional("head"): vol.Coerce(float),
+    vol.Optional("units"): vol.In(["metric", "imperial"]),
+}
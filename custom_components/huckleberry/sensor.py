@@ -6,7 +6,7 @@ from typing import Any
 
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -16,6 +16,19 @@ from .entity import HuckleberryBaseEntity
 _LOGGER = logging.getLogger(__name__)
 
 
+def _duration_attributes(duration: float | None) -> dict[str, Any]:
+    """Return the duration attributes of the previous sleep sensors."""
+    if duration is None:
+        return {}
+
+    hours = int(duration // 3600)
+    minutes = int((duration % 3600) // 60)
+    return {
+        "duration_seconds": duration,
+        "duration": f"{hours}h {minutes}m",
+    }
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -64,16 +77,8 @@ class HuckleberryChildrenSensor(CoordinatorEntity, SensorEntity):
 
         self._attr_name = "Huckleberry Children"
         self._attr_unique_id = "huckleberry_children"
-
-    @property
-    def native_value(self) -> int:
-        """Return the count of children."""
-        return len(self._children)
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return entity specific state attributes."""
-        return {
+        self._attr_native_value = len(children)
+        self._attr_extra_state_attributes = {
             "children": [
                 {
                     "uid": child["uid"],
@@ -88,10 +93,10 @@ class HuckleberryChildrenSensor(CoordinatorEntity, SensorEntity):
                     "expected_naps": child.get("expected_naps"),
                     "categories": child.get("categories"),
                 }
-                for child in self._children
+                for child in children
             ],
-            "child_ids": [child["uid"] for child in self._children],
-            "child_names": [child["name"] for child in self._children],
+            "child_ids": [child["uid"] for child in children],
+            "child_names": [child["name"] for child in children],
         }
 
     @property
@@ -110,20 +115,9 @@ class HuckleberryChildProfileSensor(HuckleberryBaseEntity, SensorEntity):
         super().__init__(coordinator, child)
         self._attr_name = "Profile"
         self._attr_unique_id = f"{self.child_uid}_profile"
+        self._attr_entity_picture = child.get("picture")
+        self._attr_native_value = self.child_name
 
-    @property
-    def entity_picture(self) -> str | None:
-        """Return the entity picture to use in the frontend."""
-        return self._child.get("picture")
-
-    @property
-    def native_value(self) -> str:
-        """Return the child's name as the state."""
-        return self.child_name
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return child profile attributes."""
         attrs = {
             "uid": self.child_uid,
             "name": self.child_name,
@@ -135,16 +129,17 @@ class HuckleberryChildProfileSensor(HuckleberryBaseEntity, SensorEntity):
             "night_start", "morning_cutoff", "expected_naps", "categories"
         ]
         for field in optional_fields:
-            if self._child.get(field) is not None:
-                attrs[field] = self._child[field]
+            if child.get(field) is not None:
+                attrs[field] = child[field]
 
-        return attrs
+        self._attr_extra_state_attributes = attrs
 
 
 class HuckleberryGrowthSensor(HuckleberryBaseEntity, SensorEntity):
     """Sensor showing child growth measurements."""
 
     _attr_icon = "mdi:human-male-height"
+    _data_keys = ("growth_data",)
 
     def __init__(self, coordinator, child: dict[str, Any]) -> None:
         """Initialize the sensor."""
@@ -152,68 +147,47 @@ class HuckleberryGrowthSensor(HuckleberryBaseEntity, SensorEntity):
         self._attr_name = "Growth"
         self._attr_unique_id = f"{self.child_uid}_growth"
 
-    @property
-    def native_value(self) -> str | None:
-        """Return the most recent measurement timestamp."""
-        child_data = self.coordinator.data.get(self.child_uid, {})
-        growth_data = child_data.get("growth_data", {})
-
-        if not growth_data:
-            return "No data"
-
-        timestamp = growth_data.get("timestamp")
-        if timestamp:
-            from datetime import datetime
-            return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
-
-        return "Unknown"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return growth measurement attributes."""
-        child_data = self.coordinator.data.get(self.child_uid, {})
-        growth_data = child_data.get("growth_data", {})
-
-        if not growth_data:
-            return {}
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the measurement timestamp and attributes."""
+        if (state := self.child_state) is None or not state.growth.has_data:
+            self._attr_native_value = "No data"
+            self._attr_extra_state_attributes = {}
+            return
 
+        growth = state.growth
         attrs = {}
 
         # Add measurements if available
-        weight = growth_data.get("weight")
-        height = growth_data.get("height")
-        head = growth_data.get("head")
-
-        if weight is not None:
-            weight_unit = growth_data.get("weight_units", "kg")
-            attrs["weight"] = weight
-            attrs["weight_unit"] = weight_unit
-            attrs["weight_display"] = f"{weight} {weight_unit}"
-
-        if height is not None:
-            height_unit = growth_data.get("height_units", "cm")
-            attrs["height"] = height
-            attrs["height_unit"] = height_unit
-            attrs["height_display"] = f"{height} {height_unit}"
-
-        if head is not None:
-            head_unit = growth_data.get("head_units", "hcm")
-            attrs["head_circumference"] = head
-            attrs["head_unit"] = head_unit
-            attrs["head_display"] = f"{head} {head_unit}"
-
-        timestamp = growth_data.get("timestamp")
-        if timestamp:
-            from datetime import datetime
-            attrs["last_measured"] = datetime.fromtimestamp(timestamp).isoformat()
+        if growth.weight is not None:
+            attrs["weight"] = growth.weight
+            attrs["weight_unit"] = growth.weight_units
+            attrs["weight_display"] = f"{growth.weight} {growth.weight_units}"
+
+        if growth.height is not None:
+            attrs["height"] = growth.height
+            attrs["height_unit"] = growth.height_units
+            attrs["height_display"] = f"{growth.height} {growth.height_units}"
+
+        if growth.head is not None:
+            attrs["head_circumference"] = growth.head
+            attrs["head_unit"] = growth.head_units
+            attrs["head_display"] = f"{growth.head} {growth.head_units}"
+
+        if measured := growth.measured_local:
+            attrs["last_measured"] = measured.isoformat()
+            self._attr_native_value = measured.strftime("%Y-%m-%d %H:%M")
+        else:
+            self._attr_native_value = "Unknown"
 
-        return attrs
+        self._attr_extra_state_attributes = attrs
 
 
 class HuckleberryDiaperSensor(HuckleberryBaseEntity, SensorEntity):
     """Sensor showing last diaper change information."""
 
     _attr_icon = "mdi:baby"
+    _data_keys = ("diaper_data",)
 
     def __init__(self, coordinator, child: dict[str, Any]) -> None:
         """Initialize the sensor."""
@@ -221,58 +195,35 @@ class HuckleberryDiaperSensor(HuckleberryBaseEntity, SensorEntity):
         self._attr_name = "Last Diaper"
         self._attr_unique_id = f"{self.child_uid}_last_diaper"
 
-    @property
-    def native_value(self) -> str | None:
-        """Return the last diaper change timestamp."""
-        child_data = self.coordinator.data.get(self.child_uid, {})
-        diaper_data = child_data.get("diaper_data", {})
-
-        prefs = diaper_data.get("prefs", {})
-        last_diaper = prefs.get("lastDiaper", {})
-
-        if not last_diaper:
-            return "No changes logged"
-
-        timestamp = last_diaper.get("start")
-        if timestamp:
-            from datetime import datetime
-            return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
-
-        return "Unknown"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return diaper change attributes."""
-        child_data = self.coordinator.data.get(self.child_uid, {})
-        diaper_data = child_data.get("diaper_data", {})
-
-        prefs = diaper_data.get("prefs", {})
-        last_diaper = prefs.get("lastDiaper", {})
-
-        if not last_diaper:
-            return {}
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the last diaper change timestamp and attributes."""
+        if (state := self.child_state) is None or not state.diaper.has_last_diaper:
+            self._attr_native_value = "No changes logged"
+            self._attr_extra_state_attributes = {}
+            return
 
+        diaper = state.diaper
         attrs = {}
 
         # Add timestamp
-        timestamp = last_diaper.get("start")
-        if timestamp:
-            from datetime import datetime
-            attrs["timestamp"] = timestamp
-            attrs["time"] = datetime.fromtimestamp(timestamp).isoformat()
+        if start_local := diaper.start_local:
+            attrs["timestamp"] = diaper.start
+            attrs["time"] = start_local.isoformat()
+            self._attr_native_value = start_local.strftime("%Y-%m-%d %H:%M")
+        else:
+            self._attr_native_value = "Unknown"
 
         # Add mode (pee, poo, both, dry)
-        mode = last_diaper.get("mode")
-        if mode:
-            attrs["mode"] = mode
-            attrs["type"] = mode.capitalize()
+        if diaper.mode:
+            attrs["mode"] = diaper.mode
+            attrs["type"] = diaper.mode.capitalize()
 
         # Add offset (timezone)
-        offset = last_diaper.get("offset")
-        if offset is not None:
-            attrs["timezone_offset_minutes"] = offset
+        if diaper.offset is not None:
+            attrs["timezone_offset_minutes"] = diaper.offset
 
-        return attrs
+        self._attr_extra_state_attributes = attrs
 
 
 class HuckleberrySleepSensor(HuckleberryBaseEntity, SensorEntity):
@@ -281,6 +232,7 @@ class HuckleberrySleepSensor(HuckleberryBaseEntity, SensorEntity):
     _attr_icon = "mdi:sleep"
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_options = ["sleeping", "paused", "none"]
+    _data_keys = ("sleep_status",)
 
     def __init__(self, coordinator, child: dict[str, Any]) -> None:
         """Initialize the sensor."""
@@ -288,80 +240,64 @@ class HuckleberrySleepSensor(HuckleberryBaseEntity, SensorEntity):
         self._attr_name = "Sleep status"
         self._attr_unique_id = f"{self.child_uid}_sleep_status"
 
-    @property
-    def native_value(self) -> str:
-        """Return the state of the sensor."""
-        if self.child_uid not in self.coordinator.data:
-            return "none"
-
-        sleep_status = self.coordinator.data[self.child_uid].get("sleep_status", {})
-
-        # Check real-time timer data structure
-        if isinstance(sleep_status, dict) and "timer" in sleep_status:
-            timer = sleep_status.get("timer", {})
-            if timer.get("active"):
-                if timer.get("paused"):
-                    return "paused"
-                return "sleeping"
-
-        return "none"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return entity specific state attributes."""
-        if self.child_uid not in self.coordinator.data:
-            return {}
-
-        sleep_status = self.coordinator.data[self.child_uid].get("sleep_status", {})
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the sleep state and attributes."""
+        if (state := self.child_state) is None:
+            self._attr_native_value = "none"
+            self._attr_extra_state_attributes = {}
+            return
 
+        sleep = state.sleep
         attrs = {}
 
         # Handle real-time data structure
-        if isinstance(sleep_status, dict) and "timer" in sleep_status:
-            timer = sleep_status.get("timer", {})
-            prefs = sleep_status.get("prefs", {})
+        if sleep.has_timer:
+            if not sleep.active:
+                self._attr_native_value = "none"
+            elif sleep.paused:
+                self._attr_native_value = "paused"
+            else:
+                self._attr_native_value = "sleeping"
 
             # Track paused state
-            if timer.get("active"):
-                attrs["is_paused"] = timer.get("paused", False)
+            if sleep.active:
+                attrs["is_paused"] = sleep.paused
 
                 # timerStartTime is in milliseconds for sleep tracking
-                if "timerStartTime" in timer:
-                    attrs["timer_start_time_ms"] = timer.get("timerStartTime")
+                if sleep.timer_start_time_ms is not None:
+                    attrs["timer_start_time_ms"] = sleep.timer_start_time_ms
                     # Convert to seconds for chronometer (Home Assistant expects Unix timestamp)
-                    attrs["timer_start_time"] = int(timer.get("timerStartTime") / 1000)
+                    attrs["timer_start_time"] = int(sleep.timer_start_time_ms / 1000)
 
-            if timer.get("active") and not timer.get("paused"):
+            if sleep.is_sleeping and sleep.timer_timestamp is not None:
                 # Currently sleeping
-                if "timestamp" in timer:
-                    attrs["sleep_start"] = timer["timestamp"].get("seconds")
+                attrs["sleep_start"] = sleep.timer_timestamp
 
-            if timer.get("paused"):
+            if sleep.paused and sleep.timer_end_time_ms is not None:
                 # Sleep is currently paused
-                if "timerEndTime" in timer:
-                    attrs["timer_end_time_ms"] = timer.get("timerEndTime")
-                    attrs["timer_end_time"] = int(timer.get("timerEndTime") / 1000)
+                attrs["timer_end_time_ms"] = sleep.timer_end_time_ms
+                attrs["timer_end_time"] = int(sleep.timer_end_time_ms / 1000)
 
             # Last sleep info
-            if "lastSleep" in prefs:
-                last_sleep = prefs["lastSleep"]
-                attrs["last_sleep_duration_seconds"] = last_sleep.get("duration")
-                attrs["last_sleep_start"] = last_sleep.get("start")
+            if sleep.has_last_sleep:
+                attrs["last_sleep_duration_seconds"] = sleep.last_sleep_duration
+                attrs["last_sleep_start"] = sleep.last_sleep_start
         else:
             # Fallback to legacy computed structure
-            attrs["last_updated"] = sleep_status.get("last_updated")
+            self._attr_native_value = "none"
+            attrs["last_updated"] = sleep.last_updated
 
-            duration = sleep_status.get("sleep_duration")
-            start = sleep_status.get("sleep_start")
-            if start:
-                attrs["sleep_start"] = start
+            duration = sleep.sleep_duration
+            if sleep.sleep_start:
+                attrs["sleep_start"] = sleep.sleep_start
             if duration is not None:
                 attrs["sleep_duration_seconds"] = duration
                 hours = int(duration // 3600)
                 minutes = int((duration % 3600) // 60)
                 attrs["sleep_duration"] = f"{hours}h {minutes}m"
 
-        return attrs
+        self._attr_extra_state_attributes = attrs
 
 
 class HuckleberryFeedingSensor(HuckleberryBaseEntity, SensorEntity):
@@ -370,6 +306,7 @@ class HuckleberryFeedingSensor(HuckleberryBaseEntity, SensorEntity):
     _attr_icon = "mdi:baby-bottle"
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_options = ["feeding", "paused", "none"]
+    _data_keys = ("feed_status",)
 
     def __init__(self, coordinator, child: dict[str, Any]) -> None:
         """Initialize the sensor."""
@@ -377,61 +314,39 @@ class HuckleberryFeedingSensor(HuckleberryBaseEntity, SensorEntity):
         self._attr_name = "Feeding status"
         self._attr_unique_id = f"{self.child_uid}_feeding_status"
 
-    @property
-    def native_value(self) -> str:
-        """Return the state of the sensor."""
-        if self.child_uid not in self.coordinator.data:
-            return "none"
-
-        feed_status = self.coordinator.data[self.child_uid].get("feed_status", {})
-
-        # Check real-time timer data structure
-        if isinstance(feed_status, dict) and "timer" in feed_status:
-            timer = feed_status.get("timer", {})
-            if timer.get("active"):
-                if timer.get("paused"):
-                    return "paused"
-                return "feeding"
-
-        return "none"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return entity specific state attributes."""
-        if self.child_uid not in self.coordinator.data:
-            return {}
-
-        feed_status = self.coordinator.data[self.child_uid].get("feed_status", {})
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the feeding state and attributes."""
+        self._attr_native_value = "none"
+        if (state := self.child_state) is None:
+            self._attr_extra_state_attributes = {}
+            return
 
+        feed = state.feed
         attrs = {}
 
         # Handle real-time data structure
-        if isinstance(feed_status, dict) and "timer" in feed_status:
-            timer = feed_status.get("timer", {})
-            prefs = feed_status.get("prefs", {})
-
-            # Track paused state
-            if timer.get("active"):
-                attrs["is_paused"] = timer.get("paused", False)
+        if feed.has_timer:
+            if feed.active:
+                self._attr_native_value = "paused" if feed.paused else "feeding"
 
-            if timer.get("active"):
                 # Currently feeding (active or paused)
+                attrs["is_paused"] = feed.paused
                 # Use feedStartTime (absolute start) not timestamp (last update)
-                if "feedStartTime" in timer:
-                    attrs["feeding_start"] = timer["feedStartTime"]
-                attrs["left_duration_seconds"] = timer.get("leftDuration", 0)
-                attrs["right_duration_seconds"] = timer.get("rightDuration", 0)
-                attrs["last_side"] = timer.get("lastSide", "unknown")
+                if feed.feed_start_time is not None:
+                    attrs["feeding_start"] = feed.feed_start_time
+                attrs["left_duration_seconds"] = feed.left_duration
+                attrs["right_duration_seconds"] = feed.right_duration
+                attrs["last_side"] = feed.timer_last_side or "unknown"
 
             # Last feeding info
-            if "lastNursing" in prefs:
-                last_nursing = prefs["lastNursing"]
-                attrs["last_nursing_start"] = last_nursing.get("start")
-                attrs["last_nursing_duration_seconds"] = last_nursing.get("duration")
-                attrs["last_nursing_left_seconds"] = last_nursing.get("leftDuration", 0)
-                attrs["last_nursing_right_seconds"] = last_nursing.get("rightDuration", 0)
+            if feed.has_last_nursing:
+                attrs["last_nursing_start"] = feed.last_nursing_start
+                attrs["last_nursing_duration_seconds"] = feed.last_nursing_duration
+                attrs["last_nursing_left_seconds"] = feed.last_nursing_left_duration or 0
+                attrs["last_nursing_right_seconds"] = feed.last_nursing_right_duration or 0
 
-        return attrs
+        self._attr_extra_state_attributes = attrs
 
 
 class HuckleberryLastFeedingSideSensor(HuckleberryBaseEntity, SensorEntity):
@@ -440,6 +355,7 @@ class HuckleberryLastFeedingSideSensor(HuckleberryBaseEntity, SensorEntity):
     _attr_icon = "mdi:baby-bottle-outline"
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_options = ["Left", "Right", "Unknown"]
+    _data_keys = ("feed_status",)
 
     def __init__(self, coordinator, child: dict[str, Any]) -> None:
         """Initialize the sensor."""
@@ -447,52 +363,21 @@ class HuckleberryLastFeedingSideSensor(HuckleberryBaseEntity, SensorEntity):
         self._attr_name = "Last Feeding Side"
         self._attr_unique_id = f"{self.child_uid}_last_feeding_side"
 
-    @property
-    def native_value(self) -> str:
-        """Return the last feeding side."""
-        if self.child_uid not in self.coordinator.data:
-            return "Unknown"
-
-        feed_status = self.coordinator.data[self.child_uid].get("feed_status", {})
-        if not isinstance(feed_status, dict):
-            return "Unknown"
-
-        timer = feed_status.get("timer", {})
-        prefs = feed_status.get("prefs", {})
-
-        # If currently feeding (active)
-        if timer.get("active"):
-            # If activeSide is present (feeding), use it
-            active_side = timer.get("activeSide")
-            if active_side and active_side != "none":
-                return active_side.title()
-
-            # If paused, activeSide is removed, use lastSide from timer
-            # Note: pause_feeding sets timer.lastSide = current_side
-            last_side = timer.get("lastSide")
-            if last_side and last_side != "none":
-                return last_side.title()
-
-        # If not active, or fallback
-        # Check prefs.lastSide (history)
-        last_side_pref = prefs.get("lastSide", {})
-        if last_side_pref and "lastSide" in last_side_pref:
-            side = last_side_pref["lastSide"]
-            if side and side != "none":
-                return side.title()
-
-        # Fallback to timer.lastSide if prefs missing
-        last_side = timer.get("lastSide")
-        if last_side and last_side != "none":
-            return last_side.title()
-
-        return "Unknown"
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the last feeding side."""
+        if (state := self.child_state) is None or not state.feed.current_side:
+            self._attr_native_value = "Unknown"
+        else:
+            self._attr_native_value = state.feed.current_side.title()
+
 
 class HuckleberryPreviousSleepStartSensor(HuckleberryBaseEntity, SensorEntity):
     """Sensor showing the start time of the previous sleep session."""
 
     _attr_icon = "mdi:sleep"
     _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _data_keys = ("sleep_status",)
 
     def __init__(self, coordinator, child: dict[str, Any]) -> None:
         """Initialize the sensor."""
@@ -500,55 +385,23 @@ class HuckleberryPreviousSleepStartSensor(HuckleberryBaseEntity, SensorEntity):
         self._attr_name = "Previous Sleep Start"
         self._attr_unique_id = f"{self.child_uid}_previous_sleep_start"
 
-    @property
-    def native_value(self):
-        """Return the start time of the last sleep."""
-        if self.child_uid not in self.coordinator.data:
-            return None
-
-        sleep_status = self.coordinator.data[self.child_uid].get("sleep_status", {})
-        if not isinstance(sleep_status, dict):
-            return None
-
-        prefs = sleep_status.get("prefs", {})
-        last_sleep = prefs.get("lastSleep", {})
-
-        start = last_sleep.get("start")
-
-        if start is not None:
-            from datetime import datetime, timezone
-            return datetime.fromtimestamp(start, tz=timezone.utc)
-
-        return None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return entity specific state attributes."""
-        if self.child_uid not in self.coordinator.data:
-            return {}
-
-        sleep_status = self.coordinator.data[self.child_uid].get("sleep_status", {})
-        if not isinstance(sleep_status, dict):
-            return {}
-
-        prefs = sleep_status.get("prefs", {})
-        last_sleep = prefs.get("lastSleep", {})
-
-        attrs = {}
-        duration = last_sleep.get("duration")
-        if duration is not None:
-            attrs["duration_seconds"] = duration
-            hours = int(duration // 3600)
-            minutes = int((duration % 3600) // 60)
-            attrs["duration"] = f"{hours}h {minutes}m"
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the start time of the last sleep."""
+        if (state := self.child_state) is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+        else:
+            self._attr_native_value = state.sleep.last_sleep_start_at
+            self._attr_extra_state_attributes = _duration_attributes(state.sleep.last_sleep_duration)
 
-        return attrs
 
 class HuckleberryPreviousSleepEndSensor(HuckleberryBaseEntity, SensorEntity):
     """Sensor showing the end time of the previous sleep session."""
 
     _attr_icon = "mdi:sleep-off"
     _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _data_keys = ("sleep_status",)
 
     def __init__(self, coordinator, child: dict[str, Any]) -> None:
         """Initialize the sensor."""
@@ -556,52 +409,15 @@ class HuckleberryPreviousSleepEndSensor(HuckleberryBaseEntity, SensorEntity):
         self._attr_name = "Previous Sleep End"
         self._attr_unique_id = f"{self.child_uid}_previous_sleep_end"
 
-    @property
-    def native_value(self):
-        """Return the end time of the last sleep."""
-        if self.child_uid not in self.coordinator.data:
-            return None
-
-        sleep_status = self.coordinator.data[self.child_uid].get("sleep_status", {})
-        if not isinstance(sleep_status, dict):
-            return None
-
-        prefs = sleep_status.get("prefs", {})
-        last_sleep = prefs.get("lastSleep", {})
-
-        start = last_sleep.get("start")
-        duration = last_sleep.get("duration")
-
-        if start is not None and duration is not None:
-            from datetime import datetime, timezone
-            # Timestamps are in seconds
-            end_timestamp = start + duration
-            return datetime.fromtimestamp(end_timestamp, tz=timezone.utc)
-
-        return None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return entity specific state attributes."""
-        if self.child_uid not in self.coordinator.data:
-            return {}
-
-        sleep_status = self.coordinator.data[self.child_uid].get("sleep_status", {})
-        if not isinstance(sleep_status, dict):
-            return {}
-
-        prefs = sleep_status.get("prefs", {})
-        last_sleep = prefs.get("lastSleep", {})
-
-        attrs = {}
-        duration = last_sleep.get("duration")
-        if duration is not None:
-            attrs["duration_seconds"] = duration
-            hours = int(duration // 3600)
-            minutes = int((duration % 3600) // 60)
-            attrs["duration"] = f"{hours}h {minutes}m"
-
-        return attrs
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the end time of the last sleep."""
+        if (state := self.child_state) is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+        else:
+            self._attr_native_value = state.sleep.last_sleep_end_at
+            self._attr_extra_state_attributes = _duration_attributes(state.sleep.last_sleep_duration)
 
 
 class HuckleberryPreviousFeedSensor(HuckleberryBaseEntity, SensorEntity):
@@ -609,6 +425,7 @@ class HuckleberryPreviousFeedSensor(HuckleberryBaseEntity, SensorEntity):
 
     _attr_icon = "mdi:baby-bottle-outline"
     _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _data_keys = ("feed_status",)
 
     def __init__(self, coordinator, child: dict[str, Any]) -> None:
         """Initialize the sensor."""
@@ -616,59 +433,28 @@ class HuckleberryPreviousFeedSensor(HuckleberryBaseEntity, SensorEntity):
         self._attr_name = "Previous Feed Start"
         self._attr_unique_id = f"{self.child_uid}_previous_feed_start"
 
-    @property
-    def native_value(self):
-        """Return the start time of the last feeding."""
-        if self.child_uid not in self.coordinator.data:
-            return None
-
-        feed_status = self.coordinator.data[self.child_uid].get("feed_status", {})
-        if not isinstance(feed_status, dict):
-            return None
-
-        prefs = feed_status.get("prefs", {})
-        last_nursing = prefs.get("lastNursing", {})
-
-        start = last_nursing.get("start")
-
-        if start is not None:
-            from datetime import datetime, timezone
-            return datetime.fromtimestamp(start, tz=timezone.utc)
-
-        return None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return entity specific state attributes."""
-        if self.child_uid not in self.coordinator.data:
-            return {}
-
-        feed_status = self.coordinator.data[self.child_uid].get("feed_status", {})
-        if not isinstance(feed_status, dict):
-            return {}
-
-        prefs = feed_status.get("prefs", {})
-        last_nursing = prefs.get("lastNursing", {})
-        last_side_data = prefs.get("lastSide", {})
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the start time and details of the last feeding."""
+        if (state := self.child_state) is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
 
+        feed = state.feed
         attrs = {}
 
-        duration = last_nursing.get("duration")
-        if duration is not None:
-            attrs["duration_seconds"] = duration
-
-        left_duration = last_nursing.get("leftDuration")
-        if left_duration is not None:
-            attrs["left_duration_seconds"] = left_duration
-
-        right_duration = last_nursing.get("rightDuration")
-        if right_duration is not None:
-            attrs["right_duration_seconds"] = right_duration
+        if feed.last_nursing_duration is not None:
+            attrs["duration_seconds"] = feed.last_nursing_duration
 
-        last_side = last_side_data.get("lastSide")
-        if last_side:
-            attrs["last_side"] = last_side
+        if feed.last_nursing_left_duration is not None:
+            attrs["left_duration_seconds"] = feed.last_nursing_left_duration
 
-        return attrs
+        if feed.last_nursing_right_duration is not None:
+            attrs["right_duration_seconds"] = feed.last_nursing_right_duration
 
+        if feed.prefs_last_side:
+            attrs["last_side"] = feed.prefs_last_side
 
+        self._attr_native_value = feed.last_nursing_start_at
+        self._attr_extra_state_attributes = attrs
@@ -0,0 +1,275 @@
+"""Hourly long-term statistics of each child, imported into the recorder.
+
+Sleep minutes, naps, feeding minutes per side and diaper changes by mode
+are aggregated per hour from the history store and imported as external
+statistics. Each window is synced through the child's calendar first.
+Each run continues from the last imported hour, so the first run
+backfills from the child's birthday and later runs only add the hours
+that passed since. A window that can't be synced ends the run, so no
+hour is imported from incomplete history.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta, tzinfo
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util, slugify
+
+from huckleberry_api import ChildData
+
+from .const import DOMAIN
+from .export import EXPORT_WINDOW, async_sync_window
+from .intervals import Row
+
+if TYPE_CHECKING:
+    from . import HuckleberryDataUpdateCoordinator
+    from .calendar import HuckleberryCalendar
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+
+STATISTICS_INTERVAL = timedelta(hours=1)
+
+# Hours are imported once they are a day old, when sleeps and feedings
+# still running at the end of the hour have been logged
+STATISTICS_DELAY = timedelta(days=1)
+
+# Entries starting this long before a window are read for the minutes they
+# spill into it
+LOOKBACK = 24 * HOUR
+
+# Night start and morning cutoff, in minutes from midnight, for children
+# without night settings
+DEFAULT_NIGHT_START = 19 * 60
+DEFAULT_MORNING_CUTOFF = 7 * 60
+
+# Key -> (name, unit)
+STATISTICS: dict[str, tuple[str, str | None]] = {
+    "sleep_minutes": ("sleep minutes", UnitOfTime.MINUTES),
+    "naps": ("naps", None),
+    "feed_left_minutes": ("feeding minutes left", UnitOfTime.MINUTES),
+    "feed_right_minutes": ("feeding minutes right", UnitOfTime.MINUTES),
+    "diaper_pee": ("pee diapers", None),
+    "diaper_poo": ("poo diapers", None),
+    "diaper_both": ("pee and poo diapers", None),
+    "diaper_dry": ("dry diapers", None),
+}
+
+CATEGORIES = ("sleep", "feed", "diaper")
+
+
+def statistic_id(child_uid: str, key: str) -> str:
+    """Return the external statistic id of a child's aggregate."""
+    return f"{DOMAIN}:{slugify(child_uid)}_{key}"
+
+
+def _spread(
+    hours: dict[int, dict[str, float]], key: str, start: float, seconds: float, window: tuple[int, int]
+) -> None:
+    """Add the minutes of [start, start + seconds) inside the window to the hours they fall in."""
+    position = max(start, window[0])
+    end = min(start + seconds, window[1])
+    while position < end:
+        hour = int(position - position % HOUR)
+        step = min(end, hour + HOUR) - position
+        hours[hour][key] += step / 60
+        position += step
+
+
+def night_sleep_checker(child: ChildData, time_zone: tzinfo) -> Callable[[float], bool]:
+    """Return whether a sleep starting at a timestamp is night sleep for the child.
+
+    Night runs from the child's night start to its morning cutoff, local
+    time, wrapping around midnight.
+    """
+    night_start = child.get("night_start_min")
+    morning_cutoff = child.get("morning_cutoff_min")
+    if night_start is None:
+        night_start = DEFAULT_NIGHT_START
+    if morning_cutoff is None:
+        morning_cutoff = DEFAULT_MORNING_CUTOFF
+
+    def is_night_sleep(timestamp: float) -> bool:
+        local = datetime.fromtimestamp(timestamp, time_zone)
+        minute = local.hour * 60 + local.minute
+        if night_start <= morning_cutoff:
+            return night_start <= minute < morning_cutoff
+        return minute >= night_start or minute < morning_cutoff
+
+    return is_night_sleep
+
+
+def hourly_aggregates(
+    rows: Iterable[Row],
+    start: int,
+    end: int,
+    is_night_sleep: Callable[[float], bool] = lambda timestamp: False,
+) -> dict[int, dict[str, float]]:
+    """Aggregate rows into the hours of [start, end), keyed by hour start timestamp.
+
+    Durations are split over the hours they cover, counts go to the hour
+    the entry started in. Sleeps starting at night are not counted as naps.
+    """
+    hours: dict[int, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    window = (start, end)
+    for row in rows:
+        row_start = row["start"]
+        started_in_window = start <= row_start < end
+        hour = int(row_start - row_start % HOUR)
+        if row["category"] == "sleep":
+            _spread(hours, "sleep_minutes", row_start, row["duration"], window)
+            if started_in_window and not is_night_sleep(row_start):
+                hours[hour]["naps"] += 1
+        elif row["category"] == "feed":
+            # Only the time per side is known, assume the left side came first
+            _spread(hours, "feed_left_minutes", row_start, row["left_duration"], window)
+            _spread(
+                hours, "feed_right_minutes", row_start + row["left_duration"], row["right_duration"], window
+            )
+        elif row["category"] == "diaper" and started_in_window and f"diaper_{row['mode']}" in STATISTICS:
+            hours[hour][f"diaper_{row['mode']}"] += 1
+    return hours
+
+
+class HuckleberryStatistics:
+    """Import the hourly statistics of every child of an entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: HuckleberryDataUpdateCoordinator,
+        children: list[ChildData],
+        calendars: dict[str, HuckleberryCalendar],
+    ) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self._entry = entry
+        self._coordinator = coordinator
+        self._children = children
+        self._calendars = calendars
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Import now and every hour, return a callback that stops scheduling imports."""
+        self._async_schedule_import()
+        return async_track_time_interval(
+            self.hass, self._async_schedule_import, STATISTICS_INTERVAL, cancel_on_shutdown=True
+        )
+
+    @callback
+    def _async_schedule_import(self, _now: datetime | None = None) -> None:
+        """Start an import unless one is already running."""
+        if self._task and not self._task.done():
+            return
+        # Cancelled when the entry is unloaded
+        self._task = self._entry.async_create_background_task(
+            self.hass, self.async_import(), "Huckleberry statistics import"
+        )
+
+    async def async_import(self) -> None:
+        """Import the hours that passed since the last import of every child."""
+        for child in self._children:
+            try:
+                await self._async_import_child(child)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.error("Failed to import statistics for %s: %s", child.get("name"), err)
+
+    async def _async_import_child(self, child: ChildData) -> None:
+        """Import the hours of a child after its last imported hour."""
+        child_uid = child["uid"]
+        if (calendar := self._calendars.get(child_uid)) is None:
+            _LOGGER.debug("Not importing statistics for %s without a calendar", child.get("name"))
+            return
+        now = dt_util.utcnow() - STATISTICS_DELAY
+        end = int(now.timestamp()) // HOUR * HOUR
+
+        last = await get_instance(self.hass).async_add_executor_job(self._last_statistics, child_uid)
+        if len(last) < len(STATISTICS):
+            # Statistics that were never imported start at the birthday
+            if not (birthday := dt_util.parse_date(child.get("birthday") or "")):
+                _LOGGER.debug("Not importing statistics for %s without a birthday", child.get("name"))
+                return
+            first = int(dt_util.start_of_local_day(birthday).timestamp()) // HOUR * HOUR
+            last = {key: last.get(key, (first - HOUR, 0.0)) for key in STATISTICS}
+        # Hours after these are imported, per statistic
+        imported = {key: hour for key, (hour, _) in last.items()}
+        sums = {key: total for key, (_, total) in last.items()}
+        is_night_sleep = night_sleep_checker(child, dt_util.DEFAULT_TIME_ZONE)
+
+        window_start = min(imported.values()) + HOUR
+        if window_start >= end:
+            return
+        _LOGGER.debug(
+            "Importing statistics for %s from %s", child.get("name"), dt_util.utc_from_timestamp(window_start)
+        )
+        window = int(EXPORT_WINDOW.total_seconds())
+        while window_start < end:
+            window_end = min(window_start + window, end)
+            # Raises before anything of the window is imported if it can't be synced
+            await async_sync_window(
+                calendar,
+                dt_util.utc_from_timestamp(window_start - LOOKBACK),
+                dt_util.utc_from_timestamp(window_end),
+            )
+            rows = [
+                row
+                async for page in self._coordinator.history.async_iter_intervals(
+                    child_uid, window_start - LOOKBACK, window_end
+                )
+                for row in page
+                if row["category"] in CATEGORIES
+            ]
+            hours = hourly_aggregates(rows, window_start, window_end, is_night_sleep)
+            # The last hour is always written so the next run continues after it
+            hours.setdefault(window_end - HOUR, defaultdict(float))
+            for key, (name, unit) in STATISTICS.items():
+                statistics = []
+                for hour in sorted(hours):
+                    if hour <= imported[key] or (not hours[hour][key] and hour != window_end - HOUR):
+                        continue
+                    sums[key] += hours[hour][key]
+                    statistics.append(
+                        StatisticData(
+                            start=dt_util.utc_from_timestamp(hour), state=hours[hour][key], sum=sums[key]
+                        )
+                    )
+                if statistics:
+                    async_add_external_statistics(
+                        self.hass,
+                        StatisticMetaData(
+                            has_mean=False,
+                            has_sum=True,
+                            name=f"{child.get('name')} {name}",
+                            source=DOMAIN,
+                            statistic_id=statistic_id(child_uid, key),
+                            unit_of_measurement=unit,
+                        ),
+                        statistics,
+                    )
+            window_start = window_end
+
+    def _last_statistics(self, child_uid: str) -> dict[str, tuple[int, float]]:
+        """Return the start and sum of the last imported hour of each statistic."""
+        last: dict[str, tuple[int, float]] = {}
+        for key in STATISTICS:
+            sid = statistic_id(child_uid, key)
+            if rows := get_last_statistics(self.hass, 1, sid, False, {"sum"}).get(sid):
+                last[key] = (int(rows[0]["start"]), rows[0].get("sum") or 0.0)
+        return last
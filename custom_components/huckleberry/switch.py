@@ -6,7 +6,7 @@ from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
@@ -38,6 +38,8 @@ async def async_setup_entry(
 class HuckleberrySleepSwitch(HuckleberryBaseEntity, SwitchEntity):  # pylint: disable=abstract-method
     """Switch to start/stop sleep tracking."""
 
+    _data_keys = ("sleep_status",)
+
     def __init__(self, coordinator, api, child: dict) -> None:
         """Initialize the switch."""
         super().__init__(coordinator, child)
@@ -46,20 +48,33 @@ class HuckleberrySleepSwitch(HuckleberryBaseEntity, SwitchEntity):  # pylint: di
         self._attr_unique_id = f"{self.child_uid}_sleep_tracking"
         self._attr_icon = "mdi:sleep"
 
-    @property
-    def is_on(self) -> bool:
-        """Return true if sleep tracking is active."""
-        if self.available:
-            sleep_status = self.coordinator.data[self.child_uid].get("sleep_status", {})
-            timer = sleep_status.get("timer", {})
-            return timer.get("active", False) and not timer.get("paused", False)
-        return False
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update whether sleep tracking is active and the attributes."""
+        if not self.available or (state := self.child_state) is None:
+            self._attr_is_on = False
+            self._attr_extra_state_attributes = {}
+            return
+
+        sleep = state.sleep
+        attrs = {}
+
+        if sleep.is_sleeping and sleep.timer_timestamp is not None:
+            attrs["start_time"] = sleep.timer_timestamp
+
+        # Add last sleep info
+        if sleep.has_last_sleep:
+            attrs["last_sleep_duration_minutes"] = round((sleep.last_sleep_duration or 0) / 60, 1)
+            attrs["last_sleep_start"] = sleep.last_sleep_start
+
+        self._attr_is_on = sleep.is_sleeping
+        self._attr_extra_state_attributes = attrs
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Start sleep tracking."""
         _LOGGER.info("Starting sleep tracking for %s", self.child_name)
         try:
-            await self.hass.async_add_executor_job(
+            await self.coordinator.async_api_call(
                 self._api.start_sleep, self.child_uid
             )
             # Real-time listener will update state automatically
@@ -71,7 +86,7 @@ class HuckleberrySleepSwitch(HuckleberryBaseEntity, SwitchEntity):  # pylint: di
         """Stop sleep tracking."""
         _LOGGER.info("Stopping sleep tracking for %s", self.child_name)
         try:
-            await self.hass.async_add_executor_job(
+            await self.coordinator.async_api_call(
                 self._api.complete_sleep, self.child_uid
             )
             # Real-time listener will update state automatically
@@ -79,33 +94,12 @@ class HuckleberrySleepSwitch(HuckleberryBaseEntity, SwitchEntity):  # pylint: di
             _LOGGER.error("Failed to stop sleep tracking: %s", err)
             raise
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes."""
-        if not self.available:
-            return {}
-
-        sleep_status = self.coordinator.data[self.child_uid].get("sleep_status", {})
-        timer = sleep_status.get("timer", {})
-
-        attrs = {}
-
-        if self.is_on and "timestamp" in timer:
-            attrs["start_time"] = timer["timestamp"].get("seconds")
-
-        # Add last sleep info
-        prefs = sleep_status.get("prefs", {})
-        if "lastSleep" in prefs:
-            last_sleep = prefs["lastSleep"]
-            attrs["last_sleep_duration_minutes"] = round(last_sleep.get("duration", 0) / 60, 1)
-            attrs["last_sleep_start"] = last_sleep.get("start")
-
-        return attrs
-
 
 class HuckleberryFeedingSwitch(HuckleberryBaseEntity, SwitchEntity):  # pylint: disable=abstract-method
     """Switch to start/stop breast feeding tracking for specific side."""
 
+    _data_keys = ("feed_status",)
+
     def __init__(self, coordinator, api, child: dict, side: str) -> None:
         """Initialize the switch."""
         super().__init__(coordinator, child)
@@ -115,25 +109,46 @@ class HuckleberryFeedingSwitch(HuckleberryBaseEntity, SwitchEntity):  # pylint:
         self._attr_unique_id = f"{self.child_uid}_feeding_{side}"
         self._attr_icon = "mdi:baby-bottle" if side == "left" else "mdi:baby-bottle-outline"
 
-    @property
-    def is_on(self) -> bool:
-        """Return true if feeding tracking is active on this side."""
-        if self.available:
-            feed_status = self.coordinator.data[self.child_uid].get("feed_status", {})
-            timer = feed_status.get("timer", {})
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update whether this side is feeding and the attributes."""
+        if not self.available or (state := self.child_state) is None:
+            self._attr_is_on = False
+            self._attr_extra_state_attributes = {}
+            return
 
-            # Active if timer is active and activeSide matches this switch's side
-            is_active = timer.get("active", False) and not timer.get("paused", False)
-            active_side = timer.get("activeSide", timer.get("lastSide", ""))
+        # Active if timer is active and activeSide matches this switch's side
+        feed = state.feed
+        active_side = feed.active_side if feed.active_side is not None else feed.timer_last_side
+        self._attr_is_on = feed.is_feeding and active_side == self._side
 
-            return is_active and active_side == self._side
-        return False
+        attrs = {
+            "side": self._side,
+        }
+
+        if self._attr_is_on:
+            if feed.timer_timestamp is not None:
+                attrs["feeding_start"] = feed.timer_timestamp
+
+            # Show duration for this side
+            if self._side == "left":
+                attrs["duration_seconds"] = feed.left_duration
+            else:
+                attrs["duration_seconds"] = feed.right_duration
+
+        # Add last nursing info
+        if feed.has_last_nursing:
+            attrs["last_nursing_left_duration"] = feed.last_nursing_left_duration or 0
+            attrs["last_nursing_right_duration"] = feed.last_nursing_right_duration or 0
+            attrs["last_nursing_timestamp"] = feed.last_nursing_timestamp
+
+        self._attr_extra_state_attributes = attrs
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Start feeding tracking on this side."""
         _LOGGER.info("Starting %s breast feeding for %s", self._side, self.child_name)
         try:
-            await self.hass.async_add_executor_job(
+            await self.coordinator.async_api_call(
                 self._api.start_feeding, self.child_uid, self._side
             )
             # Real-time listener will update state automatically
@@ -145,43 +160,10 @@ class HuckleberryFeedingSwitch(HuckleberryBaseEntity, SwitchEntity):  # pylint:
         """Complete feeding tracking and save to history."""
         _LOGGER.info("Completing %s breast feeding for %s", self._side, self.child_name)
         try:
-            await self.hass.async_add_executor_job(
+            await self.coordinator.async_api_call(
                 self._api.complete_feeding, self.child_uid
             )
             # Real-time listener will update state automatically
         except Exception as err:
             _LOGGER.error("Failed to complete feeding tracking: %s", err)
             raise
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes."""
-        if not self.available:
-            return {}
-
-        feed_status = self.coordinator.data[self.child_uid].get("feed_status", {})
-        timer = feed_status.get("timer", {})
-        prefs = feed_status.get("prefs", {})
-
-        attrs = {
-            "side": self._side,
-        }
-
-        if self.is_on:
-            if "timestamp" in timer:
-                attrs["feeding_start"] = timer["timestamp"].get("seconds")
-
-            # Show duration for this side
-            if self._side == "left":
-                attrs["duration_seconds"] = timer.get("leftDuration", 0)
-            else:
-                attrs["duration_seconds"] = timer.get("rightDuration", 0)
-
-        # Add last nursing info
-        if "lastNursing" in prefs:
-            last_nursing = prefs["lastNursing"]
-            attrs["last_nursing_left_duration"] = last_nursing.get("leftDuration", 0)
-            attrs["last_nursing_right_duration"] = last_nursing.get("rightDuration", 0)
-            attrs["last_nursing_timestamp"] = last_nursing.get("timestamp")
-
-        return attrs
@@ -0,0 +1,114 @@
+"""Measure the cost of a state write of the per-child entities.
+
+Each write is one coordinator update followed by N reads of the properties
+a state write uses (available, value, attributes and device_info), averaged
+over the 12 per-child sensors and switches.
+
+Usage:
+    python scripts/bench_entity_attrs.py [CHECKOUT] [READS]
+
+CHECKOUT is the repository to import the integration from, defaulting to
+this one. Run it against a checkout of the commit before entities cached
+their _attr_* values to compare with computed properties.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import timeit
+from types import SimpleNamespace
+
+WRITES = 20000
+
+CHILD = {"uid": "child_1", "name": "Baby", "picture": "http://example.com/baby.png", "birthday": "2024-01-01"}
+
+DATA = {
+    "child": CHILD,
+    "sleep_status": {
+        "timer": {
+            "active": True,
+            "paused": False,
+            "timerStartTime": 1700000000000,
+            "timestamp": {"seconds": 1700000000},
+        },
+        "prefs": {"lastSleep": {"start": 1699990000, "duration": 5400}},
+    },
+    "feed_status": {
+        "timer": {
+            "active": True,
+            "paused": False,
+            "activeSide": "left",
+            "lastSide": "right",
+            "leftDuration": 120,
+            "rightDuration": 60,
+            "feedStartTime": 1700000000,
+            "timestamp": {"seconds": 1700000100},
+        },
+        "prefs": {
+            "lastNursing": {
+                "start": 1699980000,
+                "duration": 900,
+                "leftDuration": 400,
+                "rightDuration": 500,
+                "timestamp": {"seconds": 1},
+            },
+            "lastSide": {"lastSide": "right"},
+        },
+    },
+    "diaper_data": {"prefs": {"lastDiaper": {"start": 1700000000, "mode": "both", "offset": -120}}},
+    "growth_data": {"weight": 5.2, "height": 60, "head": 40, "timestamp": 1700000000},
+}
+
+
+def main() -> None:
+    """Print the time of a state write per entity."""
+    checkout = sys.argv[1] if len(sys.argv) > 1 else str(Path(__file__).resolve().parent.parent)
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    sys.path.insert(0, checkout)
+    # pylint: disable=import-outside-toplevel
+    from custom_components.huckleberry import sensor, switch
+    from custom_components.huckleberry.models import parse_child_state
+
+    coordinator = SimpleNamespace(
+        data={"child_1": DATA},
+        child_states={"child_1": parse_child_state(DATA)},
+        last_update_success=True,
+    )
+    entities = [
+        entity_class(coordinator, CHILD)
+        for entity_class in (
+            sensor.HuckleberryChildProfileSensor,
+            sensor.HuckleberryGrowthSensor,
+            sensor.HuckleberryDiaperSensor,
+            sensor.HuckleberrySleepSensor,
+            sensor.HuckleberryFeedingSensor,
+            sensor.HuckleberryLastFeedingSideSensor,
+            sensor.HuckleberryPreviousSleepStartSensor,
+            sensor.HuckleberryPreviousSleepEndSensor,
+            sensor.HuckleberryPreviousFeedSensor,
+        )
+    ]
+    entities += [
+        switch.HuckleberrySleepSwitch(coordinator, None, CHILD),
+        switch.HuckleberryFeedingSwitch(coordinator, None, CHILD, "left"),
+        switch.HuckleberryFeedingSwitch(coordinator, None, CHILD, "right"),
+    ]
+    cached = hasattr(entities[0], "_async_update_attrs")
+
+    def write() -> None:
+        for entity in entities:
+            if cached:
+                entity._async_update_available()  # pylint: disable=protected-access
+                entity._async_update_attrs()  # pylint: disable=protected-access
+            for _ in range(reads):
+                entity.available  # pylint: disable=pointless-statement
+                entity.native_value if hasattr(entity, "native_value") else entity.is_on  # pylint: disable=expression-not-assigned
+                entity.extra_state_attributes  # pylint: disable=pointless-statement
+                entity.device_info  # pylint: disable=pointless-statement
+
+    best = min(timeit.repeat(write, number=WRITES, repeat=5)) / WRITES / len(entities) * 1e6
+    print(f"{'cached' if cached else 'properties'}, {reads} reads per write: {best:.2f} us per entity write")
+
+
+if __name__ == "__main__":
+    main()
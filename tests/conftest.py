@@ -2,12 +2,132 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
+from collections.abc import Iterator
 import sys
 import socket
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from custom_components.huckleberry.intervals import COLLECTIONS
+
+
+class FakeDocument:
+    """Snapshot of a fake Firestore document."""
+
+    def __init__(self, document_id: str, data: dict[str, Any]) -> None:
+        """Initialize the snapshot."""
+        self.id = document_id
+        self._data = data
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the data of the document."""
+        return dict(self._data)
+
+
+class FakeReference:
+    """Collection, document or query of a FakeFirestore."""
+
+    _OPS = {
+        "==": lambda value, other: value == other,
+        ">=": lambda value, other: value >= other,
+        "<": lambda value, other: value < other,
+    }
+
+    def __init__(self, client: FakeFirestore, path: tuple[str, ...], filters: tuple = ()) -> None:
+        """Initialize the reference."""
+        self._client = client
+        self._path = path
+        self._filters = filters
+
+    def collection(self, name: str) -> FakeReference:
+        """Return a subcollection."""
+        return FakeReference(self._client, (*self._path, name))
+
+    def document(self, document_id: str) -> FakeReference:
+        """Return a document of the collection."""
+        return FakeReference(self._client, (*self._path, document_id))
+
+    def where(self, *, filter) -> FakeReference:  # pylint: disable=redefined-builtin
+        """Return the query narrowed by a field filter."""
+        return FakeReference(self._client, self._path, (*self._filters, filter))
+
+    def order_by(self, field: str) -> FakeReference:
+        """Return the query, documents are always streamed by start."""
+        return self
+
+    def stream(self) -> Iterator[FakeDocument]:
+        """Stream the matching documents, failing after the first if the client has an error set."""
+        self._client.queries.append((self._path, self._filters))
+        documents = sorted(
+            (
+                (document_id, data)
+                for document_id, data in self._client.documents[self._path].items()
+                if all(
+                    item.field_path in data and self._OPS[item.op_string](data[item.field_path], item.value)
+                    for item in self._filters
+                )
+            ),
+            key=lambda document: document[1].get("start", 0),
+        )
+        for index, (document_id, data) in enumerate(documents):
+            if index and self._client.error is not None:
+                raise self._client.error
+            yield FakeDocument(document_id, data)
+        if self._client.error is not None:
+            raise self._client.error
+
+
+class FakeBatch:
+    """Write batch of a FakeFirestore, applied on commit."""
+
+    def __init__(self, client: FakeFirestore) -> None:
+        """Initialize without writes."""
+        self._client = client
+        self._writes: list[tuple[FakeReference, dict[str, Any]]] = []
+
+    def set(self, reference: FakeReference, data: dict[str, Any]) -> None:
+        """Queue the write of a document."""
+        self._writes.append((reference, data))
+
+    def commit(self) -> None:
+        """Write the queued documents."""
+        for reference, data in self._writes:
+            *path, document_id = reference._path  # pylint: disable=protected-access
+            self._client.documents[tuple(path)][document_id] = dict(data)
+        self._writes = []
+
+
+class FakeFirestore:
+    """In-memory Firestore client holding the entries of children."""
+
+    def __init__(self) -> None:
+        """Initialize without documents."""
+        # Path of a collection -> {document id: data}
+        self.documents: dict[tuple[str, ...], dict[str, dict[str, Any]]] = defaultdict(dict)
+        # (path, filters) of every streamed query
+        self.queries: list[tuple[tuple[str, ...], tuple]] = []
+        # Raised by streams once set
+        self.error: Exception | None = None
+
+    def batch(self) -> FakeBatch:
+        """Return a new write batch."""
+        return FakeBatch(self)
+
+    def collection(self, name: str) -> FakeReference:
+        """Return a top-level collection."""
+        return FakeReference(self, (name,))
+
+    def add(self, child_uid: str, category: str, data: dict[str, Any], document_id: str | None = None) -> str:
+        """Add an entry document of a child, return its id."""
+        collection, subcollection = COLLECTIONS[category]
+        documents = self.documents[(collection, child_uid, subcollection)]
+        document_id = document_id or f"{category}_{len(documents)}"
+        documents[document_id] = data
+        return document_id
+
 
 @pytest.hookimpl(hookwrapper=True, tryfirst=True)
 def pytest_fixture_setup(fixturedef, request):
@@ -47,11 +167,22 @@ def auto_enable_custom_integrations(enable_custom_integrations):
     yield
 
 
+@pytest.fixture(autouse=True)
+def history_db_in_memory():
+    """Keep the history database of set-up entries in memory."""
+    with patch("custom_components.huckleberry._history_db_path", return_value=":memory:"):
+        yield
+
+
 @pytest.fixture
 def mock_huckleberry_api():
     """Mock the Huckleberry API."""
     mock = MagicMock()
     mock.authenticate = MagicMock()
+    mock.id_token = "test_id_token"
+    mock.refresh_token = "test_refresh_token"
+    mock.user_uid = "test_user_uid"
+    mock.token_expires_at = None
     mock.get_children = MagicMock(
         return_value=[
             {
@@ -71,11 +202,23 @@ def mock_huckleberry_api():
     return mock
 
 
+@pytest.fixture
+def firestore(mock_huckleberry_api) -> FakeFirestore:
+    """Serve the history queries of the mocked API from an in-memory Firestore."""
+    client = FakeFirestore()
+    mock_huckleberry_api._get_firestore_client.return_value = client
+    return client
+
+
 @pytest.fixture
 def mock_huckleberry_api_multiple_children():
     """Mock the Huckleberry API with multiple children."""
     mock = MagicMock()
     mock.authenticate = MagicMock()
+    mock.id_token = "test_id_token"
+    mock.refresh_token = "test_refresh_token"
+    mock.user_uid = "test_user_uid"
+    mock.token_expires_at = None
     mock.get_children = MagicMock(
         return_value=[
             {
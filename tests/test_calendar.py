@@ -1,11 +1,48 @@
 """Test calendar platform."""
+import asyncio
+import threading
 import pytest
-from datetime import datetime, timedelta
-from unittest.mock import MagicMock, AsyncMock, patch
+from datetime import datetime, timedelta, timezone
+from unittest.mock import ANY, MagicMock, AsyncMock, patch
 from homeassistant.components.calendar import CalendarEvent
 from homeassistant.util import dt as dt_util
 
-from custom_components.huckleberry.calendar import HuckleberryCalendar
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.huckleberry.calendar import (
+    FETCH_CHUNK,
+    MAX_CONCURRENT_CHUNKS,
+    PREFETCH_DELAY,
+    HuckleberryCalendar,
+    HuckleberryHouseholdCalendar,
+)
+from custom_components.huckleberry.executor import HuckleberryExecutor
+from custom_components.huckleberry.history_store import HistoryStore, event_uid
+from custom_components.huckleberry.intervals import Row, describe
+from custom_components.huckleberry.models import parse_child_state
+
+
+def _sleep_row(start: datetime, end: datetime) -> Row:
+    """Return the row of a sleep as it is fetched."""
+    return {
+        "category": "sleep",
+        "entry_id": f"sleep_{int(start.timestamp())}",
+        "start": int(start.timestamp()),
+        "end": int(end.timestamp()),
+        "duration": int((end - start).total_seconds()),
+    }
+
+
+def _event(row: Row, child_uid: str = "test_child_uid") -> CalendarEvent:
+    """Return the calendar event the history store serves for a row."""
+    summary, description = describe(row)
+    return CalendarEvent(
+        summary=summary,
+        description=description,
+        start=dt_util.as_local(dt_util.utc_from_timestamp(row["start"])),
+        end=dt_util.as_local(dt_util.utc_from_timestamp(row["end"])),
+        uid=event_uid(child_uid, row["category"], row["entry_id"]),
+    )
 
 
 @pytest.fixture
@@ -17,10 +54,25 @@ def mock_api():
 
 
 @pytest.fixture
-def mock_coordinator():
+async def history(hass):
+    """Create an in-memory history store."""
+    executor = HuckleberryExecutor(hass, "huckleberry_test")
+    store = HistoryStore(executor, ":memory:")
+    await store.async_open()
+    yield store
+    await store.async_close()
+    await executor.async_shutdown()
+
+
+@pytest.fixture
+def mock_coordinator(history):
     """Create a mock coordinator."""
     coordinator = MagicMock()
     coordinator.data = {}
+    coordinator.history = history
+    coordinator.async_api_call = AsyncMock(
+        side_effect=lambda method, *args, lane=None: method(*args)
+    )
     return coordinator
 
 
@@ -77,3 +129,510 @@ async def test_async_get_events(calendar, hass):
 
         assert isinstance(events, list)
         assert len(events) == 0  # All mocked to return empty lists
+
+
+@pytest.mark.asyncio
+async def test_async_get_events_fetches_categories_concurrently(calendar, hass):
+    """Test the four categories are fetched at the same time."""
+    calendar.hass = hass
+    barrier = threading.Barrier(4, timeout=5)
+
+    async def _run_in_executor(method, *args, lane=None):
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    calendar.coordinator.async_api_call = AsyncMock(side_effect=_run_in_executor)
+
+    def _fetch(start_date, end_date):
+        # Only passes if all four fetches are running at once
+        barrier.wait()
+        return []
+
+    with patch.object(
+        calendar, "_fetch_sleep_events", side_effect=_fetch
+    ), patch.object(
+        calendar, "_fetch_feed_events", side_effect=_fetch
+    ), patch.object(
+        calendar, "_fetch_diaper_events", side_effect=_fetch
+    ), patch.object(
+        calendar, "_fetch_health_events", side_effect=_fetch
+    ):
+        start_date = datetime.now() - timedelta(days=1)
+        end_date = datetime.now() + timedelta(days=1)
+
+        assert await calendar.async_get_events(hass, start_date, end_date) == []
+
+
+@pytest.mark.asyncio
+async def test_overlapping_requests_share_one_fetch(calendar, hass):
+    """Test concurrent requests for the same window hit the API once."""
+    calendar.hass = hass
+    start_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end_date = start_date + timedelta(days=1)
+    event = _sleep_row(start_date, start_date + timedelta(hours=1))
+
+    with patch.object(
+        calendar, "_fetch_sleep_events", return_value=[event]
+    ) as fetch_sleep, patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        first, second = await asyncio.gather(
+            calendar.async_get_events(hass, start_date, end_date),
+            calendar.async_get_events(hass, start_date, end_date),
+        )
+        assert fetch_sleep.call_count == 1
+        assert first == second == [_event(event)]
+        assert first is not second
+
+        # A later request is served from the cache
+        assert await calendar.async_get_events(hass, start_date, end_date) == [_event(event)]
+        assert fetch_sleep.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_window_answers_sub_ranges(calendar, hass):
+    """Test a fetched window answers sub-ranges and only fetches uncovered gaps."""
+    calendar.hass = hass
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    morning = _sleep_row(day + timedelta(hours=8), day + timedelta(hours=9))
+    evening = _sleep_row(day + timedelta(hours=20), day + timedelta(hours=21))
+
+    with patch.object(
+        calendar, "_fetch_sleep_events", return_value=[morning, evening]
+    ) as fetch_sleep, patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        await calendar.async_get_events(hass, day, day + timedelta(days=1))
+        assert await calendar.async_get_events(
+            hass, day + timedelta(hours=12), day + timedelta(days=1)
+        ) == [_event(evening)]
+        assert fetch_sleep.call_count == 1
+
+        fetch_sleep.return_value = []
+        await calendar.async_get_events(hass, day + timedelta(hours=12), day + timedelta(days=2))
+        assert fetch_sleep.call_count == 2
+        assert fetch_sleep.call_args.args == (day + timedelta(days=1), day + timedelta(days=2))
+
+
+@pytest.mark.asyncio
+async def test_new_realtime_entry_invalidates_its_window(calendar, hass):
+    """Test a new lastSleep from the listeners refetches only the window around it."""
+    calendar.hass = hass
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    nap_start = int((day + timedelta(hours=13)).timestamp())
+    calendar.coordinator.child_states = {
+        "test_child_uid": parse_child_state({"sleep_status": {"timer": {}, "prefs": {}}})
+    }
+    calendar._async_update_attrs()
+
+    with patch.object(
+        calendar, "_fetch_sleep_events", return_value=[]
+    ) as fetch_sleep, patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ) as fetch_feed, patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        await calendar.async_get_events(hass, day, day + timedelta(days=1))
+
+        calendar.coordinator.child_states = {
+            "test_child_uid": parse_child_state(
+                {"sleep_status": {"timer": {}, "prefs": {"lastSleep": {"start": nap_start, "duration": 3600}}}}
+            )
+        }
+        calendar._async_update_attrs()
+        await calendar.async_get_events(hass, day, day + timedelta(days=1))
+
+    assert fetch_feed.call_count == 1
+    assert fetch_sleep.call_count == 2
+    assert fetch_sleep.call_args.args == (day + timedelta(hours=12), day + timedelta(hours=14))
+
+
+@pytest.mark.asyncio
+async def test_window_is_synced_up_to_now_only(calendar, hass, freezer):
+    """Test history is only marked synced up to now, so later requests fetch the delta."""
+    calendar.hass = hass
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    now = day + timedelta(hours=12)
+    freezer.move_to(now)
+    nap = _sleep_row(day + timedelta(hours=9), day + timedelta(hours=10))
+
+    with patch.object(
+        calendar, "_fetch_sleep_events", return_value=[nap]
+    ) as fetch_sleep, patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        assert await calendar.async_get_events(hass, day, day + timedelta(days=1)) == [_event(nap)]
+        assert calendar._history.high_water_mark("test_child_uid", "sleep") == int(now.timestamp())
+
+        freezer.move_to(now + timedelta(hours=1))
+        late_nap = _sleep_row(now + timedelta(minutes=30), now + timedelta(minutes=45))
+        fetch_sleep.return_value = [late_nap]
+        assert await calendar.async_get_events(hass, day, day + timedelta(days=1)) == [_event(nap), _event(late_nap)]
+
+    assert fetch_sleep.call_count == 2
+    assert fetch_sleep.call_args.args == (now, day + timedelta(days=1))
+    assert calendar._history.high_water_mark("test_child_uid", "sleep") == int((now + timedelta(hours=1)).timestamp())
+
+
+@pytest.mark.asyncio
+async def test_reconcile_refetches_recent_history(calendar, hass, freezer):
+    """Test reconciliation replaces the recently synced history with a fresh copy."""
+    calendar.hass = hass
+    now = datetime(2024, 1, 20, tzinfo=timezone.utc)
+    freezer.move_to(now)
+    start = now - timedelta(days=14)
+    nap = _sleep_row(now - timedelta(days=1), now - timedelta(hours=23))
+    edited = _sleep_row(now - timedelta(days=1), now - timedelta(hours=22))
+
+    with patch.object(
+        calendar, "_fetch_sleep_events", return_value=[nap]
+    ) as fetch_sleep, patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        await calendar.async_get_events(hass, start, now)
+        fetch_sleep.return_value = [edited]
+        await calendar._async_reconcile()
+        assert await calendar.async_get_events(hass, start, now) == [_event(edited)]
+
+    assert fetch_sleep.call_count == 2
+    assert fetch_sleep.call_args.args == (now - timedelta(days=7), now)
+
+
+@pytest.mark.asyncio
+async def test_synced_history_served_when_cloud_unreachable(calendar, hass):
+    """Test a failed fetch falls back to the history stored for the window."""
+    calendar.hass = hass
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    nap = _sleep_row(day + timedelta(hours=9), day + timedelta(hours=10))
+
+    with patch.object(
+        calendar, "_fetch_sleep_events", return_value=[nap]
+    ) as fetch_sleep, patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        await calendar.async_get_events(hass, day, day + timedelta(days=1))
+
+        calendar._history.async_invalidate(
+            "test_child_uid", "sleep", int(day.timestamp()), int((day + timedelta(days=1)).timestamp())
+        )
+        fetch_sleep.side_effect = ConnectionError("offline")
+        assert await calendar.async_get_events(hass, day, day + timedelta(days=1)) == [_event(nap)]
+
+
+@pytest.mark.asyncio
+async def test_fetch_failing_mid_stream_keeps_stored_history(calendar, hass, firestore):
+    """Test a query failing part way through neither drops stored entries nor marks the window synced."""
+    calendar.hass = hass
+    calendar.coordinator.firestore_client = MagicMock(return_value=firestore)
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    day_s, next_day_s = int(day.timestamp()), int((day + timedelta(days=1)).timestamp())
+    for hour in (9, 13):
+        firestore.add(
+            "test_child_uid", "sleep", {"start": int((day + timedelta(hours=hour)).timestamp()), "duration": 3600}
+        )
+
+    events = await calendar.async_get_events(hass, day, day + timedelta(days=1))
+    assert len(events) == 2
+    _, _, since = await calendar._history.async_changes_since("test_child_uid", 0)
+
+    calendar._history.async_invalidate("test_child_uid", "sleep", day_s, next_day_s)
+    firestore.error = ConnectionError("stream reset")
+    assert await calendar.async_get_events(hass, day, day + timedelta(days=1)) == events
+
+    assert calendar._history.coverage("test_child_uid", "sleep").missing(day_s, next_day_s) == [
+        (day_s, next_day_s)
+    ]
+    assert await calendar._history.async_changes_since("test_child_uid", since) == ([], [], ANY)
+
+
+@pytest.mark.asyncio
+async def test_next_event_follows_clock_and_fetches(calendar, hass, freezer):
+    """Test the next upcoming event moves on once it starts and after a new fetch."""
+    calendar.hass = hass
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    freezer.move_to(day)
+    first = _sleep_row(day + timedelta(hours=1), day + timedelta(hours=2))
+    second = _sleep_row(day + timedelta(hours=3), day + timedelta(hours=4))
+
+    assert calendar.event is None
+
+    with patch.object(
+        calendar, "_fetch_sleep_events", return_value=[second, first]
+    ), patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        await calendar.async_get_events(hass, day, day + timedelta(days=1))
+
+    assert calendar.event == _event(first)
+    freezer.move_to(_event(first).start)
+    assert calendar.event == _event(second)
+    freezer.move_to(_event(second).start + timedelta(minutes=1))
+    assert calendar.event is None
+
+
+@pytest.mark.asyncio
+async def test_adjacent_windows_prefetched(calendar, hass):
+    """Test the next and previous windows are synced in the background after a request."""
+    calendar.hass = hass
+    day = datetime(2024, 1, 10, tzinfo=timezone.utc)
+    next_day = day + timedelta(days=1)
+    nap = _sleep_row(next_day + timedelta(hours=9), next_day + timedelta(hours=10))
+
+    with patch.object(
+        calendar, "_fetch_sleep_events", side_effect=lambda start, end: [nap] if start.timestamp() <= nap["start"] < end.timestamp() else []
+    ) as fetch_sleep, patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        await calendar.async_get_events(hass, day, next_day)
+        assert fetch_sleep.call_count == 1
+
+        async_fire_time_changed(hass, dt_util.utcnow() + PREFETCH_DELAY)
+        await asyncio.gather(*calendar._prefetches.values())
+        assert {call.args for call in fetch_sleep.call_args_list[1:]} == {
+            (next_day, next_day + timedelta(days=1)),
+            (day - timedelta(days=1), day),
+        }
+
+        # Paging forward is answered from the history store
+        assert await calendar.async_get_events(hass, next_day, next_day + timedelta(days=1)) == [_event(nap)]
+        assert fetch_sleep.call_count == 3
+        calendar._async_cancel_prefetch()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_cancelled_when_user_moves_on(calendar, hass):
+    """Test running prefetches are cancelled by a request for an unrelated window."""
+    calendar.hass = hass
+    day = datetime(2024, 1, 10, tzinfo=timezone.utc)
+    release = asyncio.Event()
+
+    async def _api_call(method, *args, lane=None):
+        # Only the window fetches of the prefetches hang
+        if method != calendar._fetch_multi_entries and args[0] != day:
+            await release.wait()
+        return method(*args)
+
+    calendar.coordinator.async_api_call = AsyncMock(side_effect=_api_call)
+    with patch.object(
+        calendar, "_fetch_sleep_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        await calendar.async_get_events(hass, day, day + timedelta(days=1))
+        async_fire_time_changed(hass, dt_util.utcnow() + PREFETCH_DELAY)
+        await asyncio.sleep(0)
+        prefetches = list(calendar._prefetches.values())
+        assert len(prefetches) == 2
+
+        far_away = day - timedelta(days=60)
+        calendar._async_cancel_prefetch(keep=(far_away, far_away + timedelta(days=1)))
+        await asyncio.gather(*prefetches, return_exceptions=True)
+
+    assert all(task.cancelled() for task in prefetches)
+    assert calendar._prefetches == {}
+    assert calendar._history.coverage("test_child_uid", "sleep").ranges == [
+        (int(day.timestamp()), int((day + timedelta(days=1)).timestamp()))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_large_range_fetched_in_capped_chunks(calendar, hass):
+    """Test a long window is fetched in contiguous chunks with bounded concurrency."""
+    calendar.hass = hass
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=60)
+    running = 0
+    peak = 0
+
+    async def _api_call(method, *args, lane=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+        return method(*args)
+
+    calendar.coordinator.async_api_call = AsyncMock(side_effect=_api_call)
+    with patch.object(
+        calendar, "_fetch_sleep_events", return_value=[]
+    ) as fetch_sleep, patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        await calendar.async_get_events(hass, start, end)
+
+    chunks = sorted(call.args for call in fetch_sleep.call_args_list)
+    assert chunks[0][0] == start
+    assert chunks[-1][1] == end
+    assert all(previous[1] == chunk[0] for previous, chunk in zip(chunks, chunks[1:]))
+    assert all(chunk[1] - chunk[0] <= timedelta(seconds=FETCH_CHUNK) for chunk in chunks)
+    assert len(chunks) == 5
+    assert peak == MAX_CONCURRENT_CHUNKS
+
+
+@pytest.mark.asyncio
+async def test_multi_entry_documents_fetched_once_per_sync(calendar, hass, firestore):
+    """Test batched entries are fetched once for a long window and stored with their chunks."""
+    calendar.hass = hass
+    calendar.coordinator.firestore_client = MagicMock(return_value=firestore)
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=60)
+    starts = [int((start + timedelta(days=day, hours=9)).timestamp()) for day in (3, 40, 70)]
+    entries = {f"entry_{index}": {"start": entry_start, "duration": 3600} for index, entry_start in enumerate(starts)}
+    firestore.add("test_child_uid", "sleep", {"multi": True, "data": entries})
+    firestore.add("test_child_uid", "sleep", {"start": starts[0] + 7200, "duration": 1800})
+
+    events = await calendar.async_get_events(hass, start, end)
+
+    assert [int(event.start.timestamp()) for event in events] == [starts[0], starts[0] + 7200, starts[1]]
+    multi_entry_queries = [
+        path for path, filters in firestore.queries if path[0] == "sleep" and filters[0].field_path == "multi"
+    ]
+    assert len(multi_entry_queries) == 1
+    calendar._async_cancel_prefetch()
+
+
+@pytest.mark.asyncio
+async def test_household_calendar_merges_children(calendar, mock_coordinator, mock_api, mock_entry, hass):
+    """Test the household calendar syncs every child and merges them with name prefixes."""
+    sibling = HuckleberryCalendar(mock_coordinator, {"uid": "sibling_uid", "name": "Sibling"}, mock_api)
+    household = HuckleberryHouseholdCalendar(mock_entry, mock_coordinator, [calendar, sibling])
+    calendar.hass = sibling.hass = household.hass = hass
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    nap = _sleep_row(day + timedelta(hours=9), day + timedelta(hours=10))
+    feed_start = int((day + timedelta(hours=8)).timestamp())
+    feed = {
+        "category": "feed",
+        "entry_id": "feed_1",
+        "start": feed_start,
+        "end": feed_start + 1200,
+        "duration": 1200,
+        "left_duration": 1200,
+        "right_duration": 0,
+    }
+
+    patches = []
+    for child_calendar, sleep, feeding in ((calendar, [nap], []), (sibling, [], [feed])):
+        patches += [
+            patch.object(child_calendar, "_fetch_sleep_events", return_value=sleep),
+            patch.object(child_calendar, "_fetch_feed_events", return_value=feeding),
+            patch.object(child_calendar, "_fetch_diaper_events", return_value=[]),
+            patch.object(child_calendar, "_fetch_health_events", return_value=[]),
+        ]
+    for child_patch in patches:
+        child_patch.start()
+    try:
+        events = await household.async_get_events(hass, day, day + timedelta(days=1))
+        # The child calendar reuses what the household calendar synced
+        assert await calendar.async_get_events(hass, day, day + timedelta(days=1)) == [_event(nap)]
+        assert calendar._fetch_sleep_events.call_count == 1
+    finally:
+        for child_patch in patches:
+            child_patch.stop()
+
+    assert [event.summary for event in events] == ["Sibling: 🍼 Feed (L:20m)", "Test Baby: 💤 Sleep (1h)"]
+    assert events[0].uid == _event(feed, "sibling_uid").uid
+    assert events[1].start == _event(nap).start
+    calendar._async_cancel_prefetch()
+
+
+@pytest.mark.asyncio
+async def test_overlapping_syncs_fetch_each_gap_once(calendar, mock_coordinator, mock_entry, hass):
+    """Test the household calendar and an overlapping child request fetch every gap once."""
+    household = HuckleberryHouseholdCalendar(mock_entry, mock_coordinator, [calendar])
+    calendar.hass = household.hass = hass
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    nap = _sleep_row(day + timedelta(days=1, hours=9), day + timedelta(days=1, hours=10))
+    release = asyncio.Event()
+
+    async def _api_call(method, *args, lane=None):
+        await release.wait()
+        return method(*args)
+
+    calendar.coordinator.async_api_call = AsyncMock(side_effect=_api_call)
+    with patch.object(
+        calendar,
+        "_fetch_sleep_events",
+        side_effect=lambda start, end: [nap] if start.timestamp() <= nap["start"] < end.timestamp() else [],
+    ) as fetch_sleep, patch.object(
+        calendar, "_fetch_feed_events", return_value=[]
+    ) as fetch_feed, patch.object(
+        calendar, "_fetch_diaper_events", return_value=[]
+    ), patch.object(
+        calendar, "_fetch_health_events", return_value=[]
+    ):
+        household_request = hass.async_create_task(
+            household.async_get_events(hass, day, day + timedelta(days=2))
+        )
+        child_request = hass.async_create_task(
+            calendar.async_get_events(hass, day + timedelta(days=1), day + timedelta(days=3))
+        )
+        await asyncio.sleep(0)
+        release.set()
+        household_events, child_events = await asyncio.gather(household_request, child_request)
+
+    # Whichever sync started first, the gaps fetched are contiguous and never overlap
+    for fetch in (fetch_sleep, fetch_feed):
+        windows = sorted(call.args for call in fetch.call_args_list)
+        assert len(windows) == 2
+        assert windows[0][0] == day
+        assert windows[0][1] == windows[1][0]
+        assert windows[1][1] == day + timedelta(days=3)
+    assert [event.uid for event in household_events] == [_event(nap).uid]
+    assert child_events == [_event(nap)]
+    calendar._async_cancel_prefetch()
+
+
+@pytest.mark.asyncio
+async def test_invalid_growth_measurement_is_left_empty(calendar, hass, firestore):
+    """Test a measurement that isn't a number is skipped instead of failing the sync."""
+    calendar.hass = hass
+    calendar.coordinator.firestore_client = MagicMock(return_value=firestore)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    firestore.add(
+        "test_child_uid",
+        "health",
+        {"start": int((start + timedelta(hours=9)).timestamp()), "weight": "", "height": "60.5", "head": None},
+    )
+
+    events = await calendar.async_get_events(hass, start, start + timedelta(days=1))
+
+    assert [event.description for event in events] == ["Growth tracking:\nHeight: 60.5"]
+    assert calendar.is_synced(start, start + timedelta(days=1))
+    calendar._async_cancel_prefetch()
@@ -4,7 +4,8 @@ import pytest
 from homeassistant import config_entries, data_entry_flow
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
-from custom_components.huckleberry.const import DOMAIN
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from custom_components.huckleberry.const import CONF_COALESCE_WINDOW_MS, CONF_HOUSEHOLD_CALENDAR, DOMAIN
 
 async def test_flow_user_init(hass: HomeAssistant):
     """Test the initialization of the form in the user step."""
@@ -105,3 +106,68 @@ async def test_flow_user_no_children(hass: HomeAssistant, mock_huckleberry_api):
 
     assert result["type"] == data_entry_flow.FlowResultType.FORM
     assert result["errors"] == {"base": "no_children"}
+
+async def test_options_flow(hass: HomeAssistant, mock_huckleberry_api):
+    """Test the options flow stores the coalescing window."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_EMAIL: "test@example.com", CONF_PASSWORD: "test_password"},
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=mock_huckleberry_api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        assert result["type"] == data_entry_flow.FlowResultType.FORM
+        assert result["step_id"] == "init"
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], user_input={CONF_COALESCE_WINDOW_MS: 250}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options == {CONF_COALESCE_WINDOW_MS: 250, CONF_HOUSEHOLD_CALENDAR: False}
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert coordinator.coalesce_window_ms == 250
+
+async def test_flow_session_reused_by_setup(
+    hass: HomeAssistant, mock_huckleberry_api, mock_huckleberry_api_multiple_children
+):
+    """Test setup reuses the flow's tokens and children instead of signing in again."""
+    flow_api = mock_huckleberry_api
+    flow_api.id_token = "flow_id_token"
+    flow_api.token_expires_at = 1700003600.0
+    setup_api = mock_huckleberry_api_multiple_children
+    setup_api.id_token = None
+    with patch(
+        "custom_components.huckleberry.config_flow.HuckleberryAPI",
+        return_value=flow_api,
+    ), patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=setup_api,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_USER},
+            data={
+                CONF_EMAIL: "test@example.com",
+                CONF_PASSWORD: "test_password",
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert flow_api.authenticate.call_count == 1
+    assert flow_api.get_children.call_count == 1
+    setup_api.authenticate.assert_not_called()
+    setup_api.get_children.assert_not_called()
+    assert setup_api.id_token == "flow_id_token"
+    assert setup_api.token_expires_at == 1700003600.0
+    coordinator = hass.data[DOMAIN][result["result"].entry_id]["coordinator"]
+    assert [child["uid"] for child in coordinator.children] == ["child_1"]
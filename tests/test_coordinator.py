@@ -0,0 +1,421 @@
+"""Test the Huckleberry data update coordinator."""
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.huckleberry.const import CONF_COALESCE_WINDOW_MS, DOMAIN
+from custom_components.huckleberry.diagnostics import async_get_config_entry_diagnostics
+from custom_components.huckleberry.sensor import HuckleberryDiaperSensor
+from custom_components.huckleberry.switch import HuckleberryFeedingSwitch
+
+
+async def _setup_entry(
+    hass: HomeAssistant, api, coalesce_window_ms: int = 0
+) -> MockConfigEntry:
+    """Set up the integration with the given mock API."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_EMAIL: "test@example.com", CONF_PASSWORD: "test_password"},
+        options={CONF_COALESCE_WINDOW_MS: coalesce_window_ms},
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    return entry
+
+
+def _listener_callback(mock_setup, child_uid: str):
+    """Return the realtime callback registered for a child."""
+    for call in mock_setup.call_args_list:
+        if call.args[0] == child_uid:
+            return call.args[1]
+    raise AssertionError(f"No listener registered for {child_uid}")
+
+
+async def test_realtime_update_only_notifies_subscribed_entities(
+    hass: HomeAssistant, mock_huckleberry_api_multiple_children
+):
+    """Test a diaper snapshot for one child only re-renders that child's diaper sensor."""
+    api = mock_huckleberry_api_multiple_children
+    entry = await _setup_entry(hass, api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    diaper_callback = _listener_callback(api.setup_diaper_listener, "child_2")
+
+    with patch.object(
+        HuckleberryFeedingSwitch, "async_write_ha_state"
+    ) as switch_write, patch.object(
+        HuckleberryDiaperSensor, "async_write_ha_state", autospec=True
+    ) as diaper_write:
+        diaper_callback({"prefs": {"lastDiaper": {"mode": "poo", "start": 1700000000}}})
+        await hass.async_block_till_done()
+
+    assert switch_write.call_count == 0
+    assert [call.args[0].child_uid for call in diaper_write.call_args_list] == ["child_2"]
+    assert coordinator.last_changed_topics == {("child_2", "diaper_data")}
+    assert coordinator.data["child_2"]["diaper_data"]["prefs"]["lastDiaper"]["mode"] == "poo"
+
+    diaper_callback({"prefs": {"lastDiaper": {"mode": "pee", "start": 1700000100}}})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.second_child_last_diaper")
+    assert state.attributes["mode"] == "pee"
+    assert "mode" not in hass.states.get("sensor.first_child_last_diaper").attributes
+
+
+async def test_unchanged_snapshots_are_suppressed(
+    hass: HomeAssistant, mock_huckleberry_api
+):
+    """Test snapshots that only change unused fields are not published."""
+    entry = await _setup_entry(hass, mock_huckleberry_api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    sleep_callback = _listener_callback(mock_huckleberry_api.setup_realtime_listener, "child_1")
+
+    document = {
+        "timer": {"active": True, "paused": False},
+        "prefs": {"timestamp": {"seconds": 1700000000}},
+    }
+    sleep_callback(document)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test_child_sleep_status").state == "sleeping"
+
+    with patch.object(coordinator, "async_set_updated_topics") as set_topic:
+        sleep_callback({**document, "prefs": {"timestamp": {"seconds": 1700000060}}})
+        sleep_callback({**document, "prefs": {"local_timestamp": 1700000120}})
+        await hass.async_block_till_done()
+
+    set_topic.assert_not_called()
+    assert coordinator.suppressed_updates == 2
+    assert coordinator.suppressed_updates_by_stream == {"child_1/sleep_status": 2}
+
+    sleep_callback({**document, "timer": {"active": True, "paused": True}})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test_child_sleep_status").state == "paused"
+    assert coordinator.suppressed_updates == 2
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["entry"]["data"][CONF_PASSWORD] == "**REDACTED**"
+    assert diagnostics["realtime"]["suppressed_updates"] == 2
+
+
+async def test_snapshot_burst_is_published_once(
+    hass: HomeAssistant, mock_huckleberry_api
+):
+    """Test snapshots arriving within the coalescing window are merged."""
+    entry = await _setup_entry(hass, mock_huckleberry_api, coalesce_window_ms=200)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    sleep_callback = _listener_callback(mock_huckleberry_api.setup_realtime_listener, "child_1")
+    feed_callback = _listener_callback(mock_huckleberry_api.setup_feed_listener, "child_1")
+
+    with patch.object(
+        coordinator, "async_set_updated_topics", wraps=coordinator.async_set_updated_topics
+    ) as set_topics:
+        await hass.async_add_executor_job(sleep_callback, {"timer": {"active": True, "paused": False}})
+        await hass.async_add_executor_job(feed_callback, {"timer": {"active": True, "paused": False}})
+        await hass.async_add_executor_job(sleep_callback, {"timer": {"active": True, "paused": True}})
+        await hass.async_block_till_done()
+        set_topics.assert_not_called()
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    set_topics.assert_called_once()
+    assert coordinator.last_changed_topics == {
+        ("child_1", "sleep_status"),
+        ("child_1", "feed_status"),
+    }
+    assert hass.states.get("sensor.test_child_sleep_status").state == "paused"
+    assert hass.states.get("sensor.test_child_feeding_status").state == "feeding"
+
+
+async def test_realtime_update_replaces_only_changed_child_snapshot(
+    hass: HomeAssistant, mock_huckleberry_api_multiple_children
+):
+    """Test published child snapshots are read-only and replaced copy-on-write."""
+    api = mock_huckleberry_api_multiple_children
+    entry = await _setup_entry(hass, api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    before = dict(coordinator.data)
+    states_before = dict(coordinator.child_states)
+    assert set(before) == {"child_1", "child_2", "child_3"}
+    with pytest.raises(TypeError):
+        before["child_1"]["sleep_status"] = {}
+
+    _listener_callback(api.setup_realtime_listener, "child_1")({"timer": {"active": True}})
+    await hass.async_block_till_done()
+
+    assert coordinator.data["child_2"] is before["child_2"]
+    assert coordinator.data["child_3"] is before["child_3"]
+    assert coordinator.data["child_1"] is not before["child_1"]
+    assert coordinator.data["child_1"]["sleep_status"] == {"timer": {"active": True}}
+    assert before["child_1"]["sleep_status"] == {}
+    with pytest.raises(TypeError):
+        coordinator.data["child_4"] = {}
+
+    # Only the changed document is parsed again
+    assert coordinator.child_states["child_2"] is states_before["child_2"]
+    assert coordinator.child_states["child_1"].sleep.is_sleeping
+    assert coordinator.child_states["child_1"].feed is states_before["child_1"].feed
+
+
+async def test_failed_listener_does_not_abort_setup(
+    hass: HomeAssistant, mock_huckleberry_api_multiple_children
+):
+    """Test a stream that fails to register leaves the other listeners running."""
+    api = mock_huckleberry_api_multiple_children
+
+    def _setup_diaper_listener(child_uid, callback):
+        if child_uid == "child_2":
+            raise RuntimeError("stream unavailable")
+
+    api.setup_diaper_listener.side_effect = _setup_diaper_listener
+    entry = await _setup_entry(hass, api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    assert entry.state.value == "loaded"
+    assert api.setup_realtime_listener.call_count == 3
+    assert api.setup_feed_listener.call_count == 3
+    assert api.setup_health_listener.call_count == 3
+    assert api.setup_diaper_listener.call_count == 3
+    assert coordinator.failed_listeners == ["child_2/diaper"]
+    assert coordinator.listener_setup_seconds is not None
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["realtime"]["failed_listeners"] == ["child_2/diaper"]
+
+
+async def test_cached_realtime_state_is_restored(
+    hass: HomeAssistant, hass_storage, mock_huckleberry_api
+):
+    """Test entities render the last-known state before listeners deliver data."""
+    hass_storage[f"{DOMAIN}.test_entry.realtime"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.test_entry.realtime",
+        "data": {
+            "children": {
+                "child_1": {
+                    "sleep_status": {"timer": {"active": True, "paused": False}, "prefs": {}},
+                    "diaper_data": {"prefs": {"lastDiaper": {"mode": "dry", "start": 1700000000}}},
+                },
+                "removed_child": {"sleep_status": {"timer": {"active": True}}},
+            }
+        },
+    }
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="test_entry",
+        data={CONF_EMAIL: "test@example.com", CONF_PASSWORD: "test_password"},
+        options={CONF_COALESCE_WINDOW_MS: 0},
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=mock_huckleberry_api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    assert "removed_child" not in coordinator.data
+    assert hass.states.get("sensor.test_child_sleep_status").state == "sleeping"
+    assert hass.states.get("sensor.test_child_last_diaper").attributes["mode"] == "dry"
+
+    # A live snapshot matching the cache is not published again
+    sleep_callback = _listener_callback(mock_huckleberry_api.setup_realtime_listener, "child_1")
+    sleep_callback({"timer": {"active": True, "paused": False}, "prefs": {"timestamp": 1}})
+    await hass.async_block_till_done()
+    assert coordinator.suppressed_updates == 1
+
+    sleep_callback({"timer": {"active": False}, "prefs": {"lastSleep": {"start": 1, "duration": 60}}})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test_child_sleep_status").state == "none"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=5))
+    await hass.async_block_till_done()
+    saved = hass_storage[f"{DOMAIN}.test_entry.realtime"]["data"]["children"]["child_1"]
+    assert saved["sleep_status"] == {
+        "timer": {"active": False},
+        "prefs": {"lastSleep": {"start": 1, "duration": 60}},
+    }
+    assert saved["diaper_data"]["prefs"]["lastDiaper"]["mode"] == "dry"
+
+
+async def test_watchdog_resubscribes_stalled_stream(
+    hass: HomeAssistant, mock_huckleberry_api
+):
+    """Test a dead listener is resubscribed on its own, with backoff on failure."""
+    api = mock_huckleberry_api
+    api._listeners = {}
+
+    def _register(stream):
+        def _setup(child_uid, callback):
+            api._listeners[f"{stream}_{child_uid}"] = MagicMock(is_active=True)
+        return _setup
+
+    api.setup_realtime_listener.side_effect = _register("sleep")
+    api.setup_feed_listener.side_effect = _register("feed")
+    api.setup_health_listener.side_effect = _register("health")
+    api.setup_diaper_listener.side_effect = _register("diaper")
+    entry = await _setup_entry(hass, api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    dead_watch = api._listeners["diaper_child_1"]
+    dead_watch.is_active = False
+    api.setup_diaper_listener.side_effect = RuntimeError("unavailable")
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=1))
+    await hass.async_block_till_done()
+
+    dead_watch.unsubscribe.assert_called_once()
+    assert api.setup_diaper_listener.call_count == 2
+    assert api.setup_realtime_listener.call_count == 1
+    assert coordinator.failed_listeners == ["child_1/diaper"]
+    health = coordinator.stream_health["child_1/diaper"]
+    assert health["failures"] == 1
+    assert health["stalled"] is True
+
+    # The retry waits for the backoff delay
+    assert health["next_attempt"] is not None
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=2))
+    await hass.async_block_till_done()
+    assert api.setup_diaper_listener.call_count == 2
+
+    api.setup_diaper_listener.side_effect = _register("diaper")
+    coordinator._streams[("child_1", "diaper")].next_attempt = time.time()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=3))
+    await hass.async_block_till_done()
+
+    assert api.setup_diaper_listener.call_count == 3
+    assert coordinator.failed_listeners == []
+    health = coordinator.stream_health["child_1/diaper"]
+    assert health["failures"] == 0
+    assert health["resubscribes"] == 1
+    assert health["stalled"] is False
+
+
+async def test_session_refreshed_before_token_expiry(
+    hass: HomeAssistant, mock_huckleberry_api
+):
+    """Test the session is refreshed shortly before the token expires, not on a poll."""
+    api = mock_huckleberry_api
+    api.token_expires_at = time.time() + 3600
+    api.refresh_auth_token.side_effect = lambda: setattr(
+        api, "token_expires_at", time.time() + 3600
+    )
+    await _setup_entry(hass, api)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=30))
+    await hass.async_block_till_done()
+    api.refresh_auth_token.assert_not_called()
+    api.maintain_session.assert_not_called()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=57))
+    await hass.async_block_till_done()
+    assert api.refresh_auth_token.call_count == 1
+
+
+async def test_auth_error_triggers_session_refresh(
+    hass: HomeAssistant, mock_huckleberry_api
+):
+    """Test an authentication error from an API call refreshes the session at once."""
+    api = mock_huckleberry_api
+    api.token_expires_at = time.time() + 3600
+    entry = await _setup_entry(hass, api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    response = requests.Response()
+    response.status_code = 401
+    api.start_sleep.side_effect = requests.exceptions.HTTPError(response=response)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        await coordinator.async_api_call(api.start_sleep, "child_1")
+    await hass.async_block_till_done()
+
+    assert api.refresh_auth_token.call_count == 1
+
+
+async def test_firestore_client_created_after_session_refresh(
+    hass: HomeAssistant, mock_huckleberry_api
+):
+    """Test the Firestore client is created once before the listeners and never during a refresh."""
+    api = mock_huckleberry_api
+    api.token_expires_at = time.time() + 3600
+    entry = await _setup_entry(hass, api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    calls = [name for name, _, _ in api.mock_calls]
+    assert calls.index("_get_firestore_client") < calls.index("setup_realtime_listener")
+
+    events = []
+    refreshing = threading.Event()
+    release = threading.Event()
+
+    def _refresh():
+        events.append("refresh started")
+        refreshing.set()
+        release.wait(5)
+        events.append("refresh done")
+
+    api.refresh_auth_token.side_effect = _refresh
+    api._get_firestore_client.side_effect = lambda: events.append("client")
+    coordinator.async_refresh_session()
+    await hass.async_add_executor_job(refreshing.wait, 5)
+    client = hass.async_add_executor_job(coordinator.firestore_client)
+    await asyncio.sleep(0.05)
+    release.set()
+    await client
+    await hass.async_block_till_done()
+
+    assert events == ["refresh started", "refresh done", "client"]
+
+
+async def test_resubscribe_waits_for_session_refresh(
+    hass: HomeAssistant, mock_huckleberry_api
+):
+    """Test a stalled stream is not resubscribed while the refresh recreates the listeners."""
+    api = mock_huckleberry_api
+    api.token_expires_at = time.time() + 3600
+    api._listeners = {}
+    entry = await _setup_entry(hass, api)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    events = []
+    refreshing = threading.Event()
+    release = threading.Event()
+
+    def _refresh():
+        events.append("refresh started")
+        refreshing.set()
+        release.wait(5)
+        events.append("refresh done")
+
+    api.refresh_auth_token.side_effect = _refresh
+    api.setup_diaper_listener.side_effect = lambda child_uid, callback: events.append("resubscribed")
+    coordinator.async_refresh_session()
+    await hass.async_add_executor_job(refreshing.wait, 5)
+    # No diaper listener is registered, so the watchdog resubscribes it
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=1))
+    await asyncio.sleep(0.05)
+    release.set()
+    await hass.async_block_till_done()
+
+    assert events == ["refresh started", "refresh done", "resubscribed"]
@@ -0,0 +1,44 @@
+"""Test the Huckleberry executor lanes."""
+import asyncio
+import threading
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.huckleberry.executor import (
+    LANE_BACKGROUND,
+    LANE_INTERACTIVE,
+    LANE_WORKERS,
+    HuckleberryExecutor,
+)
+
+
+async def test_interactive_lane_not_blocked_by_background(hass: HomeAssistant):
+    """Test a saturated background lane does not delay interactive calls."""
+    executor = HuckleberryExecutor(hass, "huckleberry_test")
+    release = threading.Event()
+
+    background = [
+        asyncio.ensure_future(executor.async_run(LANE_BACKGROUND, release.wait))
+        for _ in range(LANE_WORKERS[LANE_BACKGROUND] + 2)
+    ]
+    try:
+        while executor.stats[LANE_BACKGROUND]["running"] < LANE_WORKERS[LANE_BACKGROUND]:
+            await asyncio.sleep(0.01)
+
+        assert await asyncio.wait_for(
+            executor.async_run(LANE_INTERACTIVE, lambda: "done"), timeout=5
+        ) == "done"
+
+        stats = executor.stats
+        assert stats[LANE_BACKGROUND]["running"] == LANE_WORKERS[LANE_BACKGROUND]
+        assert stats[LANE_BACKGROUND]["queued"] == 2
+        assert stats[LANE_INTERACTIVE]["completed"] == 1
+    finally:
+        release.set()
+        await asyncio.gather(*background)
+        await executor.async_shutdown()
+
+    stats = executor.stats
+    assert stats[LANE_BACKGROUND]["queued"] == 0
+    assert stats[LANE_BACKGROUND]["completed"] == LANE_WORKERS[LANE_BACKGROUND] + 2
+    assert stats[LANE_BACKGROUND]["wait_max_ms"] > 0
@@ -0,0 +1,118 @@
+"""Test the Huckleberry history export view."""
+from datetime import datetime, timezone
+import json
+from unittest.mock import patch
+
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.huckleberry.const import DOMAIN
+from custom_components.huckleberry.export import _ics_line
+from custom_components.huckleberry.history_store import event_uid
+
+SLEEP_STARTS = [
+    int(datetime(2024, 1, day, 9, tzinfo=timezone.utc).timestamp())
+    for day in (2, 20)
+] + [int(datetime(2024, 2, 15, 9, tzinfo=timezone.utc).timestamp())]
+
+
+async def _setup(hass: HomeAssistant, mock_huckleberry_api, firestore) -> MockConfigEntry:
+    """Set up an entry whose child slept at SLEEP_STARTS."""
+    for sleep_start in SLEEP_STARTS:
+        firestore.add("child_1", "sleep", {"start": sleep_start, "duration": 3600}, f"sleep_{sleep_start}")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=mock_huckleberry_api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry
+
+
+async def test_export_jsonl(hass: HomeAssistant, hass_client, mock_huckleberry_api, firestore):
+    """Test the history is synced window by window and streamed in order."""
+    entry = await _setup(hass, mock_huckleberry_api, firestore)
+    client = await hass_client()
+
+    response = await client.get(
+        "/api/huckleberry/history/child_1.jsonl",
+        params={"start": "2024-01-01T00:00:00+00:00", "end": "2024-03-01T00:00:00+00:00"},
+    )
+    assert response.status == 200
+    assert response.headers["Content-Type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in (await response.text()).splitlines()]
+    assert [line["uid"] for line in lines] == [
+        event_uid("child_1", "sleep", f"sleep_{start}") for start in SLEEP_STARTS
+    ]
+    assert lines[0]["category"] == "sleep"
+    assert lines[0]["start"] == "2024-01-02T09:00:00+00:00"
+    assert lines[0]["end"] == "2024-01-02T10:00:00+00:00"
+
+    # The range was fetched in windows, not as one request
+    assert sum(path[0] == "sleep" and len(filters) == 2 for path, filters in firestore.queries) > 1
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_export_ics(hass: HomeAssistant, hass_client, mock_huckleberry_api, firestore):
+    """Test the iCalendar export."""
+    entry = await _setup(hass, mock_huckleberry_api, firestore)
+    client = await hass_client()
+
+    response = await client.get(
+        "/api/huckleberry/history/child_1.ics",
+        params={"start": "2024-01-01", "end": "2024-01-10"},
+    )
+    assert response.status == 200
+    body = await response.text()
+    assert body.startswith("BEGIN:VCALENDAR\r\n")
+    assert body.endswith("END:VCALENDAR\r\n")
+    assert body.count("BEGIN:VEVENT") == 1
+    assert f"UID:{event_uid('child_1', 'sleep', f'sleep_{SLEEP_STARTS[0]}')}\r\n" in body
+    assert "DTSTART:20240102T090000Z\r\n" in body
+    assert "DTEND:20240102T100000Z\r\n" in body
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_export_errors(hass: HomeAssistant, hass_client, mock_huckleberry_api, firestore):
+    """Test unknown children, formats, bad times and an unreachable cloud are reported."""
+    entry = await _setup(hass, mock_huckleberry_api, firestore)
+    client = await hass_client()
+
+    response = await client.get("/api/huckleberry/history/unknown.jsonl")
+    assert response.status == 404
+    response = await client.get("/api/huckleberry/history/child_1.csv")
+    assert response.status == 404
+    response = await client.get(
+        "/api/huckleberry/history/child_1.jsonl", params={"start": "yesterday"}
+    )
+    assert response.status == 400
+
+    firestore.error = ConnectionError("offline")
+    response = await client.get("/api/huckleberry/history/child_1.jsonl")
+    assert response.status == 503
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+def test_ics_line_folding():
+    """Test long lines are folded to 75 octets without splitting characters."""
+    line = "SUMMARY:" + "💤" * 40
+    folded = _ics_line(line)
+    parts = folded.removesuffix("\r\n").split("\r\n")
+    assert all(len(part.encode()) <= 75 for part in parts)
+    assert parts[0] + "".join(part[1:] for part in parts[1:]) == line
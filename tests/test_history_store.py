@@ -0,0 +1,140 @@
+"""Test the Huckleberry history store."""
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.huckleberry.executor import HuckleberryExecutor
+from custom_components.huckleberry.history_store import HistoryStore, IntervalCoverage, event_uid
+from custom_components.huckleberry.intervals import Row
+
+
+def _row(start: int, duration: int = 0, entry_id: str | None = None) -> Row:
+    """Return the row of an entry starting at a timestamp, identified by its start unless given."""
+    return {"entry_id": entry_id or str(start), "start": start, "end": start + duration, "duration": duration}
+
+
+def test_coverage_merges_and_reports_gaps():
+    """Test covered ranges are merged and gaps are reported in order."""
+    coverage = IntervalCoverage()
+    coverage.add(10, 20)
+    coverage.add(30, 40)
+    coverage.add(20, 25)
+
+    assert coverage.ranges == [(10, 25), (30, 40)]
+    assert coverage.missing(0, 50) == [(0, 10), (25, 30), (40, 50)]
+    assert coverage.missing(12, 24) == []
+
+    coverage.remove(15, 35)
+    assert coverage.ranges == [(10, 15), (35, 40)]
+
+
+async def test_store_answers_sub_ranges_and_persists(hass: HomeAssistant, tmp_path):
+    """Test stored events are read back by start time and survive a restart."""
+    executor = HuckleberryExecutor(hass, "huckleberry_test")
+    path = str(tmp_path / "history.db")
+    try:
+        store = HistoryStore(executor, path)
+        await store.async_open()
+        await store.async_add("child_1", "sleep", 100, 200, [_row(150), _row(110), _row(250)])
+        await store.async_add("child_1", "feed", 0, 100, [_row(50)])
+        await store.async_add("child_2", "sleep", 0, 200, [_row(120)])
+
+        events = await store.async_events_between("child_1", 0, 200)
+        assert [event.start.timestamp() for event in events] == [50, 110, 150]
+        assert [event.summary for event in events] == ["🍼 Feed (0m)", "💤 Sleep (0m)", "💤 Sleep (0m)"]
+        assert [
+            event.start.timestamp() for event in await store.async_events_between("child_1", 120, 160)
+        ] == [150]
+
+        store.async_invalidate("child_1", "sleep", 140, 160)
+        assert store.coverage("child_1", "sleep").missing(0, 200) == [(0, 100), (140, 160)]
+        assert store.generation("child_1", "sleep") == 1
+        await store.async_add("child_1", "sleep", 140, 160, [], synced_end=150)
+        await store.async_close()
+
+        reopened = HistoryStore(executor, path)
+        await reopened.async_open()
+        assert reopened.coverage("child_1", "sleep").ranges == [(100, 150), (160, 200)]
+        assert reopened.high_water_mark("child_1", "feed") == 100
+        events = await reopened.async_events_between("child_1", 0, 200)
+        assert [event.start.timestamp() for event in events] == [50, 110]
+        await reopened.async_close()
+    finally:
+        await executor.async_shutdown()
+
+
+async def test_changes_since_reports_updates_and_removals(hass: HomeAssistant):
+    """Test rewriting a range only reports the intervals that changed or disappeared."""
+    executor = HuckleberryExecutor(hass, "huckleberry_test")
+    store = HistoryStore(executor, ":memory:")
+    try:
+        await store.async_open()
+        await store.async_add("child_1", "sleep", 0, 300, [_row(100), _row(150), _row(200)])
+
+        events, removed, until = await store.async_changes_since("child_1", 0)
+        assert [event.uid for event in events] == [
+            event_uid("child_1", "sleep", str(start)) for start in (100, 150, 200)
+        ]
+        assert removed == []
+
+        await store.async_add("child_1", "sleep", 0, 300, [_row(100), _row(150, 600)])
+
+        events, removed, _ = await store.async_changes_since("child_1", until)
+        assert [(event.uid, event.summary) for event in events] == [
+            (event_uid("child_1", "sleep", "150"), "💤 Sleep (10m)")
+        ]
+        assert removed == [event_uid("child_1", "sleep", "200")]
+        await store.async_close()
+    finally:
+        await executor.async_shutdown()
+
+
+async def test_iter_intervals_pages_in_start_order(hass: HomeAssistant):
+    """Test intervals are streamed in pages without skipping equal start times."""
+    executor = HuckleberryExecutor(hass, "huckleberry_test")
+    store = HistoryStore(executor, ":memory:")
+    try:
+        await store.async_open()
+        await store.async_add("child_1", "sleep", 0, 300, [_row(100), _row(200), _row(250)])
+        await store.async_add("child_1", "diaper", 0, 300, [_row(100), _row(150)])
+
+        with patch("custom_components.huckleberry.history_store.PAGE_SIZE", 2):
+            pages = [page async for page in store.async_iter_intervals("child_1", 100, 250)]
+
+        assert [len(page) for page in pages] == [2, 2]
+        assert [(row["category"], row["start"]) for page in pages for row in page] == [
+            ("sleep", 100),
+            ("diaper", 100),
+            ("diaper", 150),
+            ("sleep", 200),
+        ]
+        await store.async_close()
+    finally:
+        await executor.async_shutdown()
+
+
+async def test_entries_identified_by_entry_id(hass: HomeAssistant):
+    """Test entries starting in the same second are kept apart and a moved entry keeps its uid."""
+    executor = HuckleberryExecutor(hass, "huckleberry_test")
+    store = HistoryStore(executor, ":memory:")
+    try:
+        await store.async_open()
+        await store.async_add("child_1", "diaper", 0, 300, [_row(100, entry_id="a"), _row(100, entry_id="b")])
+        await store.async_add("child_1", "diaper", 300, 600, [])
+        _, _, until = await store.async_changes_since("child_1", 0)
+
+        # The start of b was edited into the next range, which is synced first
+        await store.async_add("child_1", "diaper", 300, 600, [_row(400, entry_id="b")])
+        await store.async_add("child_1", "diaper", 0, 300, [_row(100, entry_id="a")])
+
+        events = await store.async_events_between("child_1", 0, 600)
+        assert [(event.uid, event.start.timestamp()) for event in events] == [
+            (event_uid("child_1", "diaper", "a"), 100),
+            (event_uid("child_1", "diaper", "b"), 400),
+        ]
+        events, removed, _ = await store.async_changes_since("child_1", until)
+        assert [event.uid for event in events] == [event_uid("child_1", "diaper", "b")]
+        assert removed == []
+        await store.async_close()
+    finally:
+        await executor.async_shutdown()
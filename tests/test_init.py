@@ -1,8 +1,11 @@
 """Test Huckleberry component setup."""
+from datetime import timedelta
+import time
 from unittest.mock import patch
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
-from custom_components.huckleberry.const import DOMAIN
+from custom_components.huckleberry.const import CONF_HOUSEHOLD_CALENDAR, DOMAIN
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 async def test_setup_entry(hass: HomeAssistant, mock_huckleberry_api):
@@ -25,3 +28,110 @@ async def test_setup_entry(hass: HomeAssistant, mock_huckleberry_api):
 
     assert entry.state.value == "loaded"
     assert len(hass.states.async_all()) > 0
+    assert hass.states.get("calendar.huckleberry_household_events") is None
+
+
+async def test_setup_entry_with_household_calendar(hass: HomeAssistant, mock_huckleberry_api):
+    """Test the household calendar option adds a calendar for the whole account."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        options={CONF_HOUSEHOLD_CALENDAR: True},
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=mock_huckleberry_api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert hass.states.get("calendar.huckleberry_household_events") is not None
+
+
+async def test_household_calendar_updates_on_realtime_entries(
+    hass: HomeAssistant, mock_huckleberry_api, firestore
+):
+    """Test the household calendar writes its state when a child's realtime entry arrives."""
+    start = int(time.time()) + 3600
+    firestore.add("child_1", "sleep", {"start": start, "duration": 3600})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        options={CONF_HOUSEHOLD_CALENDAR: True},
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=mock_huckleberry_api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    household = hass.data["calendar"].get_entity("calendar.huckleberry_household_events")
+    await household.async_get_events(
+        hass, dt_util.utcnow() - timedelta(days=1), dt_util.utcnow() + timedelta(days=1)
+    )
+    assert "message" not in hass.states.get("calendar.huckleberry_household_events").attributes
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    coordinator.async_set_updated_topic("child_1", "diaper_data", {"prefs": {"lastDiaper": {"start": start}}})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("calendar.huckleberry_household_events")
+    assert state.attributes["message"] == "Test Child: 💤 Sleep (1h)"
+
+
+async def test_setup_entry_resumes_stored_session(
+    hass: HomeAssistant, hass_storage, mock_huckleberry_api
+):
+    """Test a restart refreshes the stored token instead of signing in with the password."""
+    hass_storage[f"{DOMAIN}.test_entry.session"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.test_entry.session",
+        "data": {
+            "id_token": "old_id_token",
+            "refresh_token": "stored_refresh_token",
+            "user_uid": "test_user_uid",
+            "token_expires_at": time.time() - 60,
+        },
+    }
+    api = mock_huckleberry_api
+    api.id_token = None
+    api.refresh_token = None
+
+    def _refresh():
+        assert api.refresh_token == "stored_refresh_token"
+        api.id_token = "new_id_token"
+        api.token_expires_at = time.time() + 3600
+
+    api.refresh_auth_token.side_effect = _refresh
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="test_entry",
+        data={
+            CONF_EMAIL: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state.value == "loaded"
+    assert api.refresh_auth_token.call_count == 1
+    api.authenticate.assert_not_called()
+    assert hass_storage[f"{DOMAIN}.test_entry.session"]["data"]["id_token"] == "new_id_token"
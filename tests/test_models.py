@@ -0,0 +1,58 @@
+"""Test the parsed Huckleberry child state models."""
+from datetime import datetime, timezone
+
+from custom_components.huckleberry.models import (
+    EMPTY_CHILD_STATE,
+    parse_child_state,
+    parse_feed,
+    parse_sleep,
+    update_child_state,
+)
+
+
+def test_parse_sleep_converts_last_sleep_times():
+    """Test the previous sleep start and end are converted once."""
+    sleep = parse_sleep(
+        {
+            "timer": {"active": True, "paused": False, "timestamp": {"seconds": 1700000500}},
+            "prefs": {"lastSleep": {"start": 1700000000, "duration": 3600}},
+        }
+    )
+
+    assert sleep.is_sleeping
+    assert sleep.timer_timestamp == 1700000500
+    assert sleep.last_sleep_start_at == datetime.fromtimestamp(1700000000, tz=timezone.utc)
+    assert sleep.last_sleep_end_at == datetime.fromtimestamp(1700003600, tz=timezone.utc)
+
+
+def test_parse_feed_current_side():
+    """Test the feeding side prefers the running feed, then the last completed one."""
+    assert parse_feed(
+        {"timer": {"active": True, "activeSide": "left", "lastSide": "none"}}
+    ).current_side == "left"
+    assert parse_feed(
+        {"timer": {"active": True, "paused": True, "lastSide": "right"}}
+    ).current_side == "right"
+    assert parse_feed(
+        {"timer": {"active": False, "lastSide": "left"}, "prefs": {"lastSide": {"lastSide": "right"}}}
+    ).current_side == "right"
+    assert parse_feed({"timer": {}, "prefs": {}}).current_side is None
+
+
+def test_update_child_state_only_reparses_changed_documents():
+    """Test an update keeps the models of untouched documents."""
+    state = parse_child_state(
+        {
+            "child": {"uid": "child_1"},
+            "sleep_status": {"timer": {"active": True}},
+            "feed_status": {"timer": {"active": False}},
+        }
+    )
+
+    updated = update_child_state(state, {"feed_status": {"timer": {"active": True}}})
+
+    assert updated.sleep is state.sleep
+    assert updated.feed.is_feeding
+    assert not state.feed.is_feeding
+    assert update_child_state(state, {"child": {}}) is state
+    assert parse_child_state({}) == EMPTY_CHILD_STATE
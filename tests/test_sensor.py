@@ -2,6 +2,7 @@
 from unittest.mock import patch, MagicMock
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from custom_components.huckleberry.const import DOMAIN
+from custom_components.huckleberry.sensor import HuckleberrySleepSensor
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -76,3 +77,46 @@ async def test_sensors(hass: HomeAssistant, mock_huckleberry_api):
     assert state.state != "No changes logged"
     assert state.attributes["mode"] == "pee"
     assert state.attributes["timestamp"] == 1234567890
+
+
+async def test_topic_update_recomputes_only_subscribed_sensors(hass: HomeAssistant, mock_huckleberry_api):
+    """Test a realtime update recomputes the cached attributes of the sensors reading its topic only."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=mock_huckleberry_api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    diaper = hass.data["sensor"].get_entity("sensor.test_child_last_diaper")
+    sleep = hass.data["sensor"].get_entity("sensor.test_child_sleep_status")
+
+    with patch.object(
+        HuckleberrySleepSensor, "_async_update_attrs", autospec=True
+    ) as sleep_update:
+        coordinator.async_set_updated_topic(
+            "child_1", "diaper_data", {"prefs": {"lastDiaper": {"mode": "poo", "start": 1234567890}}}
+        )
+        await hass.async_block_till_done()
+
+    sleep_update.assert_not_called()
+    assert diaper._attr_extra_state_attributes["mode"] == "poo"
+    assert hass.states.get("sensor.test_child_last_diaper").attributes["mode"] == "poo"
+
+    coordinator.async_set_updated_topic("child_1", "sleep_status", {"timer": {"active": True, "paused": False}})
+    await hass.async_block_till_done()
+
+    assert sleep._attr_native_value == "sleeping"
+    assert hass.states.get("sensor.test_child_sleep_status").state == "sleeping"
+    # The diaper sensor keeps the attributes it cached
+    assert diaper._attr_extra_state_attributes["mode"] == "poo"
@@ -1,9 +1,16 @@
 """Test Huckleberry services."""
+import csv
+import gzip
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
+
+import pytest
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from custom_components.huckleberry.const import DOMAIN
+from custom_components.huckleberry.history_store import event_uid
+from custom_components.huckleberry.intervals import describe
 from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events
 
 async def test_services(hass: HomeAssistant, mock_huckleberry_api):
     """Test all services."""
@@ -169,3 +176,334 @@ async def test_service_explicit_child_uid(hass: HomeAssistant, mock_huckleberry_
         DOMAIN, "start_sleep", {"device_id": device_id, "child_uid": "explicit_child_uid"}, blocking=True
     )
     mock_huckleberry_api.start_sleep.assert_called_with("explicit_child_uid")
+
+
+async def test_get_calendar_changes(hass: HomeAssistant, mock_huckleberry_api):
+    """Test the calendar changes service returns synced events with stable uids."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=mock_huckleberry_api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    device_registry = hass.helpers.device_registry.async_get(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, "child_1")},
+        name="Test Child"
+    )
+    start = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    history = hass.data[DOMAIN][entry.entry_id]["coordinator"].history
+    await history.async_add(
+        "child_1",
+        "sleep",
+        int(start.timestamp()) - 3600,
+        int(start.timestamp()) + 3600,
+        [
+            {
+                "entry_id": "sleep_1",
+                "start": int(start.timestamp()),
+                "end": int(start.timestamp()) + 3600,
+                "duration": 3600,
+            }
+        ],
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN, "get_calendar_changes", {"device_id": device.id}, blocking=True, return_response=True
+    )
+    assert [event["uid"] for event in response["events"]] == [
+        event_uid("child_1", "sleep", "sleep_1")
+    ]
+    assert response["removed"] == []
+    assert response["resync"] is False
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_calendar_changes",
+        {"device_id": device.id, "since": response["until"]},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["events"] == []
+
+
+async def _setup_export(hass: HomeAssistant, mock_huckleberry_api, firestore, tmp_path):
+    """Set up an entry with a few days of history and return the child device."""
+    day = int(datetime(2024, 1, 2, tzinfo=timezone.utc).timestamp())
+    for sleep_start in (day, day + 30 * 86400):
+        firestore.add("child_1", "sleep", {"start": sleep_start, "duration": 3600})
+    firestore.add("child_1", "feed", {"start": day + 7200, "leftDuration": 5, "rightDuration": 10})
+    return await _setup_device(hass, mock_huckleberry_api, tmp_path)
+
+
+async def _setup_device(hass: HomeAssistant, mock_huckleberry_api, tmp_path):
+    """Set up an entry with its config directory in tmp_path and return the child device."""
+    hass.config.config_dir = str(tmp_path)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=mock_huckleberry_api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    device_registry = hass.helpers.device_registry.async_get(hass)
+    return device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, "child_1")},
+        name="Test Child"
+    )
+
+
+async def test_export_history_csv(hass: HomeAssistant, mock_huckleberry_api, firestore, tmp_path):
+    """Test the history is synced and exported window by window to gzip CSV without pyarrow."""
+    device = await _setup_export(hass, mock_huckleberry_api, firestore, tmp_path)
+
+    with patch("custom_components.huckleberry.bulk_export._has_pyarrow", return_value=False):
+        response = await hass.services.async_call(
+            DOMAIN,
+            "export_history",
+            {
+                "device_id": device.id,
+                "start": "2024-01-01T00:00:00+00:00",
+                "end": "2024-03-01T00:00:00+00:00",
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    assert response["format"] == "csv"
+    assert response["path"].startswith(str(tmp_path / "huckleberry_exports"))
+    assert response["rows"] == 3
+    with gzip.open(response["path"], "rt", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [(row["category"], row["start"]) for row in rows] == [
+        ("sleep", "2024-01-02T00:00:00+00:00"),
+        ("feed", "2024-01-02T02:00:00+00:00"),
+        ("sleep", "2024-02-01T00:00:00+00:00"),
+    ]
+    assert rows[1]["duration"] == "900"
+    assert rows[1]["left_duration"] == "300"
+    assert sum(path[0] == "sleep" and len(filters) == 2 for path, filters in firestore.queries) > 1
+    # The export was read from the history store, which now holds the range
+    entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+    history = hass.data[DOMAIN][entry_id]["coordinator"].history
+    start, end = (int(datetime(2024, month, 1, tzinfo=timezone.utc).timestamp()) for month in (1, 3))
+    assert history.coverage("child_1", "sleep").ranges == [(start, end)]
+
+
+async def test_export_history_unreachable(hass: HomeAssistant, mock_huckleberry_api, firestore, tmp_path):
+    """Test nothing is exported when a window can't be synced."""
+    device = await _setup_export(hass, mock_huckleberry_api, firestore, tmp_path)
+    firestore.error = ConnectionError("offline")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "export_history",
+        {
+            "device_id": device.id,
+            "start": "2024-01-01T00:00:00+00:00",
+            "end": "2024-03-01T00:00:00+00:00",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {}
+    assert list((tmp_path / "huckleberry_exports").iterdir()) == []
+
+
+async def test_export_history_parquet(hass: HomeAssistant, mock_huckleberry_api, firestore, tmp_path):
+    """Test the history is exported to Parquet with typed columns."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    device = await _setup_export(hass, mock_huckleberry_api, firestore, tmp_path)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "export_history",
+        {
+            "device_id": device.id,
+            "start": "2024-01-01T00:00:00+00:00",
+            "end": "2024-01-10T00:00:00+00:00",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["format"] == "parquet"
+    table = pq.read_table(response["path"])
+    # Parquet stores second timestamps with millisecond precision
+    assert table.schema.field("start").type.tz == "UTC"
+    assert table.column("start").to_pylist() == [
+        datetime(2024, 1, 2, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 2, tzinfo=timezone.utc),
+    ]
+    assert table.column("category").to_pylist() == ["sleep", "feed"]
+    assert table.column("duration").to_pylist() == [timedelta(hours=1), timedelta(minutes=15)]
+
+
+IMPORT_ENTRIES = [
+    {"type": "sleep", "start": "2024-01-01T20:00:00+00:00", "end": "2024-01-02T06:00:00+00:00"},
+    {"type": "diaper", "start": "2024-01-02T06:30:00+00:00", "mode": "both", "pee_amount": "big",
+     "color": "yellow"},
+    {"type": "growth", "start": "2024-01-02T09:00:00+00:00", "weight": 5.2},
+]
+
+
+async def test_import_history_batches_and_resumes(hass: HomeAssistant, mock_huckleberry_api, tmp_path):
+    """Test entries are written in batches with progress events and an interrupted import resumes."""
+    device = await _setup_device(hass, mock_huckleberry_api, tmp_path)
+    client = mock_huckleberry_api._get_firestore_client.return_value
+    batch = client.batch.return_value
+    # The second commit fails
+    batch.commit.side_effect = [None, RuntimeError("unavailable"), None]
+    events = async_capture_events(hass, "huckleberry_import_progress")
+
+    with patch("custom_components.huckleberry.importer.BATCH_SIZE", 2):
+        with pytest.raises(RuntimeError):
+            await hass.services.async_call(
+                DOMAIN,
+                "import_history",
+                {"device_id": device.id, "entries": IMPORT_ENTRIES},
+                blocking=True,
+            )
+        assert [event.data["imported"] for event in events] == [2]
+        first_ids = [call.args[0] for call in batch.set.call_args_list]
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "import_history",
+            {"device_id": device.id, "entries": IMPORT_ENTRIES},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert response["resumed"] == 2
+    assert response["imported"] == 1
+    assert [event.data["imported"] for event in events] == [2, 3]
+    # The failed batch is rewritten with the same document ids
+    assert [call.args[0] for call in batch.set.call_args_list[3:]] == first_ids[2:]
+
+    documents = [call.args[1] for call in batch.set.call_args_list]
+    assert documents[0]["duration"] == 10 * 3600
+    assert documents[1]["mode"] == "both"
+    assert documents[1]["quantity"] == {"pee": 100.0}
+    assert documents[1]["color"] == "yellow"
+    assert documents[2]["weight"] == 5.2
+    assert documents[2]["weightUnits"] == "kg"
+    client.collection.assert_any_call("health")
+
+
+async def test_import_history_invalidates_naive_starts_in_local_time(
+    hass: HomeAssistant, mock_huckleberry_api, tmp_path
+):
+    """Test naive starts invalidate the synced history at their local time, not the host's."""
+    hass.config.set_time_zone("America/New_York")
+    device = await _setup_device(hass, mock_huckleberry_api, tmp_path)
+    entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+    history = hass.data[DOMAIN][entry_id]["coordinator"].history
+    day = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+    await history.async_add("child_1", "sleep", day, day + 2 * 86400, [])
+
+    await hass.services.async_call(
+        DOMAIN,
+        "import_history",
+        {
+            "device_id": device.id,
+            "entries": [{"type": "sleep", "start": "2024-01-01T20:00:00", "end": "2024-01-01T21:00:00"}],
+        },
+        blocking=True,
+    )
+
+    # 20:00 in New York is 01:00 UTC the next day
+    start = int(datetime(2024, 1, 2, 1, tzinfo=timezone.utc).timestamp())
+    assert history.coverage("child_1", "sleep").missing(day, day + 2 * 86400) == [(start, start + 1)]
+
+
+async def test_import_history_from_csv(hass: HomeAssistant, mock_huckleberry_api, tmp_path):
+    """Test entries are read from a CSV file and invalid files write nothing."""
+    device = await _setup_device(hass, mock_huckleberry_api, tmp_path)
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    batch = mock_huckleberry_api._get_firestore_client.return_value.batch.return_value
+    (tmp_path / "feeds.csv").write_text(
+        "type,start,left_duration,right_duration\n"
+        "feed,2024-01-01T08:00:00+00:00,10,\n"
+        "feed,2024-01-01T11:00:00+00:00,5,7\n"
+    )
+    (tmp_path / "invalid.csv").write_text(
+        "type,start,mode\n"
+        "diaper,2024-01-01T08:00:00+00:00,pee\n"
+        "diaper,2024-01-01T09:00:00+00:00,wet\n"
+    )
+
+    await hass.services.async_call(
+        DOMAIN, "import_history", {"device_id": device.id, "file": "invalid.csv"}, blocking=True
+    )
+    batch.set.assert_not_called()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "import_history",
+        {"device_id": device.id, "file": "feeds.csv"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["imported"] == 2
+    batch.commit.assert_called_once()
+    documents = [call.args[1] for call in batch.set.call_args_list]
+    # Regular feed intervals hold minutes, as the app writes them
+    assert [(document["leftDuration"], document["rightDuration"]) for document in documents] == [
+        (10, 0),
+        (5, 7),
+    ]
+
+
+async def test_import_history_round_trip(hass: HomeAssistant, mock_huckleberry_api, firestore, tmp_path):
+    """Test imported entries read back from the cloud with their durations and details."""
+    device = await _setup_device(hass, mock_huckleberry_api, tmp_path)
+    entry_id = hass.config_entries.async_entries(DOMAIN)[0].entry_id
+    history = hass.data[DOMAIN][entry_id]["coordinator"].history
+    calendar = hass.data[DOMAIN][entry_id]["calendars"]["child_1"]
+
+    await hass.services.async_call(
+        DOMAIN,
+        "import_history",
+        {
+            "device_id": device.id,
+            "entries": [
+                {"type": "feed", "start": "2024-01-01T08:00:00+00:00", "left_duration": 10, "right_duration": 5},
+                {"type": "diaper", "start": "2024-01-01T09:00:00+00:00", "mode": "both", "pee_amount": "big",
+                 "poo_amount": "little", "color": "yellow", "consistency": "runny"},
+            ],
+        },
+        blocking=True,
+    )
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await calendar.async_sync(start, start + timedelta(days=1))
+
+    day = int(start.timestamp())
+    rows = [row async for page in history.async_iter_intervals("child_1", day, day + 86400) for row in page]
+    feed, diaper = rows
+    assert (feed["left_duration"], feed["right_duration"], feed["duration"]) == (600, 300, 900)
+    assert describe(feed)[0] == "🍼 Feed (L:10m R:5m)"
+    assert diaper["poo_color"] == "yellow"
+    assert diaper["poo_consistency"] == "runny"
+    assert diaper["amount"] == "pee big, poo little"
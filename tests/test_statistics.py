@@ -0,0 +1,154 @@
+"""Test the Huckleberry long-term statistics import."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.statistics import get_last_statistics
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.huckleberry.const import DOMAIN
+from custom_components.huckleberry.statistics import (
+    hourly_aggregates,
+    night_sleep_checker,
+    statistic_id,
+)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_db_url, enable_custom_integrations):
+    """Enable custom integrations, preparing the recorder database before hass is created."""
+    yield
+
+
+def _ts(hour: int, minute: int = 0) -> int:
+    """Return a timestamp on 2024-01-01 UTC."""
+    return int(datetime(2024, 1, 1, hour, minute, tzinfo=timezone.utc).timestamp())
+
+
+def test_hourly_aggregates_split_durations_and_count_starts():
+    """Test durations are split over hours and entries are counted where they start."""
+    rows = [
+        # Started before the window, only its minutes inside the window count
+        {"category": "sleep", "start": _ts(9), "duration": 3600 + 1800},
+        {"category": "sleep", "start": _ts(11, 30), "duration": 3600 + 900},
+        {"category": "feed", "start": _ts(13, 55), "duration": 900, "left_duration": 600, "right_duration": 300},
+        {"category": "diaper", "start": _ts(15, 10), "mode": "pee"},
+        {"category": "diaper", "start": _ts(15, 20), "mode": "pee"},
+        # Starts after the night start, not a nap
+        {"category": "sleep", "start": _ts(20, 15), "duration": 1800},
+    ]
+    is_night_sleep = night_sleep_checker(
+        {"uid": "child_1", "night_start_min": 20 * 60, "morning_cutoff_min": 6 * 60}, timezone.utc
+    )
+
+    hours = hourly_aggregates(rows, _ts(10), _ts(21), is_night_sleep)
+
+    assert hours[_ts(10)] == {"sleep_minutes": 30}
+    assert hours[_ts(11)] == {"sleep_minutes": 30, "naps": 1}
+    assert hours[_ts(12)] == {"sleep_minutes": 45}
+    assert hours[_ts(13)] == {"feed_left_minutes": 5}
+    assert hours[_ts(14)] == {"feed_left_minutes": 5, "feed_right_minutes": 5}
+    assert hours[_ts(15)] == {"diaper_pee": 2}
+    assert hours[_ts(20)] == {"sleep_minutes": 30}
+
+
+def test_night_sleep_checker_defaults_and_wraps_midnight():
+    """Test night sleep wraps around midnight, from 19:00 to 07:00 without night settings."""
+    is_night_sleep = night_sleep_checker({"uid": "child_1"}, timezone.utc)
+
+    assert is_night_sleep(_ts(19))
+    assert is_night_sleep(_ts(2))
+    assert not is_night_sleep(_ts(7))
+    assert not is_night_sleep(_ts(18, 59))
+
+
+async def _last_statistic(hass: HomeAssistant, key: str) -> dict:
+    """Return the last imported row of a statistic of child_1."""
+    sid = statistic_id("child_1", key)
+    rows = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, sid, False, {"state", "sum"}
+    )
+    return rows[sid][0]
+
+
+def _sleep_queries(firestore) -> list[tuple[int, int]]:
+    """Return the windows of the sleep queries made so far."""
+    return [
+        (filters[0].value, filters[1].value)
+        for path, filters in firestore.queries
+        if path[0] == "sleep" and len(filters) == 2
+    ]
+
+
+async def test_statistics_backfill_and_continue(
+    recorder_mock: Recorder, hass: HomeAssistant, mock_huckleberry_api, firestore, freezer
+):
+    """Test statistics are synced into the history store, backfilled and continued."""
+    # Midnight of the mocked birthday in the test time zone
+    birthday = datetime(2023, 1, 1, 8, tzinfo=timezone.utc)
+    freezer.move_to(birthday + timedelta(days=40))
+    for day in (1, 30):
+        sleep_start = int((birthday + timedelta(days=day, hours=12)).timestamp())
+        firestore.add("child_1", "sleep", {"start": sleep_start, "duration": 7200})
+    firestore.add("child_1", "diaper", {"start": int((birthday + timedelta(days=2)).timestamp()), "mode": "poo"})
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=mock_huckleberry_api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    statistics = hass.data[DOMAIN][entry.entry_id]["statistics"]
+    await statistics._task
+    await async_wait_recording_done(hass)
+
+    # The backfill reaches the last full hour a day ago, in 28 day windows
+    last_hour = (birthday + timedelta(days=39, hours=-1)).timestamp()
+    sleep = await _last_statistic(hass, "sleep_minutes")
+    assert sleep["start"] == last_hour
+    assert sleep["sum"] == 240
+    assert (await _last_statistic(hass, "naps"))["sum"] == 2
+    assert (await _last_statistic(hass, "diaper_poo"))["sum"] == 1
+    assert (await _last_statistic(hass, "diaper_pee"))["sum"] == 0
+
+    # An hour the cloud can't be reached for is not imported
+    firestore.error = ConnectionError("offline")
+    freezer.tick(timedelta(hours=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    await statistics._task
+    await async_wait_recording_done(hass)
+    assert (await _last_statistic(hass, "sleep_minutes"))["start"] == last_hour
+
+    # The next run syncs the hours that passed, the history before is read from the store
+    firestore.error = None
+    freezer.tick(timedelta(hours=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    await statistics._task
+    await async_wait_recording_done(hass)
+
+    # Only the two hours since the backfill are fetched again
+    start, end = _sleep_queries(firestore)[-1]
+    assert end - start == 2 * 3600
+    sleep = await _last_statistic(hass, "sleep_minutes")
+    assert sleep["start"] == last_hour + 2 * 3600
+    assert sleep["sum"] == 240
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -2,6 +2,7 @@
 from unittest.mock import patch, MagicMock
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, STATE_ON, STATE_OFF
 from custom_components.huckleberry.const import DOMAIN
+from custom_components.huckleberry.switch import HuckleberryFeedingSwitch
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -67,3 +68,37 @@ async def test_switches(hass: HomeAssistant, mock_huckleberry_api):
         "switch", "turn_on", {"entity_id": "switch.test_child_feeding_right"}, blocking=True
     )
     mock_huckleberry_api.start_feeding.assert_called_with("child_1", "right")
+
+
+async def test_topic_update_recomputes_only_subscribed_switches(hass: HomeAssistant, mock_huckleberry_api):
+    """Test a sleep update recomputes the sleep switch and leaves the feeding switches cached."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.huckleberry.HuckleberryAPI",
+        return_value=mock_huckleberry_api,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    sleep = hass.data["switch"].get_entity("switch.test_child_sleep_tracking")
+    assert sleep._attr_is_on is False
+
+    with patch.object(
+        HuckleberryFeedingSwitch, "_async_update_attrs", autospec=True
+    ) as feeding_update:
+        coordinator.async_set_updated_topic("child_1", "sleep_status", {"timer": {"active": True, "paused": False}})
+        await hass.async_block_till_done()
+
+    feeding_update.assert_not_called()
+    assert sleep._attr_is_on is True
+    assert hass.states.get("switch.test_child_sleep_tracking").state == STATE_ON
+    assert hass.states.get("switch.test_child_feeding_left").state == STATE_OFF